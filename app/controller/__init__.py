@@ -1,5 +1,8 @@
-__all__ = ["note_controller", "task_controller", "topic_controller"]
+__all__ = ["events", "lru_cache", "note_controller", "schedule_index", "task_controller", "topic_controller"]
 
+from . import events
+from . import lru_cache
 from . import note_controller
+from . import schedule_index
 from . import task_controller
 from . import topic_controller
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Change notifications emitted by the controllers
+Every controller owns an EventBus; after a change has been committed to the database it emits
+a ChangeEvent describing what happened, so views can patch only the affected rows instead of
+reloading everything
+"""
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+# The whole collection may have changed (e.g. after external changes that could not be tracked)
+RELOADED = "reloaded"
+
+
+class ChangeEvent:
+    """
+    Attributes:
+        kind (str): CREATED, UPDATED, DELETED or RELOADED
+        entity (str): Kind of object that changed ("task", "note" or "topic")
+        ids (tuple): IDs of the affected objects
+        items (tuple): Current state of the affected objects (empty for deletions of unknown objects)
+    """
+
+    def __init__(self, kind: str, entity: str, ids=(), items=()):
+        self.kind = kind
+        self.entity = entity
+        self.ids = tuple(ids)
+        self.items = tuple(items)
+
+    def __repr__(self):
+        return f"ChangeEvent(kind='{self.kind}', entity='{self.entity}', ids={self.ids})"
+
+
+class EventBus:
+    def __init__(self):
+        self._subscribers = []
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, callback):
+        # Register a callback taking a ChangeEvent; returns the callback so it can be unsubscribed later
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        # Remove a callback (no-op if it was not subscribed)
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def emit(self, event: ChangeEvent):
+        # Deliver the event to every subscriber; a failing subscriber does not stop the others
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in {event.entity} event handler: {e}")
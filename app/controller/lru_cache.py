@@ -0,0 +1,45 @@
+from collections import OrderedDict
+
+"""
+Small least-recently-used cache with a fixed number of entries
+Reading or writing an entry makes it the most recent one; when the cache is full,
+the least recently used entry is evicted
+"""
+
+class LRUCache:
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        # Return the cached value (marking it as recently used) or default
+        if key not in self._entries:
+            return default
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key, value):
+        # Store a value, evicting the least recently used entries beyond maxsize
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key):
+        # Remove an entry if present
+        self._entries.pop(key, None)
+
+    def items(self):
+        # Return the (key, value) pairs from least to most recently used, without touching their order
+        return list(self._entries.items())
+
+    def clear(self):
+        self._entries.clear()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
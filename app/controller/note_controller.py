@@ -1,21 +1,60 @@
 from app.db.note_dao import NoteDAO
 from app.model.note import Note
-from app.model.topic import Topic
-from datetime import datetime
+from app.model.note_search_result import NoteSearchResult
+from app.model.note_summary import NoteSummary
+from app.controller.lru_cache import LRUCache
+from app.db.encoding import from_timestamp, to_timestamp
+from app.controller.events import ChangeEvent, EventBus, CREATED, UPDATED, DELETED, RELOADED
+from app.model.topic import intern_topic
 
 class NoteController:
-    def __init__(self):
+    def __init__(self, content_cache_size: int = 32):
         # Initialize DAO for database interaction
         self.dao = NoteDAO()
+        # Contents of the most recently opened notes (note_id -> content)
+        self.content_cache = LRUCache(content_cache_size)
+        # Observers are notified of every committed change (see app.controller.events)
+        self.events = EventBus()
 
     def create_note(self, note: Note):
          # Insert a new note into the database
-        return self.dao.insert_note(note)
+        note_id = self.dao.insert_note(note)
+        self._notify(CREATED, [note_id])
+        return note_id
 
     def get_all_notes(self):
         # Retrieve all notes and convert them to Note objects
         rows = self.dao.get_all_notes()
-        return [self._row_to_note(row) for row in rows]
+        topics = {}
+        return [self._row_to_note(row, topics) for row in rows]
+
+    def get_notes_page(self, after_created_at=None, after_id=None, limit=50):
+        # Retrieve one page of notes (newest first) after the given note (keyset pagination)
+        # after_created_at accepts the created_at of the last note shown, as datetime or ISO string
+        rows = self.dao.get_notes_page(to_timestamp(after_created_at), after_id, limit)
+        topics = {}
+        return [self._row_to_note(row, topics) for row in rows]
+
+    def iter_notes(self, chunk_size=200):
+        # Lazily yield Note objects; only one chunk of rows is held in memory at a time
+        topics = {}
+        for row in self.dao.iter_notes(chunk_size):
+            yield self._row_to_note(row, topics)
+
+    def get_note_summaries(self, preview_length: int = 80):
+        # Retrieve lightweight summaries of all notes (no full content), newest first
+        rows = self.dao.get_note_summaries(preview_length)
+        topics = {}
+        return [self._row_to_summary(row, topics) for row in rows]
+
+    def get_note_content(self, note_id: int):
+        # Load the full content of a note on demand, keeping recently opened notes in memory
+        content = self.content_cache.get(note_id)
+        if content is None:
+            content = self.dao.get_note_content(note_id)
+            if content is not None:
+                self.content_cache.put(note_id, content)
+        return content
 
     def get_note_by_id(self, note_id: int):
         # Retrieve a note by its ID
@@ -25,30 +64,97 @@ class NoteController:
     def delete_note(self, note_id: int):
         # Permanently remove a note by ID
         self.dao.delete_note(note_id)
+        self.content_cache.discard(note_id)
+        self._notify(DELETED, [note_id])
 
     def update_note(self, note_id: int, new_content: str):
         # Update the content of a note
         self.dao.update_note(note_id, new_content)
+        if note_id in self.content_cache:
+            self.content_cache.put(note_id, new_content)
+        self._notify(UPDATED, [note_id])
 
-    def _row_to_note(self, row):
-        # Convert a database row into a Note object
-        # Handles parsing of created_at field safely
-        
-        topic_id = row[2] if row[2] is not None else None
-        topic = Topic(id=topic_id) if topic_id else None
+    def create_notes(self, notes):
+        # Insert several notes in a single transaction; returns the new IDs
+        note_ids = self.dao.insert_notes(notes)
+        self._notify(CREATED, note_ids)
+        return note_ids
+
+    def delete_notes(self, note_ids):
+        # Remove several notes in a single transaction
+        note_ids = list(note_ids)
+        deleted = self.dao.delete_many(note_ids)
+        for note_id in note_ids:
+            self.content_cache.discard(note_id)
+        self._notify(DELETED, note_ids)
+        return deleted
+
+    def search(self, query: str, limit: int = 20):
+        # Full-text search over note titles and contents, best matches first
+        rows = self.dao.search(query, limit)
+        topics = {}
+        return [self._row_to_search_result(row, topics) for row in rows]
+
+    def apply_external_changes(self, changes):
+        # Announce the notes changed by another process (a TableChanges from the ChangeDetector)
+        # Cached contents of those notes may be stale, so they are dropped
+        if changes.reload:
+            self.content_cache.clear()
+            self.events.emit(ChangeEvent(RELOADED, "note"))
+            return
+        for note_id in changes.changed | changes.deleted:
+            self.content_cache.discard(note_id)
+        if changes.deleted:
+            self.events.emit(ChangeEvent(DELETED, "note", sorted(changes.deleted)))
+        if changes.changed:
+            summaries = [self._row_to_summary(row) for row in self.dao.get_note_summaries_by_ids(sorted(changes.changed))]
+            self.events.emit(ChangeEvent(UPDATED, "note", [note.id for note in summaries], summaries))
+
+    def _notify(self, kind, note_ids):
+        # Emit a change event once the change is committed (dropped if the transaction is rolled back)
+        # Listeners receive NoteSummary items, re-read only when someone is listening
+        if not self.events.has_subscribers or not note_ids:
+            return
+        note_ids = list(note_ids)
+
+        def emit():
+            items = [] if kind == DELETED else [self._row_to_summary(row) for row in self.dao.get_note_summaries_by_ids(note_ids)]
+            self.events.emit(ChangeEvent(kind, "note", note_ids, items))
 
-        created_at = None
-        if row[4]:
-            try:
-                created_at = datetime.fromisoformat(row[4])
-            except Exception:
-                # fallback in case the result is different
-                created_at = datetime.strptime(row[4], "%Y-%m-%d %H:%M:%S")
+        self.dao.db.after_commit(emit)
+
+    def _row_to_note(self, row, topics=None):
+        # Convert a database row into a Note object (interning its Topic in `topics` if given)
+        topic_id = row[2] if row[2] is not None else None
+        # Topic name comes from the LEFT JOIN, so no extra query is needed per note
+        topic = intern_topic({} if topics is None else topics, topic_id, row[5]) if topic_id else None
 
         return Note(
             id=row[0],
             title=row[1],
             topic=topic,
             content=row[3],
-            created_at=created_at
+            created_at=from_timestamp(row[4])
+        )
+
+    def _row_to_summary(self, row, topics=None):
+        # Convert a summary row (id, title, topic_id, topic_name, created_ts, content_length, preview) into a NoteSummary
+        return NoteSummary(
+            id=row[0],
+            title=row[1],
+            topic=intern_topic({} if topics is None else topics, row[2], row[3]) if row[2] else None,
+            created_at=from_timestamp(row[4]),
+            content_length=row[5] or 0,
+            preview=row[6] or ""
+        )
+
+    def _row_to_search_result(self, row, topics=None):
+        # Convert a search row (id, title, topic_id, created_ts, snippet, score, topic_name) into a NoteSearchResult
+        return NoteSearchResult(
+            id=row[0],
+            title=row[1],
+            topic=intern_topic({} if topics is None else topics, row[2], row[6]) if row[2] else None,
+            created_at=from_timestamp(row[3]),
+            snippet=row[4] or "",
+            score=row[5]
         )
@@ -0,0 +1,68 @@
+from bisect import bisect_left, insort
+from app.db.encoding import to_epoch_day, to_minute
+
+"""
+In-memory index of the time slots of the scheduled tasks, used to detect conflicts
+Slots are kept per day in a list sorted by start minute, together with the longest slot of the day:
+a slot overlapping [start, end) must start in [start - longest, end), so a conflict query is two
+bisections plus a scan of that window, O(log n + k) for n slots on the day and k candidates
+Days and times are accepted as date/time objects or strings and kept in their integer encoding
+(epoch day, minutes since midnight, see app.db.encoding)
+"""
+
+
+class ScheduleIndex:
+    def __init__(self):
+        # day -> sorted list of (start_minute, end_minute, task_id)
+        self._days = {}
+        # day -> duration of the longest slot of the day, in minutes
+        self._longest = {}
+        # task_id -> (day, start_minute, end_minute), to find the entry to remove
+        self._slots = {}
+
+    def add(self, task_id, scheduled_date, start_time, end_time):
+        # Index the slot of a task, replacing its previous one; tasks without a complete slot are just removed
+        self.remove(task_id)
+        if not (scheduled_date and start_time and end_time):
+            return
+        day = to_epoch_day(scheduled_date)
+        start, end = to_minute(start_time), to_minute(end_time)
+        insort(self._days.setdefault(day, []), (start, end, task_id))
+        self._longest[day] = max(self._longest.get(day, 0), end - start)
+        self._slots[task_id] = (day, start, end)
+
+    def remove(self, task_id):
+        # Drop the slot of a task (no-op if it is not indexed)
+        slot = self._slots.pop(task_id, None)
+        if slot is None:
+            return
+        day, start, end = slot
+        entries = self._days[day]
+        entries.pop(bisect_left(entries, (start, end, task_id)))
+        if entries:
+            self._longest[day] = max(e - s for s, e, _ in entries)
+        else:
+            del self._days[day]
+            del self._longest[day]
+
+    def conflicts(self, scheduled_date, start_time, end_time, exclude_id=None):
+        # IDs of the tasks whose slot overlaps [start_time, end_time) on the given day, ordered by start
+        # Slots that only touch (one ends when the other starts) do not conflict
+        day = to_epoch_day(scheduled_date)
+        entries = self._days.get(day)
+        if not entries:
+            return []
+        start, end = to_minute(start_time), to_minute(end_time)
+        lo = bisect_left(entries, (start - self._longest[day],))
+        hi = bisect_left(entries, (end,))
+        return [task_id for s, e, task_id in entries[lo:hi] if e > start and task_id != exclude_id]
+
+    def slots(self, scheduled_date):
+        # (start_minute, end_minute) of the slots taken on a day, ordered by start
+        return [(start, end) for start, end, _ in self._days.get(to_epoch_day(scheduled_date), ())]
+
+    def __contains__(self, task_id):
+        return task_id in self._slots
+
+    def __len__(self):
+        return len(self._slots)
@@ -0,0 +1,76 @@
+import heapq
+from datetime import date, time, timedelta
+from app.db.encoding import to_minute
+
+"""
+Greedy auto-scheduler that packs unscheduled tasks into the free time of the planner
+The free time of every day is the user's availability windows minus the slots already taken;
+tasks are taken from a priority queue (highest priority first, then oldest) and each one gets
+the earliest free interval long enough for its estimated duration (first fit)
+Everything works on minutes since midnight; nothing here touches the database
+"""
+
+# Duration assumed for tasks without an estimate, in minutes
+DEFAULT_TASK_MINUTES = 60
+
+# Availability used when the user did not define any: weekday (0=Monday) -> [(start, end)]
+DEFAULT_AVAILABILITY = {
+    weekday: [(time(9, 0), time(12, 0)), (time(14, 0), time(18, 0))] for weekday in range(5)
+}
+
+
+def free_intervals(windows, busy):
+    # Subtract the busy intervals from the availability windows of one day
+    # windows and busy are lists of (start_minute, end_minute); returns the free ones in order
+    busy = sorted(busy)
+    free = []
+    for start, end in sorted(windows):
+        cursor = start
+        for busy_start, busy_end in busy:
+            if busy_end <= cursor:
+                continue
+            if busy_start >= end:
+                break
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if cursor < end:
+            free.append((cursor, end))
+    return free
+
+
+def plan(tasks, busy, start_date: date, end_date: date, availability=None, not_before=None):
+    # Assign slots to tasks; returns a list of (task_id, date, start_minute, end_minute)
+    # tasks: iterable of (task_id, priority, minutes); busy: {date: [(start_minute, end_minute)]}
+    # not_before: optional (date, minute) before which nothing is scheduled (e.g. now)
+    # Tasks that fit nowhere in the range are left out
+    availability = DEFAULT_AVAILABILITY if availability is None else availability
+
+    # Free intervals of the whole range in chronological order, as mutable [day, start, end] entries
+    free = []
+    day = start_date
+    while day <= end_date:
+        windows = [(to_minute(start), to_minute(end)) for start, end in availability.get(day.weekday(), ())]
+        if not_before is not None and day <= not_before[0]:
+            cutoff = not_before[1] if day == not_before[0] else 24 * 60
+            windows = [(max(start, cutoff), end) for start, end in windows if end > cutoff]
+        free.extend([day, start, end] for start, end in free_intervals(windows, busy.get(day, ())))
+        day += timedelta(days=1)
+
+    # Highest priority first; among equal priorities the oldest task (lowest id) first
+    queue = [(-priority, task_id, minutes or DEFAULT_TASK_MINUTES) for task_id, priority, minutes in tasks]
+    heapq.heapify(queue)
+
+    assignments = []
+    first = 0  # intervals before this index are used up
+    while queue and first < len(free):
+        _, task_id, minutes = heapq.heappop(queue)
+        for index in range(first, len(free)):
+            day, start, end = free[index]
+            if end - start >= minutes:
+                assignments.append((task_id, day, start, start + minutes))
+                free[index][1] = start + minutes
+                break
+        while first < len(free) and free[first][1] >= free[first][2]:
+            first += 1
+    return assignments
@@ -1,47 +1,413 @@
 from app.db.task_dao import TaskDAO
+from app.db.recurrence_dao import RecurrenceDAO
+from app.db.encoding import from_epoch_day, from_minute, to_minute
 from app.model.task import Task
-from app.model.topic import Topic
-from datetime import date, time
+from app.model.task_occurrence import TaskOccurrence
+from app.model.task_table import TaskTable
+from app.model.recurrence import Recurrence
+from app.model.topic import intern_topic
+from app.model.day_load import DayLoad
+from app.controller.events import ChangeEvent, EventBus, CREATED, UPDATED, DELETED, RELOADED
+from app.controller.schedule_index import ScheduleIndex
+from app.controller.scheduler import plan
+from datetime import date, time, timedelta
+
+
+def _slot_minutes(task):
+    # Length of the time slot of a task in minutes (0 without a complete slot)
+    if task.start_time is None or task.end_time is None:
+        return 0
+    return max(to_minute(task.end_time) - to_minute(task.start_time), 0)
+
 
 class TaskController:
     def __init__(self):
         # Initialize DAO and TopicController for database interaction
         self.dao = TaskDAO()
+        self.recurrences = RecurrenceDAO()
+        # Observers are notified of every committed change (see app.controller.events)
+        self.events = EventBus()
+        # Index of the scheduled time slots for conflict checks, built on first use (see find_conflicts)
+        self._schedule = None
+        # Recurring tasks for conflict checks, loaded on first use and dropped when one of them changes:
+        # (series ID -> series task with its rule, series ID -> {occurrence date: override})
+        self._series = None
 
     def create_task(self, task: Task):
          # Insert a new task into the database
-        return self.dao.insert_task(task)
+        task_id = self.dao.insert_task(task)
+        self._update_schedule(lambda index: index.add(task_id, task.scheduled_date, task.start_time, task.end_time))
+        self._notify(CREATED, [task_id])
+        return task_id
 
     def get_all_tasks(self):
         # Retrieve all tasks from the database and map them to Task objects
         tasks_data = self.dao.get_all_tasks()
-        return [self._row_to_task(row) for row in tasks_data]
+        return self._rows_to_tasks(tasks_data)
+
+    def get_tasks_page(self, after_id=None, limit=50):
+        # Retrieve one page of tasks after the given task ID (keyset pagination)
+        return self._rows_to_tasks(self.dao.get_tasks_page(after_id, limit))
+
+    def iter_tasks(self, chunk_size=500):
+        # Lazily yield Task objects; only one chunk of rows is held in memory at a time
+        # Recurring tasks carry their rule (read with one query per chunk), so a series can be told apart
+        topics, chunk = {}, []
+        for row in self.dao.iter_tasks(chunk_size):
+            chunk.append(self._row_to_task(row, topics))
+            if len(chunk) == chunk_size:
+                yield from self._attach_recurrences(chunk)
+                chunk = []
+        if chunk:
+            yield from self._attach_recurrences(chunk)
+
+    def get_tasks_between(self, start_date, end_date):
+        # Retrieve only the tasks scheduled in a date range (e.g. the week shown by the planner)
+        # Recurring tasks are expanded into their occurrences in the range, ordered with the other tasks
+        series_ids, occurrences = self._occurrences_between(start_date, end_date)
+        tasks = self._rows_to_tasks(self.dao.get_tasks_between(start_date, end_date))
+        if not series_ids:
+            return tasks
+        tasks = [task for task in tasks if task.id not in series_ids] + occurrences
+        return sorted(tasks, key=lambda task: (task.scheduled_date, task.start_time or time.min))
+
+    def create_recurring_task(self, task: Task, recurrence: Recurrence):
+        # Insert a task repeated by a rule; its scheduled date, start and end time are those of the first occurrence
+        # Only the series is stored, occurrences are generated for the range being viewed
+        with self.dao.db.transaction():
+            task_id = self.dao.insert_task(task)
+            self.recurrences.insert_recurrence(task_id, recurrence)
+            self._forget_series()
+            self._notify(CREATED, [task_id])
+        return task_id
+
+    def complete_occurrence(self, task_id: int, occurrence_date, completed: bool = True):
+        # Mark a single occurrence of a recurring task as completed (or not) with an override row
+        self.recurrences.set_completed(task_id, occurrence_date, completed)
+        self._notify(UPDATED, [task_id])
+
+    def reschedule_occurrence(self, task_id: int, occurrence_date, scheduled_date, start_time, end_time):
+        # Move a single occurrence of a recurring task to another date and time with an override row
+        self.recurrences.set_time_slot(task_id, occurrence_date, scheduled_date, start_time, end_time)
+        self._notify(UPDATED, [task_id])
+
+    def cancel_occurrence(self, task_id: int, occurrence_date):
+        # Skip a single occurrence of a recurring task (an exception to its rule)
+        self.recurrences.cancel(task_id, occurrence_date)
+        self._notify(UPDATED, [task_id])
+
+    def get_task_table(self):
+        # Load every task into a column-oriented TaskTable (typed arrays), for statistics and bulk filtering
+        # No Task objects are built; recurring tasks appear once, as their series
+        return TaskTable.from_rows(self.dao.get_task_columns())
+
+    def get_daily_load(self, start_date, end_date):
+        # Per-day load (task count, scheduled hours, completed tasks) between two dates
+        # Single tasks are aggregated in SQL; the occurrences of recurring tasks in the range are added here
+        totals = {from_epoch_day(day): [count, hours, int(completed)]
+                  for day, count, hours, completed in self.dao.get_daily_load(start_date, end_date)}
+        _, occurrences = self._occurrences_between(start_date, end_date)
+        for occurrence in occurrences:
+            total = totals.setdefault(occurrence.scheduled_date, [0, 0.0, 0])
+            total[0] += 1
+            total[1] += _slot_minutes(occurrence) / 60
+            total[2] += int(occurrence.is_completed)
+        return [
+            DayLoad(day=day, task_count=count, scheduled_hours=hours, completed_count=completed)
+            for day, (count, hours, completed) in sorted(totals.items())
+        ]
 
     def set_time_slot(self, task_id, scheduled_date, start_time, end_time):
         # Update scheduled date and time range for a task
         self.dao.set_time_slot(task_id, scheduled_date, start_time, end_time)
+        self._update_schedule(lambda index: index.add(task_id, scheduled_date, start_time, end_time))
+        self._notify(UPDATED, [task_id])
 
     def delete_task(self, task_id: int):
         # Permanently remove a task by ID
         self.dao.delete_task(task_id)
+        self._update_schedule(lambda index: index.remove(task_id))
+        self._notify(DELETED, [task_id])
 
     def mark_completed(self, task_id: int):
         # Mark task as completed
         self.dao.mark_completed(task_id)
+        self._notify(UPDATED, [task_id])
     
     def mark_notcompleted(self, task_id: int):
         # Mark task as not completed
         self.dao.mark_notcompleted(task_id)
+        self._notify(UPDATED, [task_id])
+
+    def create_tasks(self, tasks):
+        # Insert several tasks in a single transaction; returns the new IDs
+        tasks = list(tasks)
+        task_ids = self.dao.insert_tasks(tasks)
+
+        def index_tasks(index):
+            for task_id, task in zip(task_ids, tasks):
+                index.add(task_id, task.scheduled_date, task.start_time, task.end_time)
+
+        self._update_schedule(index_tasks)
+        self._notify(CREATED, task_ids)
+        return task_ids
+
+    def delete_tasks(self, task_ids):
+        # Remove several tasks in a single transaction
+        task_ids = list(task_ids)
+        deleted = self.dao.delete_many(task_ids)
+
+        def unindex_tasks(index):
+            for task_id in task_ids:
+                index.remove(task_id)
+
+        self._update_schedule(unindex_tasks)
+        self._notify(DELETED, task_ids)
+        return deleted
+
+    def mark_completed_many(self, task_ids):
+        # Mark several tasks as completed in a single transaction
+        task_ids = list(task_ids)
+        updated = self.dao.mark_completed_many(task_ids)
+        self._notify(UPDATED, task_ids)
+        return updated
+
+    def mark_notcompleted_many(self, task_ids):
+        # Mark several tasks as not completed in a single transaction
+        task_ids = list(task_ids)
+        updated = self.dao.mark_notcompleted_many(task_ids)
+        self._notify(UPDATED, task_ids)
+        return updated
+
+    def apply_external_changes(self, changes):
+        # Announce the tasks changed by another process (a TableChanges from the ChangeDetector)
+        if changes.reload:
+            self._schedule = None
+            self._series = None
+            self.events.emit(ChangeEvent(RELOADED, "task"))
+            return
+        if changes.deleted:
+            if self._schedule is not None:
+                for task_id in changes.deleted:
+                    self._schedule.remove(task_id)
+            self._forget_series(changes.deleted)
+            self.events.emit(ChangeEvent(DELETED, "task", sorted(changes.deleted)))
+        if changes.changed:
+            tasks = self._get_tasks_by_ids(sorted(changes.changed))
+            # A rule or override written elsewhere is logged as a change of its task; a new series drops the cache too
+            self._forget_series(None if any(task.recurrence is not None for task in tasks) else changes.changed)
+            if self._schedule is not None:
+                for task in tasks:
+                    self._schedule.add(task.id, task.scheduled_date, task.start_time, task.end_time)
+            self.events.emit(ChangeEvent(UPDATED, "task", [task.id for task in tasks], tasks))
+
+    def find_conflicts(self, scheduled_date, start_time, end_time, exclude_id=None):
+        # Tasks whose time slot overlaps the given one (e.g. while the user picks a slot), ordered by start time
+        # exclude_id leaves out the task being rescheduled; only the conflicting tasks are read from the database
+        # Recurring tasks are checked through their occurrences on that day (the index only holds their first one),
+        # expanded from the cached series, so checking a slot while it is being picked runs no recurrence query
+        day = date.fromisoformat(scheduled_date) if isinstance(scheduled_date, str) else scheduled_date
+        series, overrides = self._series_cache()
+        series_ids, occurrences = self._expand_series(series.values(), overrides, day, day)
+        task_ids = [task_id for task_id in self._schedule_index().conflicts(day, start_time, end_time, exclude_id)
+                    if task_id not in series_ids]
+        tasks = self._get_tasks_by_ids(task_ids) if task_ids else []
+        start, end = to_minute(start_time), to_minute(end_time)
+        tasks.extend(occurrence for occurrence in occurrences
+                     if occurrence.id != exclude_id and _slot_minutes(occurrence)
+                     and to_minute(occurrence.start_time) < end and to_minute(occurrence.end_time) > start)
+        return sorted(tasks, key=lambda task: task.start_time)
+
+    def auto_schedule(self, start_date, end_date, availability=None, not_before=None):
+        # Pack the open, unscheduled tasks into the free time between two dates (see app.controller.scheduler)
+        # availability: {weekday: [(start time, end time)]}, defaults to weekday office hours
+        # not_before: optional datetime before which nothing is scheduled
+        # All slots are written in one transaction; returns the IDs of the scheduled tasks
+        tasks = self.dao.get_unscheduled_tasks()
+        if not tasks:
+            return []
+        index = self._schedule_index()
+        busy = {}
+        day = start_date
+        while day <= end_date:
+            busy[day] = index.slots(day)
+            day += timedelta(days=1)
+        # The occurrences of recurring tasks are not in the index (except the first one of each series)
+        _, occurrences = self._occurrences_between(start_date, end_date)
+        for occurrence in occurrences:
+            if _slot_minutes(occurrence):
+                busy[occurrence.scheduled_date].append(
+                    (to_minute(occurrence.start_time), to_minute(occurrence.end_time)))
+        limit = (not_before.date(), not_before.hour * 60 + not_before.minute) if not_before else None
+
+        slots = [
+            (task_id, day, time(start // 60, start % 60), time(end // 60, end % 60))
+            for task_id, day, start, end in plan(tasks, busy, start_date, end_date, availability, limit)
+        ]
+        if not slots:
+            return []
+
+        def index_slots(index):
+            for task_id, day, start, end in slots:
+                index.add(task_id, day, start, end)
+
+        with self.dao.db.transaction():
+            self.dao.set_time_slots(slots)
+            task_ids = [slot[0] for slot in slots]
+            self._update_schedule(index_slots)
+            self._notify(UPDATED, task_ids)
+        return task_ids
+
+    def _schedule_index(self):
+        # Build the schedule index with a single query the first time it is needed
+        if self._schedule is None:
+            index = ScheduleIndex()
+            for task_id, day, start, end in self.dao.get_time_slots():
+                index.add(task_id, from_epoch_day(day), from_minute(start), from_minute(end))
+            self._schedule = index
+        return self._schedule
+
+    def _update_schedule(self, update):
+        # Apply a change to the schedule index once it is committed; nothing to do while the index is not built
+        if self._schedule is None:
+            return
+
+        def apply():
+            if self._schedule is not None:
+                update(self._schedule)
+
+        self.dao.db.after_commit(apply)
+
+    def _series_cache(self):
+        # Load the recurring tasks and their overrides with two queries the first time they are needed
+        if self._series is None:
+            topics = {}
+            series = {}
+            for row in self.recurrences.get_all_series():
+                task = self._row_to_series(row, topics)
+                series[task.id] = task
+            self._series = (series, self._group_overrides(self.recurrences.get_all_overrides()))
+        return self._series
+
+    def _forget_series(self, task_ids=None):
+        # Drop the recurrence cache once a change of a cached series (or any change, without task_ids) is committed
+        if self._series is None:
+            return
+        if task_ids is not None and self._series[0].keys().isdisjoint(task_ids):
+            return
+
+        def drop():
+            self._series = None
+
+        self.dao.db.after_commit(drop)
+
+    def _notify(self, kind, task_ids):
+        # Emit a change event once the change is committed (dropped if the transaction is rolled back)
+        # The affected tasks are re-read only when someone is listening
+        self._forget_series(task_ids)
+        if not self.events.has_subscribers or not task_ids:
+            return
+        task_ids = list(task_ids)
+
+        def emit():
+            items = [] if kind == DELETED else self._get_tasks_by_ids(task_ids)
+            self.events.emit(ChangeEvent(kind, "task", task_ids, items))
+
+        self.dao.db.after_commit(emit)
+
+    def _get_tasks_by_ids(self, task_ids):
+        # Read tasks by ID, with the rule of the recurring ones (so observers can tell a series from a task)
+        return self._attach_recurrences(self._rows_to_tasks(self.dao.get_tasks_by_ids(task_ids)))
+
+    def _attach_recurrences(self, tasks):
+        # Set the recurrence of the series among the tasks (one query); returns the tasks
+        rules = {row[0]: self._row_to_recurrence(row[1:])
+                 for row in self.recurrences.get_recurrences([task.id for task in tasks])}
+        for task in tasks:
+            task.recurrence = rules.get(task.id)
+        return tasks
+
+    def _occurrences_between(self, start_date, end_date):
+        # Generate the occurrences of the recurring tasks between two dates, applying their override rows
+        # Returns (IDs of the series involved, occurrences)
+        series_rows = self.recurrences.get_series_between(start_date, end_date)
+        if not series_rows:
+            return set(), []
+        overrides = self._group_overrides(self.recurrences.get_overrides_between(start_date, end_date))
+        topics = {}
+        return self._expand_series([self._row_to_series(row, topics) for row in series_rows],
+                                   overrides, start_date, end_date)
+
+    def _expand_series(self, series_tasks, overrides, start_date, end_date):
+        # Occurrences of the given series between two dates, with their overrides (series ID -> {date: override})
+        # Returns (IDs of the series, occurrences)
+        series_ids, occurrences = set(), []
+        for series in series_tasks:
+            series_ids.add(series.id)
+            if series.scheduled_date is None:
+                continue
+            first = series.scheduled_date
+            changed = overrides.get(series.id, {})
+            # Occurrences of the range, and occurrences of other days moved into it
+            days = set(series.recurrence.occurrences(first, start_date, end_date))
+            days.update(day for day in changed
+                        if day not in days and next(series.recurrence.occurrences(first, day, day), None))
+            for day in days:
+                occurrence = self._occurrence(series, day, changed.get(day))
+                if occurrence is not None and start_date <= occurrence.scheduled_date <= end_date:
+                    occurrences.append(occurrence)
+        return series_ids, occurrences
+
+    @staticmethod
+    def _group_overrides(rows):
+        # Group override rows (task_id, occurrence_day, ...) by series ID and occurrence date
+        overrides = {}
+        for task_id, occurrence_date, *override in rows:
+            overrides.setdefault(task_id, {})[from_epoch_day(occurrence_date)] = override
+        return overrides
+
+    def _row_to_series(self, row, topics=None):
+        # Convert a series row (rule columns followed by the task columns) into a Task carrying its Recurrence
+        series = self._row_to_task(row[5:], topics)
+        series.recurrence = self._row_to_recurrence(row[:5])
+        return series
+
+    @staticmethod
+    def _occurrence(series, day, override):
+        # Build the occurrence of a series on a day; None if the occurrence was cancelled
+        if override is None:
+            return TaskOccurrence(series, day)
+        is_cancelled, is_completed, scheduled_date, start_time, end_time = override
+        if is_cancelled:
+            return None
+        return TaskOccurrence(
+            series, day,
+            is_completed=bool(is_completed) if is_completed is not None else None,
+            scheduled_date=from_epoch_day(scheduled_date),
+            start_time=from_minute(start_time),
+            end_time=from_minute(end_time))
+
+    @staticmethod
+    def _row_to_recurrence(row):
+        # Convert (frequency, interval, weekdays, until_day, count) into a Recurrence
+        frequency, interval, weekdays, until, count = row
+        return Recurrence(frequency, interval, Recurrence.weekdays_from_mask(weekdays), from_epoch_day(until), count)
+
+    def _rows_to_tasks(self, rows):
+        # Convert the rows of one load; tasks of the same topic share one Topic object
+        topics = {}
+        return [self._row_to_task(row, topics) for row in rows]
 
-    def _row_to_task(self, row):
-        # Convert a database row into a Task object
+    def _row_to_task(self, row, topics=None):
+        # Convert a database row into a Task object (interning its Topic in `topics` if given)
         return Task(
             id=row[0],
             description=row[1],
-            topic=Topic(id=row[2], name=row[3]),
+            topic=intern_topic({} if topics is None else topics, row[2], row[3]),
             priority=row[4],
             is_completed=bool(row[5]),
-            scheduled_date=date.fromisoformat(row[6]) if row[6] else None,
-            start_time=time.fromisoformat(row[7]) if row[7] else None,
-            end_time=time.fromisoformat(row[8]) if row[8] else None
+            scheduled_date=from_epoch_day(row[6]),
+            start_time=from_minute(row[7]),
+            end_time=from_minute(row[8]),
+            estimated_minutes=row[9]
         )
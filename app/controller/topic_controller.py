@@ -1,47 +1,153 @@
 from app.db.topic_dao import TopicDAO
 from app.model.topic import Topic
+from app.controller.events import ChangeEvent, EventBus, CREATED, UPDATED, DELETED, RELOADED
 
 class TopicController:
     def __init__(self):
         # Initialize DAO for database interaction
         self.dao = TopicDAO()
 
+        # In-memory topic index, loaded once on first use and kept up to date by create/delete
+        self._by_id = {}
+        self._by_name = {}
+        self._loaded = False
+        # Incremented on every change of the topic set, so callers can tell if their copy is stale
+        self.version = 0
+        # Observers are notified of every committed change (see app.controller.events)
+        self.events = EventBus()
+
     def create_topic(self, topic_name: str):
         # Insert a new topic into the database
-        topic = Topic(name=topic_name)
-        self.dao.insert_topic(topic)
+        self._ensure_loaded()
+        self.dao.insert_topic(Topic(name=topic_name))
+        topic = self._by_name.get(topic_name)
+        if topic is None:
+            row = self.dao.get_topic_by_name(topic_name)
+            if row:
+                topic = self._row_to_topic(row)
+                self._update_index(lambda: self._add(topic))
+                self._notify(CREATED, [topic])
+        return topic
 
     def delete_topic(self, topic_id: int):
         # Permanently remove a topic by ID
         self.dao.delete_topic(topic_id)
+        topic = self._by_id.get(topic_id)
+        if topic:
+            self._update_index(lambda: self._remove(topic_id))
+            self._notify(DELETED, [topic])
+
+    def create_topics(self, topic_names):
+        # Insert several topics in a single transaction; returns their IDs
+        self._ensure_loaded()
+        topic_names = list(topic_names)
+        ids = self.dao.insert_topics(Topic(name=name) for name in topic_names)
+        created = [Topic(id=topic_id, name=name) for topic_id, name in zip(ids, topic_names) if topic_id not in self._by_id]
+
+        def add_created():
+            for topic in created:
+                self._add(topic)
+
+        self._update_index(add_created)
+        self._notify(CREATED, created)
+        return ids
+
+    def delete_topics(self, topic_ids):
+        # Remove several topics in a single transaction
+        topic_ids = list(topic_ids)
+        deleted = self.dao.delete_many(topic_ids)
+        removed = [self._by_id[topic_id] for topic_id in topic_ids if topic_id in self._by_id]
+
+        def remove_deleted():
+            for topic_id in topic_ids:
+                self._remove(topic_id)
+
+        self._update_index(remove_deleted)
+        self._notify(DELETED, removed)
+        return deleted
 
     def get_all_topics(self):
-        # Retrieve all topics and convert them to Topic objects
-        rows = self.dao.get_all_topics()
-        return [self._row_to_topic(row) for row in rows]
+        # Return all topics (served from the in-memory index)
+        self._ensure_loaded()
+        return list(self._by_id.values())
 
     def get_topic_by_id(self, topic_id: int):
         # Retrieve a topic by its ID
-        row = self.dao.get_topic_by_id(topic_id)
-        return self._row_to_topic(row) if row else None
-    
+        self._ensure_loaded()
+        return self._by_id.get(topic_id)
+
     def get_topic_by_name(self, name):
         # Retrieve a topic by its name
-        row = self.dao.get_topic_by_name(name)
-        if row:
-            return Topic(id=row[0], name=row[1])
-        return None
+        self._ensure_loaded()
+        return self._by_name.get(name)
 
     def get_topic_id(self, name: str) -> int | None:
         # Return the ID of a topic given its name
-        row = self.dao.get_topic_by_name(name)
-        return row[0] if row else None
-    
+        topic = self.get_topic_by_name(name)
+        return topic.id if topic else None
+
     def get_topic_name(self, id: int) -> str | None:
         # Return the name of a topic given its ID
-        row = self.dao.get_topic_by_id(id)
-        return row[1] if row else None
+        topic = self.get_topic_by_id(id)
+        return topic.name if topic else None
+
+    def invalidate(self):
+        # Drop the in-memory index (e.g. after the database was changed by someone else); reloaded on next use
+        self._by_id.clear()
+        self._by_name.clear()
+        self._loaded = False
+        self.version += 1
+
+    def apply_external_changes(self, changes):
+        # Reload the index after topics were changed by another process and announce the differences
+        previous = dict(self._by_id)
+        self.invalidate()
+        if changes.reload:
+            self.events.emit(ChangeEvent(RELOADED, "topic"))
+            return
+        self._ensure_loaded()
+        deleted = [previous[topic_id] for topic_id in changes.deleted if topic_id in previous]
+        if deleted:
+            self.events.emit(ChangeEvent(DELETED, "topic", [topic.id for topic in deleted], deleted))
+        changed = [self._by_id[topic_id] for topic_id in sorted(changes.changed) if topic_id in self._by_id]
+        if changed:
+            self.events.emit(ChangeEvent(UPDATED, "topic", [topic.id for topic in changed], changed))
+
+    def _ensure_loaded(self):
+        # Load every topic with a single query the first time the index is needed
+        if self._loaded:
+            return
+        for row in self.dao.get_all_topics():
+            self._add(self._row_to_topic(row))
+        self._loaded = True
+
+    def _add(self, topic: Topic):
+        self._by_id[topic.id] = topic
+        self._by_name[topic.name] = topic
+
+    def _remove(self, topic_id: int):
+        # Drop a topic from the index; returns the removed Topic (None if it was unknown)
+        topic = self._by_id.pop(topic_id, None)
+        if topic is not None:
+            self._by_name.pop(topic.name, None)
+        return topic
+
+    def _update_index(self, update):
+        # Apply a change to the in-memory index and bump the version once it is committed
+        # (dropped if the transaction is rolled back, so the index never holds rows the database lost)
+        def apply():
+            update()
+            self.version += 1
+
+        self.dao.db.after_commit(apply)
+
+    def _notify(self, kind, topics):
+        # Emit a change event once the change is committed (dropped if the transaction is rolled back)
+        if not self.events.has_subscribers or not topics:
+            return
+        event = ChangeEvent(kind, "topic", [topic.id for topic in topics], topics)
+        self.dao.db.after_commit(lambda: self.events.emit(event))
 
     def _row_to_topic(self, row):
         # Convert a database row into a Topic object
-        return Topic(id=row[0], name=row[1])
\ No newline at end of file
+        return Topic(id=row[0], name=row[1])
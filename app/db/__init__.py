@@ -1,6 +1,10 @@
-__all__ = ["database", "note_dao", "task_dao", "topic_dao"]
+__all__ = ["change_detector", "database", "encoding", "migrations", "note_dao", "recurrence_dao", "task_dao", "topic_dao"]
 
+from . import change_detector
 from . import database
+from . import encoding
+from . import migrations
 from . import note_dao
+from . import recurrence_dao
 from . import task_dao
 from . import topic_dao
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Detects changes written to the database by other processes
+PRAGMA data_version is a cheap way to tell that someone else committed; only then the
+change_log table (filled by triggers, see migrations) is read from the last sequence number
+seen, so just the changed rows have to be fetched again
+While data_version stays the same every new entry was written by this process, so the last
+sequence number seen is moved past them from time to time and the log is pruned there as well
+"""
+
+from app.db.migrations import LOGGED_TABLES
+
+
+class TableChanges:
+    """
+    Changes of one table since the previous poll
+    Attributes:
+        changed (set): IDs of rows inserted or updated (and still existing as far as the log tells)
+        deleted (set): IDs of deleted rows
+        reload (bool): The log was pruned past the last entry seen, so the whole table must be reloaded
+    """
+
+    def __init__(self, reload: bool = False):
+        self.changed = set()
+        self.deleted = set()
+        self.reload = reload
+
+    def __repr__(self):
+        return f"TableChanges(changed={sorted(self.changed)}, deleted={sorted(self.deleted)}, reload={self.reload})"
+
+
+class ChangeDetector:
+    # Keep at most this many entries in change_log; older ones are pruned while polling
+    MAX_LOG_ENTRIES = 10000
+    # Quiet polls between two catch-ups with the entries written by this process
+    CATCH_UP_POLLS = 30
+
+    def __init__(self, db, tables=LOGGED_TABLES):
+        self.db = db
+        self.tables = tuple(tables)
+        # Everything already in the log is reflected by the data loaded at startup
+        self.last_seq = self._max_seq()
+        self._data_version = db.data_version()
+        self._quiet_polls = 0
+        self._prune_if_needed(self.MAX_LOG_ENTRIES)
+
+    def poll(self) -> dict:
+        # Return {table: TableChanges} for the changes committed by other processes since the last poll
+        # (empty if nothing happened); the log is only read if data_version moved
+        self._quiet_polls += 1
+        # Read before data_version: entries committed by others after this read are above max_seq
+        catch_up = self._quiet_polls >= self.CATCH_UP_POLLS and not self.db.connection.in_transaction
+        max_seq = self._max_seq() if catch_up else None
+        version = self.db.data_version()
+        if version == self._data_version:
+            if catch_up:
+                # Nobody else committed, so the new entries are our own changes: skip and prune them
+                self._quiet_polls = 0
+                self.last_seq = max(self.last_seq, max_seq)
+                self._prune_if_needed(2 * self.MAX_LOG_ENTRIES)
+            return {}
+        self._data_version = version
+        self._quiet_polls = 0
+
+        if self._min_seq() > self.last_seq + 1:
+            # Entries we have not seen were pruned: the affected rows are unknown
+            self.last_seq = self._max_seq()
+            return {table: TableChanges(reload=True) for table in self.tables}
+
+        placeholders = ", ".join("?" * len(self.tables))
+        rows = self.db.connection.execute(
+            f"""SELECT seq, table_name, row_id, op FROM change_log
+            WHERE seq > ? AND table_name IN ({placeholders})
+            ORDER BY seq""",
+            (self.last_seq, *self.tables)).fetchall()
+
+        changes = {}
+        for seq, table, row_id, op in rows:
+            table_changes = changes.setdefault(table, TableChanges())
+            # Entries are read in order, so the last operation on a row decides
+            if op == "D":
+                table_changes.changed.discard(row_id)
+                table_changes.deleted.add(row_id)
+            else:
+                table_changes.deleted.discard(row_id)
+                table_changes.changed.add(row_id)
+            self.last_seq = seq
+
+        # Pruning is a write that other instances will notice, so it only happens once the log has doubled
+        if rows:
+            self._prune_if_needed(2 * self.MAX_LOG_ENTRIES)
+        # Changes made by this process are in the log too; re-applying them is harmless
+        return changes
+
+    def prune(self, keep: int = None):
+        # Drop the oldest log entries, keeping the last `keep` ones
+        keep = self.MAX_LOG_ENTRIES if keep is None else keep
+        with self.db.transaction():
+            self.db.connection.execute("DELETE FROM change_log WHERE seq <= ?", (self._max_seq() - keep,))
+
+    def _prune_if_needed(self, limit: int):
+        # Prune down to MAX_LOG_ENTRIES once the log holds `limit` entries
+        if self.last_seq - self._min_seq() >= limit:
+            self.prune()
+
+    def _max_seq(self) -> int:
+        return self.db.connection.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+    def _min_seq(self) -> int:
+        # The next seq to be assigned if the log is empty
+        row = self.db.connection.execute("SELECT MIN(seq) FROM change_log").fetchone()
+        return row[0] if row[0] is not None else self.last_seq + 1
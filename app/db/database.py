@@ -1,13 +1,100 @@
+import os
 import sqlite3
+from contextlib import contextmanager
+from app.db.migrations import migrate
+
+# Environment variable used to pick a performance profile without touching the code
+PROFILE_ENV_VAR = "MYSTUDYAGENDA_DB_PROFILE"
+DEFAULT_PROFILE = "balanced"
+
+# Named SQLite performance profiles (PRAGMA name -> value)
+# - durable: rollback journal with a full fsync on every commit (SQLite defaults)
+# - balanced: WAL journal, fsync only at checkpoints; a power loss can drop the last commits but never corrupts the file
+# - fast: WAL journal without fsync; a crash of the OS can lose or corrupt recent data
+PROFILES = {
+    "durable": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,  # negative values are KiB: ~2 MB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -8000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -32000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+# Accepted values for the non-numeric pragmas (values cannot be bound as SQL parameters)
+_PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+_NUMERIC_PRAGMAS = {"cache_size", "mmap_size"}
+
+
+def _profile_name(profile=None) -> str:
+    # Normalized name of the profile to use: the given one, else the environment one, else the default
+    return (profile or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE).strip().lower()
+
+
+def resolve_profile(profile=None, **overrides) -> dict:
+    # Return the pragma settings for a profile name (or the environment / default one),
+    # with any explicit overrides (e.g. cache_size=-16000) applied on top
+    name = _profile_name(profile)
+    if name not in PROFILES:
+        raise ValueError(f"Unknown database profile '{name}', expected one of {sorted(PROFILES)}")
+
+    pragmas = dict(PROFILES[name])
+    for key, value in overrides.items():
+        if key in _NUMERIC_PRAGMAS:
+            pragmas[key] = int(value)
+        elif key in _PRAGMA_CHOICES:
+            value = str(value).upper()
+            if value not in _PRAGMA_CHOICES[key]:
+                raise ValueError(f"Invalid value '{value}' for PRAGMA {key}")
+            pragmas[key] = value
+        else:
+            raise ValueError(f"Unsupported PRAGMA '{key}'")
+    return pragmas
+
 
 class Database:
     _instance = None
 
     # Initialize connection to the SQLite database
-    def __init__(self, db_name="planner.db"):
+    # profile: "durable", "balanced" or "fast" (defaults to $MYSTUDYAGENDA_DB_PROFILE, then "balanced")
+    # pragma overrides: cache_size, mmap_size, temp_store, journal_mode, synchronous
+    def __init__(self, db_name="planner.db", profile=None, **pragmas):
+        self.profile = _profile_name(profile)
+        settings = resolve_profile(self.profile, **pragmas)
         self.connection = sqlite3.connect(db_name)
         self.cursor = self.connection.cursor()
+        self._tx_depth = 0  # nesting level of transaction() blocks
+        self._after_commit = []  # callbacks waiting for the commit, one list per open block
+        self.pragmas = self.apply_profile(settings)
         self.create_tables()
+        self.migrate()
+
+    # Apply performance pragmas to the connection and return the values actually in effect
+    def apply_profile(self, pragmas: dict) -> dict:
+        applied = {}
+        for key, value in pragmas.items():
+            self.cursor.execute(f"PRAGMA {key} = {value}")
+            row = self.cursor.execute(f"PRAGMA {key}").fetchone()
+            applied[key] = row[0] if row else value
+        return applied
 
     # Create tables if they don't exist
     def create_tables(self):
@@ -42,9 +129,73 @@ class Database:
 
         self.connection.commit()
 
+    # Upgrade the schema in place to the latest version (indexes, new columns, ...)
+    def migrate(self):
+        return migrate(self.connection)
+
+    # Counter that changes whenever another connection (process) commits to the database file
+    # Commits made through this connection do not change it
+    def data_version(self) -> int:
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
     # Commit pending transactions to the database
+    # Inside a transaction() block the commit is deferred to the end of the outermost block
     def commit(self):
-        self.connection.commit()
+        if self._tx_depth == 0:
+            self.connection.commit()
+
+    @property
+    def in_transaction(self) -> bool:
+        # True while a transaction() block is open
+        return self._tx_depth > 0
+
+    # Run a callback once the current changes are committed (right away outside transaction() blocks)
+    # Callbacks registered inside a block that is rolled back are dropped
+    def after_commit(self, callback):
+        if self._tx_depth == 0:
+            callback()
+        else:
+            self._after_commit[-1].append(callback)
+
+    @contextmanager
+    def transaction(self):
+        # Unit of work: every statement executed inside the block is committed once at the end
+        # or rolled back as a whole if an exception escapes
+        # Nested blocks become savepoints, so an inner failure only undoes the inner changes
+        depth = self._tx_depth
+        cursor = self.connection.cursor()
+        if depth == 0:
+            # Flush statements still pending from outside any block before starting a clean transaction
+            if self.connection.in_transaction:
+                self.connection.commit()
+            cursor.execute("BEGIN")
+        else:
+            cursor.execute(f"SAVEPOINT sp_{depth}")
+        self._tx_depth += 1
+        self._after_commit.append([])
+
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            self._after_commit.pop()
+            if depth == 0:
+                self.connection.rollback()
+            else:
+                cursor.execute(f"ROLLBACK TO sp_{depth}")
+                cursor.execute(f"RELEASE sp_{depth}")
+            raise
+        else:
+            self._tx_depth -= 1
+            callbacks = self._after_commit.pop()
+            if depth == 0:
+                self.connection.commit()
+                for callback in callbacks:
+                    callback()
+            else:
+                cursor.execute(f"RELEASE sp_{depth}")
+                # Released savepoints are committed together with the enclosing block
+                self._after_commit[-1].extend(callbacks)
 
     # Close the database connection
     def close(self):
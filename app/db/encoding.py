@@ -0,0 +1,55 @@
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+
+"""
+Integer encodings of the dates and times stored in the database, next to their TEXT columns
+    epoch day: days since 1970-01-01 (tasks.scheduled_day)
+    minute: minutes since midnight (tasks.start_minute, tasks.end_minute)
+    timestamp: Unix time in seconds of a local naive datetime (notes.created_ts)
+Integers compare and sort in the indexes without collation and decode without string parsing
+"""
+
+EPOCH = date(1970, 1, 1)
+
+
+def to_epoch_day(value):
+    # Encode a datetime.date or a "YYYY-MM-DD" string; None if the value is empty
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return (value - EPOCH).days
+
+
+def to_minute(value):
+    # Encode a datetime.time or a "HH:MM[:SS]" string; None if the value is empty
+    if not value:
+        return None
+    if isinstance(value, str):
+        hours, minutes = value.split(":")[:2]
+        return int(hours) * 60 + int(minutes)
+    return value.hour * 60 + value.minute
+
+
+def to_timestamp(value):
+    # Encode a datetime or an ISO 8601 string; None if the value is empty
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.timestamp())
+
+
+# Decoded dates and times are immutable and repeat across rows, so the objects are shared
+@lru_cache(maxsize=4096)
+def from_epoch_day(value):
+    return EPOCH + timedelta(days=value) if value is not None else None
+
+
+@lru_cache(maxsize=2048)
+def from_minute(value):
+    return time(value // 60, value % 60) if value is not None else None
+
+
+def from_timestamp(value):
+    return datetime.fromtimestamp(value) if value is not None else None
@@ -0,0 +1,303 @@
+"""
+Versioned schema migrations for the SQLite database
+The schema version is stored in PRAGMA user_version: a database at version N has
+already applied the first N steps of MIGRATIONS. Every step must be idempotent
+(IF NOT EXISTS, ...) so that a partially upgraded planner.db can be migrated again
+"""
+
+import sqlite3
+
+
+def _add_task_indexes(cursor):
+    # Planner week renders filter by date and sort by start time
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_schedule ON tasks(scheduled_date, start_time)")
+    # Join and delete paths on topics
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_topic ON tasks(topic_id)")
+    # Completed / pending filters
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks(is_completed)")
+
+
+def _add_note_indexes(cursor):
+    # Notes are always listed newest first
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notes_created_at ON notes(created_at)")
+
+
+def _add_notes_fulltext(cursor):
+    # Full-text index over notes(title, content), kept in sync by triggers
+    # External content table: the text itself is only stored once, in notes
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+                title, content,
+                content='notes', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            ); """)
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5: search falls back to LIKE queries
+        return
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN
+            INSERT INTO notes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END; """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN
+            INSERT INTO notes_fts(notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END; """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE OF title, content ON notes BEGIN
+            INSERT INTO notes_fts(notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO notes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END; """)
+
+    # Matches in the title weigh more than matches in the body
+    cursor.execute("INSERT INTO notes_fts(notes_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    # Index the notes that already exist
+    cursor.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+
+
+# Tables whose row changes are recorded in change_log
+LOGGED_TABLES = ("tasks", "notes", "topics")
+
+
+def _add_change_log(cursor):
+    # Append-only log of row changes, written by triggers so that changes made by any process
+    # (another app instance, a script) are recorded; readers fetch the entries after the last seq they saw
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL CHECK (op IN ('I', 'U', 'D'))
+        ); """)
+    for table in LOGGED_TABLES:
+        for event, op, ref in (("INSERT", "I", "new"), ("UPDATE", "U", "new"), ("DELETE", "D", "old")):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_log_{op.lower()} AFTER {event} ON {table} BEGIN
+                    INSERT INTO change_log(table_name, row_id, op) VALUES ('{table}', {ref}.id, '{op}');
+                END; """)
+
+
+def _add_task_estimates(cursor):
+    # Estimated duration of a task in minutes (NULL = unknown), used by the auto-scheduler
+    # ALTER TABLE has no IF NOT EXISTS: check the columns first so the step can run again
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(tasks)")}
+    if "estimated_minutes" not in columns:
+        cursor.execute("ALTER TABLE tasks ADD COLUMN estimated_minutes INTEGER")
+    # The auto-scheduler reads the open, unscheduled tasks
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_unscheduled ON tasks(priority DESC, id) "
+                   "WHERE scheduled_date IS NULL AND is_completed = 0")
+
+
+def _add_recurrences(cursor):
+    # Recurring tasks: the task row holds the first occurrence, task_recurrences its repetition rule
+    # and task_overrides the occurrences changed individually (completed, moved or cancelled)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS task_recurrences (
+            task_id INTEGER PRIMARY KEY REFERENCES tasks(id),
+            frequency TEXT NOT NULL CHECK (frequency IN ('daily', 'weekly')),
+            interval INTEGER NOT NULL DEFAULT 1,
+            weekdays INTEGER NOT NULL DEFAULT 0,
+            until TEXT,
+            count INTEGER
+        ); """)
+    # NULL columns inherit the value of the series
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS task_overrides (
+            task_id INTEGER NOT NULL REFERENCES tasks(id),
+            occurrence_date TEXT NOT NULL,
+            is_cancelled BOOLEAN NOT NULL DEFAULT 0,
+            is_completed BOOLEAN,
+            scheduled_date TEXT,
+            start_time TEXT,
+            end_time TEXT,
+            PRIMARY KEY (task_id, occurrence_date)
+        ); """)
+    # Overrides are looked up by the date range being viewed (original or new date)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_overrides_occurrence ON task_overrides(occurrence_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_overrides_scheduled ON task_overrides(scheduled_date)")
+    # Deleting a task deletes its rule and overrides, whoever deletes it
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_recurrence_ad AFTER DELETE ON tasks BEGIN
+            DELETE FROM task_recurrences WHERE task_id = old.id;
+            DELETE FROM task_overrides WHERE task_id = old.id;
+        END; """)
+    # A changed rule or occurrence is a change of its task for the other processes (see change_log)
+    for table in ("task_recurrences", "task_overrides"):
+        for event in ("INSERT", "UPDATE"):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_log_{event[0].lower()} AFTER {event} ON {table} BEGIN
+                    INSERT INTO change_log(table_name, row_id, op) VALUES ('tasks', new.task_id, 'U');
+                END; """)
+
+
+def _day_of(column):
+    # SQL expression converting a "YYYY-MM-DD" TEXT column into days since 1970-01-01 (NULL stays NULL)
+    # 2440587.5 is the Julian day of 1970-01-01
+    return f"CAST(julianday({column}) - 2440587.5 AS INTEGER)"
+
+
+def _minutes_of(column):
+    # SQL expression converting an "H:MM" / "HH:MM[:SS]" TEXT column into minutes since midnight (NULL stays NULL)
+    return (f"CAST(substr({column}, 1, instr({column}, ':') - 1) AS INTEGER) * 60"
+            f" + CAST(substr({column}, instr({column}, ':') + 1, 2) AS INTEGER)")
+
+
+def _timestamp_of(column):
+    # SQL expression converting a local-time ISO 8601 TEXT column into Unix time
+    # The 'utc' modifier treats the value as local time, as datetime.timestamp does
+    return f"CAST(strftime('%s', {column}, 'utc') AS INTEGER)"
+
+
+def _task_slot_differs(ref=""):
+    # SQL condition: the integer date/times of a task row do not match its TEXT columns
+    return (f"{ref}scheduled_day IS NOT {_day_of(ref + 'scheduled_date')}"
+            f" OR {ref}start_minute IS NOT {_minutes_of(ref + 'start_time')}"
+            f" OR {ref}end_minute IS NOT {_minutes_of(ref + 'end_time')}")
+
+
+def _fill_integer_dates(cursor):
+    # Derive the integer columns of the rows where they are missing or stale
+    # The rows do not change for the app, so the change_log entries of this fill are dropped
+    last_seq = cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+    cursor.execute(f"""
+        UPDATE tasks
+        SET scheduled_day = {_day_of("scheduled_date")},
+            start_minute = {_minutes_of("start_time")},
+            end_minute = {_minutes_of("end_time")}
+        WHERE {_task_slot_differs()} """)
+    cursor.execute(f"""
+        UPDATE notes SET created_ts = {_timestamp_of("created_at")}
+        WHERE created_ts IS NOT {_timestamp_of("created_at")} """)
+    cursor.execute("DELETE FROM change_log WHERE seq > ?", (last_seq,))
+
+
+def _add_integer_dates(cursor):
+    # Integer copies of the dates and times (see app.db.encoding), written next to the TEXT columns:
+    # range queries and sorts compare integers and rows are decoded without parsing strings
+    task_columns = {row[1] for row in cursor.execute("PRAGMA table_info(tasks)")}
+    for column in ("scheduled_day", "start_minute", "end_minute"):
+        if column not in task_columns:
+            cursor.execute(f"ALTER TABLE tasks ADD COLUMN {column} INTEGER")
+    note_columns = {row[1] for row in cursor.execute("PRAGMA table_info(notes)")}
+    if "created_ts" not in note_columns:
+        cursor.execute("ALTER TABLE notes ADD COLUMN created_ts INTEGER")
+    _fill_integer_dates(cursor)
+
+    # The indexes of the planner range query and of the notes listing move to the integer columns
+    cursor.execute("DROP INDEX IF EXISTS idx_tasks_schedule")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_day ON tasks(scheduled_day, start_minute)")
+    cursor.execute("DROP INDEX IF EXISTS idx_notes_created_at")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notes_created_ts ON notes(created_ts)")
+
+
+def _sync_integer_dates(cursor):
+    # Other processes (older versions, scripts) only write the TEXT columns: triggers derive the
+    # integer columns for them. Rows written by the DAOs already match, so the triggers do nothing there
+    _fill_integer_dates(cursor)
+    set_slot = (f"UPDATE tasks SET scheduled_day = {_day_of('new.scheduled_date')}, "
+                f"start_minute = {_minutes_of('new.start_time')}, end_minute = {_minutes_of('new.end_time')} "
+                "WHERE id = new.id;")
+    set_created = f"UPDATE notes SET created_ts = {_timestamp_of('new.created_at')} WHERE id = new.id;"
+    for name, event, when, action in (
+            ("tasks_dates_ai", "INSERT ON tasks", _task_slot_differs("new."), set_slot),
+            ("tasks_dates_au", "UPDATE OF scheduled_date, start_time, end_time ON tasks", _task_slot_differs("new."), set_slot),
+            ("notes_created_ai", "INSERT ON notes", f"new.created_ts IS NOT {_timestamp_of('new.created_at')}", set_created),
+            ("notes_created_au", "UPDATE OF created_at ON notes", f"new.created_ts IS NOT {_timestamp_of('new.created_at')}", set_created)):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} WHEN {when} BEGIN
+                {action}
+            END; """)
+
+    # The auto-scheduler's query reads the unscheduled tasks through the integer date as well
+    cursor.execute("DROP INDEX IF EXISTS idx_tasks_unscheduled")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_unscheduled ON tasks(priority DESC, id) "
+                   "WHERE scheduled_day IS NULL AND is_completed = 0")
+
+
+# Integer columns of the recurrence tables: table -> [(integer column, TEXT column, SQL conversion)]
+_RECURRENCE_INTEGER_COLUMNS = {
+    "task_recurrences": [("until_day", "until", _day_of)],
+    "task_overrides": [
+        ("occurrence_day", "occurrence_date", _day_of),
+        ("scheduled_day", "scheduled_date", _day_of),
+        ("start_minute", "start_time", _minutes_of),
+        ("end_minute", "end_time", _minutes_of),
+    ],
+}
+
+
+def _add_recurrence_integer_dates(cursor):
+    # Rules and overrides get integer dates and times as well, so the per-range series and override
+    # queries compare integers; like tasks, the TEXT columns stay and triggers derive the integers
+    # for rows written only through them. The fill is not a change for the app, so it is not logged
+    last_seq = cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+    for table, columns in _RECURRENCE_INTEGER_COLUMNS.items():
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for column, _, _ in columns:
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER")
+
+        def differs(ref):
+            return " OR ".join(f"{ref}{column} IS NOT {convert(ref + text)}" for column, text, convert in columns)
+
+        def assignments(ref):
+            return ", ".join(f"{column} = {convert(ref + text)}" for column, text, convert in columns)
+
+        cursor.execute(f"UPDATE {table} SET {assignments('')} WHERE {differs('')}")
+        text_columns = ", ".join(text for _, text, _ in columns)
+        for suffix, event in (("ai", "INSERT"), ("au", f"UPDATE OF {text_columns}")):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_dates_{suffix} AFTER {event} ON {table} WHEN {differs("new.")} BEGIN
+                    UPDATE {table} SET {assignments("new.")} WHERE rowid = new.rowid;
+                END; """)
+    cursor.execute("DELETE FROM change_log WHERE seq > ?", (last_seq,))
+
+    # Overrides are looked up by the range being viewed, on their original or new date
+    cursor.execute("DROP INDEX IF EXISTS idx_overrides_occurrence")
+    cursor.execute("DROP INDEX IF EXISTS idx_overrides_scheduled")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_overrides_occurrence_day ON task_overrides(occurrence_day)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_overrides_scheduled_day ON task_overrides(scheduled_day)")
+
+# Ordered list of migration steps; step i (1-based) upgrades the schema to version i
+MIGRATIONS = [
+    _add_task_indexes,
+    _add_note_indexes,
+    _add_notes_fulltext,
+    _add_change_log,
+    _add_task_estimates,
+    _add_recurrences,
+    _add_integer_dates,
+    _sync_integer_dates,
+    _add_recurrence_integer_dates,
+]
+
+
+def get_schema_version(connection) -> int:
+    # Read the schema version recorded in the database header
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(connection, migrations=MIGRATIONS) -> int:
+    # Apply every pending migration in order; each step runs in its own transaction
+    # together with the version bump, so a failure leaves the database at the previous version
+    version = get_schema_version(connection)
+    if version < len(migrations) and connection.in_transaction:
+        # Flush pending statements so each step can run in its own transaction
+        connection.commit()
+    for target, step in enumerate(migrations, start=1):
+        if target <= version:
+            continue
+        cursor = connection.cursor()
+        try:
+            cursor.execute("BEGIN")
+            step(cursor)
+            cursor.execute(f"PRAGMA user_version = {target}")
+            cursor.execute("COMMIT")
+        except Exception:
+            if connection.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+        version = target
+    return version
@@ -1,6 +1,38 @@
+import re
 from app.db.database import Database
+from app.db.encoding import to_timestamp
 from app.model.note import Note
 
+# created_at (TEXT) is still written, for older versions of the app and other readers of planner.db
+_INSERT_NOTE = """ INSERT INTO notes (title, topic_id, content, created_at, created_ts)
+                VALUES (?, ?, ?, ?, ?) """
+
+# Notes joined with their topic name: rows are (id, title, topic_id, content, created_ts, topic_name)
+# Uses a LEFT JOIN so notes without a topic are still returned
+# The creation date is read as a Unix timestamp (see app.db.encoding)
+_SELECT_NOTES = """SELECT n.id, n.title, n.topic_id, n.content, n.created_ts, tp.name
+            FROM notes n
+            LEFT JOIN topics tp ON n.topic_id = tp.id"""
+
+# Notes without their full content: rows are (id, title, topic_id, topic_name, created_ts, content_length, preview)
+_SELECT_SUMMARIES = """SELECT n.id, n.title, n.topic_id, tp.name, n.created_ts, length(n.content), substr(n.content, 1, ?)
+            FROM notes n
+            LEFT JOIN topics tp ON n.topic_id = tp.id"""
+
+
+def _note_params(note: Note):
+    # Map a Note to the parameters of the INSERT statement
+    return (note.title, note.topic.id if note.topic else None, note.content, note.created_at.isoformat(),
+            to_timestamp(note.created_at))
+
+
+def _fts_query(text: str) -> str:
+    # Turn free user input into a safe FTS5 query: every word must match, as a prefix
+    # Words are quoted so characters with a meaning in the FTS5 syntax (", *, -, :, ...) are ignored
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"*' for word in words)
+
+
 class NoteDAO:
     def __init__(self):
         # Get a singleton instance of the database connection
@@ -8,23 +40,89 @@ class NoteDAO:
 
     def insert_note(self, note: Note):
         # Insert a new note into the database
-        self.db.cursor.execute(
-            """ INSERT INTO notes (title, topic_id, content, created_at)
-                VALUES (?, ?, ?, ?) """,
-        (note.title, note.topic.id if note.topic else None, note.content, note.created_at.isoformat()))
+        self.db.cursor.execute(_INSERT_NOTE, _note_params(note))
         self.db.commit()
  
         # Returns the ID of the inserted note
         return self.db.cursor.lastrowid
 
+    def insert_notes(self, notes):
+        # Insert many notes with a single executemany in one transaction; returns the new IDs in input order
+        count = 0
+
+        def params():
+            nonlocal count
+            for note in notes:
+                count += 1
+                yield _note_params(note)
+
+        with self.db.transaction():
+            self.db.cursor.executemany(_INSERT_NOTE, params())
+            last_id = self.db.cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        # AUTOINCREMENT ids are assigned consecutively while the transaction holds the write lock
+        return list(range(last_id - count + 1, last_id + 1)) if count else []
+
     def get_all_notes(self):
         # Retrieve all notes ordered by creation date (newest first)
-        self.db.cursor.execute("SELECT * FROM notes ORDER BY created_at DESC")
+        self.db.cursor.execute(_SELECT_NOTES + " ORDER BY n.created_ts DESC, n.id DESC")
+        return self.db.cursor.fetchall()
+
+    def get_note_summaries(self, preview_length: int = 80):
+        # Retrieve the notes for listing without their full content, newest first
+        # Rows are (id, title, topic_id, topic_name, created_ts, content_length, preview)
+        self.db.cursor.execute(_SELECT_SUMMARIES + " ORDER BY n.created_ts DESC, n.id DESC", (preview_length,))
         return self.db.cursor.fetchall()
 
+    def get_note_summaries_by_ids(self, note_ids, preview_length: int = 80):
+        # Retrieve the summaries of the given notes, newest first; IDs are looked up in chunks
+        # to stay below SQLite's host parameter limit
+        note_ids = list(note_ids)
+        rows = []
+        for i in range(0, len(note_ids), 500):
+            chunk = note_ids[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            self.db.cursor.execute(_SELECT_SUMMARIES + f" WHERE n.id IN ({placeholders})", [preview_length, *chunk])
+            rows.extend(self.db.cursor.fetchall())
+        return sorted(rows, key=lambda row: (row[4], row[0]), reverse=True)
+
+    def get_note_content(self, note_id: int):
+        # Retrieve only the content of a note; None if the note does not exist
+        self.db.cursor.execute("SELECT content FROM notes WHERE id = ?", (note_id,))
+        row = self.db.cursor.fetchone()
+        return row[0] if row else None
+
+    def get_notes_page(self, after_created_ts=None, after_id=None, limit=50):
+        # Keyset pagination in listing order (newest first): return up to `limit` notes
+        # that come after the note identified by (after_created_ts, after_id)
+        # Served by the created_ts index, so the cost of a page does not grow with its position
+        if after_created_ts is None:
+            self.db.cursor.execute(
+                _SELECT_NOTES + " ORDER BY n.created_ts DESC, n.id DESC LIMIT ?", (limit,))
+        else:
+            self.db.cursor.execute(
+                _SELECT_NOTES + """
+                WHERE (n.created_ts, n.id) < (?, ?)
+                ORDER BY n.created_ts DESC, n.id DESC LIMIT ?""",
+                (after_created_ts, after_id if after_id is not None else 0, limit))
+        return self.db.cursor.fetchall()
+
+    def iter_notes(self, chunk_size=200):
+        # Stream all notes newest first, reading `chunk_size` rows at a time
+        # A dedicated cursor is used so other queries on the shared cursor don't interrupt the stream
+        cursor = self.db.connection.cursor()
+        try:
+            cursor.execute(_SELECT_NOTES + " ORDER BY n.created_ts DESC, n.id DESC")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
     def get_note_by_id(self, note_id: int):
         # Retrieve a single note by its ID
-        self.db.cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
+        self.db.cursor.execute(_SELECT_NOTES + " WHERE n.id = ?", (note_id,))
         return self.db.cursor.fetchone()
 
     def delete_note(self, note_id: int):
@@ -32,10 +130,53 @@ class NoteDAO:
         self.db.cursor.execute("DELETE FROM notes WHERE id = ?", (note_id,))
         self.db.commit()
 
+    def delete_many(self, note_ids):
+        # Delete many notes in one transaction; returns the number of deleted rows
+        with self.db.transaction():
+            self.db.cursor.executemany("DELETE FROM notes WHERE id = ?", ((i,) for i in note_ids))
+        return self.db.cursor.rowcount
+
     def update_note(self, note_id, new_content):
         # Update the content of an existing note by its ID
         self.db.cursor.execute(
             "UPDATE notes SET content = ? WHERE id = ?",
             (new_content, note_id)
         )
-        self.db.connection.commit()
\ No newline at end of file
+        self.db.commit()
+
+    def has_fulltext_index(self) -> bool:
+        # True if the notes_fts table exists (SQLite compiled with FTS5)
+        self.db.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'")
+        return self.db.cursor.fetchone() is not None
+
+    def search(self, query: str, limit: int = 20):
+        # Full-text search over title and content; returns rows (id, title, topic_id, created_ts, snippet, score, topic_name)
+        # ordered by relevance. FTS5 sorts by rank internally, so snippets are only built for the returned rows
+        match = _fts_query(query)
+        if not match:
+            return []
+
+        if self.has_fulltext_index():
+            self.db.cursor.execute(
+                """SELECT n.id, n.title, n.topic_id, n.created_ts,
+                          snippet(notes_fts, -1, '', '', '...', 12), notes_fts.rank, tp.name
+                FROM notes_fts
+                JOIN notes n ON n.id = notes_fts.rowid
+                LEFT JOIN topics tp ON n.topic_id = tp.id
+                WHERE notes_fts MATCH ?
+                ORDER BY notes_fts.rank
+                LIMIT ?""",
+                (match, limit))
+            return self.db.cursor.fetchall()
+
+        # Fallback without FTS5: plain substring match, newest first
+        pattern = f"%{query.strip()}%"
+        self.db.cursor.execute(
+            """SELECT n.id, n.title, n.topic_id, n.created_ts, substr(n.content, 1, 80), 0.0, tp.name
+            FROM notes n
+            LEFT JOIN topics tp ON n.topic_id = tp.id
+            WHERE n.title LIKE ? OR n.content LIKE ?
+            ORDER BY n.created_ts DESC
+            LIMIT ?""",
+            (pattern, pattern, limit))
+        return self.db.cursor.fetchall()
@@ -0,0 +1,111 @@
+from app.db.database import Database
+from app.db.encoding import to_epoch_day, to_minute
+from app.db.task_dao import _SELECT_TASKS, format_date, format_time
+from app.model.recurrence import Recurrence
+
+# Series rows: the columns of the rule followed by the task columns of _SELECT_TASKS
+# As for tasks, dates and times are read as integers (see app.db.encoding) and the TEXT columns are still written
+_SELECT_SERIES = _SELECT_TASKS.replace(
+    "SELECT t.id,", "SELECT r.frequency, r.interval, r.weekdays, r.until_day, r.count, t.id,", 1) + """
+            JOIN task_recurrences r ON r.task_id = t.id"""
+
+
+class RecurrenceDAO:
+    def __init__(self):
+        # Get a singleton instance of the database connection
+        self.db = Database.get_instance()
+
+    def insert_recurrence(self, task_id: int, recurrence: Recurrence):
+        # Store the repetition rule of a task (replacing its previous rule)
+        self.db.cursor.execute(
+            """INSERT OR REPLACE INTO task_recurrences (task_id, frequency, interval, weekdays, until, count, until_day)
+            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (task_id, recurrence.frequency, recurrence.interval, recurrence.weekday_mask,
+             format_date(recurrence.until), recurrence.count, to_epoch_day(recurrence.until)))
+        self.db.commit()
+
+    def delete_recurrence(self, task_id: int):
+        # Turn a series back into a single task (its overrides are dropped as well)
+        self.db.cursor.execute("DELETE FROM task_recurrences WHERE task_id = ?", (task_id,))
+        self.db.cursor.execute("DELETE FROM task_overrides WHERE task_id = ?", (task_id,))
+        self.db.commit()
+
+    def get_series_between(self, start_date, end_date):
+        # Retrieve the series that can have occurrences between two dates: started by the end of the range
+        # and not ended before its start, or with an occurrence moved into the range
+        # Rows are (frequency, interval, weekdays, until_day, count) followed by the columns of _SELECT_TASKS
+        start, end = to_epoch_day(start_date), to_epoch_day(end_date)
+        self.db.cursor.execute(
+            _SELECT_SERIES + """
+            WHERE (t.scheduled_day <= ? AND (r.until_day IS NULL OR r.until_day >= ?))
+               OR t.id IN (SELECT task_id FROM task_overrides WHERE scheduled_day BETWEEN ? AND ?)
+            ORDER BY t.id""",
+            (end, start, start, end))
+        return self.db.cursor.fetchall()
+
+    def get_all_series(self):
+        # Retrieve every series, in the row format of get_series_between
+        self.db.cursor.execute(_SELECT_SERIES + " ORDER BY t.id")
+        return self.db.cursor.fetchall()
+
+    def get_recurrences(self, task_ids):
+        # Retrieve (task_id, frequency, interval, weekdays, until_day, count) of the series among the given tasks
+        task_ids = list(task_ids)
+        rows = []
+        for i in range(0, len(task_ids), 500):
+            chunk = task_ids[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            self.db.cursor.execute(
+                "SELECT task_id, frequency, interval, weekdays, until_day, count FROM task_recurrences "
+                f"WHERE task_id IN ({placeholders})", chunk)
+            rows.extend(self.db.cursor.fetchall())
+        return rows
+
+    def get_overrides_between(self, start_date, end_date):
+        # Retrieve the overrides of occurrences falling in, or moved into, a date range
+        # Rows are (task_id, occurrence_day, is_cancelled, is_completed, scheduled_day, start_minute, end_minute)
+        start, end = to_epoch_day(start_date), to_epoch_day(end_date)
+        self.db.cursor.execute(
+            """SELECT task_id, occurrence_day, is_cancelled, is_completed, scheduled_day, start_minute, end_minute
+            FROM task_overrides
+            WHERE occurrence_day BETWEEN ? AND ? OR scheduled_day BETWEEN ? AND ?""",
+            (start, end, start, end))
+        return self.db.cursor.fetchall()
+
+    def get_all_overrides(self):
+        # Retrieve every override, in the row format of get_overrides_between
+        self.db.cursor.execute(
+            """SELECT task_id, occurrence_day, is_cancelled, is_completed, scheduled_day, start_minute, end_minute
+            FROM task_overrides""")
+        return self.db.cursor.fetchall()
+
+    def set_completed(self, task_id: int, occurrence_date, completed: bool):
+        # Mark a single occurrence as completed or not, creating its override row if needed
+        self.db.cursor.execute(
+            """INSERT INTO task_overrides (task_id, occurrence_date, occurrence_day, is_completed) VALUES (?, ?, ?, ?)
+            ON CONFLICT (task_id, occurrence_date) DO UPDATE SET is_completed = excluded.is_completed""",
+            (task_id, format_date(occurrence_date), to_epoch_day(occurrence_date), completed))
+        self.db.commit()
+
+    def set_time_slot(self, task_id: int, occurrence_date, scheduled_date, start_time, end_time):
+        # Move a single occurrence to another date and/or time, creating its override row if needed
+        self.db.cursor.execute(
+            """INSERT INTO task_overrides (task_id, occurrence_date, scheduled_date, start_time, end_time,
+                                          occurrence_day, scheduled_day, start_minute, end_minute)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (task_id, occurrence_date) DO UPDATE SET scheduled_date = excluded.scheduled_date,
+                start_time = excluded.start_time, end_time = excluded.end_time,
+                scheduled_day = excluded.scheduled_day, start_minute = excluded.start_minute,
+                end_minute = excluded.end_minute""",
+            (task_id, format_date(occurrence_date), format_date(scheduled_date),
+             format_time(start_time), format_time(end_time), to_epoch_day(occurrence_date),
+             to_epoch_day(scheduled_date), to_minute(start_time), to_minute(end_time)))
+        self.db.commit()
+
+    def cancel(self, task_id: int, occurrence_date):
+        # Skip a single occurrence (an exception to the rule)
+        self.db.cursor.execute(
+            """INSERT INTO task_overrides (task_id, occurrence_date, occurrence_day, is_cancelled) VALUES (?, ?, ?, 1)
+            ON CONFLICT (task_id, occurrence_date) DO UPDATE SET is_cancelled = 1""",
+            (task_id, format_date(occurrence_date), to_epoch_day(occurrence_date)))
+        self.db.commit()
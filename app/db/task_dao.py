@@ -1,6 +1,79 @@
 from app.db.database import Database
+from app.db.encoding import EPOCH, to_epoch_day, to_minute
 from app.model.task import Task
 
+# The TEXT date and times are still written, for older versions of the app and other readers of planner.db
+# (rows written by them through the TEXT columns get their integer columns from triggers, see migrations)
+_INSERT_TASK = """INSERT INTO tasks (description, topic_id, priority, is_completed, scheduled_date, start_time, end_time, estimated_minutes,
+                                     scheduled_day, start_minute, end_minute)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_SET_TIME_SLOT = """UPDATE tasks
+            SET scheduled_date = ?, start_time = ?, end_time = ?, scheduled_day = ?, start_minute = ?, end_minute = ?
+            WHERE id = ?"""
+
+# Uses a LEFT JOIN so tasks without a topic are still returned
+# The date and times are read as integers (epoch day, minutes since midnight, see app.db.encoding)
+_SELECT_TASKS = """SELECT t.id, t.description, t.topic_id, tp.name, t.priority, t.is_completed, t.scheduled_day, t.start_minute, t.end_minute,
+                   t.estimated_minutes
+            FROM tasks t
+            LEFT JOIN topics tp ON t.topic_id = tp.id"""
+
+# Open tasks without a date, read in the order of the partial index idx_tasks_unscheduled (see migrations)
+# The planner would otherwise pick idx_tasks_completed and sort in a temp B-tree, so the index is forced
+_SELECT_UNSCHEDULED = """SELECT id, priority, estimated_minutes
+            FROM tasks INDEXED BY idx_tasks_unscheduled
+            WHERE scheduled_day IS NULL AND is_completed = 0
+            ORDER BY priority DESC, id"""
+
+
+def format_date(value):
+    # Normalize a date value to a string ("YYYY-MM-DD").
+    # Accepts either a datetime.date object or a string.
+    # Returns None if the value is empty.
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value  # already a string from the UI
+    return value.strftime("%Y-%m-%d")  # convert date object to string
+
+
+def format_time(value):
+    # Normalize a time value to a string ("HH:MM").
+    # Accepts either a datetime.time object or a string.
+    # Returns None if the value is empty.
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value  # already a string from the UI
+    return value.strftime("%H:%M")  # convert time object to string
+
+
+def _task_params(task: Task):
+    # Map a Task to the parameters of the INSERT statement
+    return (
+        task.description,
+        task.topic.id if task.topic else None,
+        task.priority,
+        task.is_completed,
+        # Converts datetime fields (scheduled_date, start_time, end_time) to string format
+        format_date(task.scheduled_date),
+        format_time(task.start_time),
+        format_time(task.end_time),
+        task.estimated_minutes,
+        # and to their integer encoding
+        to_epoch_day(task.scheduled_date),
+        to_minute(task.start_time),
+        to_minute(task.end_time),
+    )
+
+
+def _slot_params(task_id, scheduled_date, start_time, end_time):
+    # Map a time slot to the parameters of the UPDATE statement
+    return (format_date(scheduled_date), format_time(start_time), format_time(end_time),
+            to_epoch_day(scheduled_date), to_minute(start_time), to_minute(end_time), task_id)
+
+
 class TaskDAO:
     def __init__(self):
         # Get a singleton instance of the database connection
@@ -8,62 +81,137 @@ class TaskDAO:
 
     def insert_task(self, task: Task):
         # Inserts a new task into the database
-        def format_date(value):
-            # Normalize a date value to a string ("YYYY-MM-DD").
-            # Accepts either a datetime.date object or a string.
-            # Returns None if the value is empty.
-            if not value:
-                return None
-            if isinstance(value, str):
-                return value  # already a string from the UI
-            return value.strftime("%Y-%m-%d")  # convert date object to string
-
-        def format_time(value):
-            # Normalize a time value to a string ("HH:MM").
-            # Accepts either a datetime.time object or a string.
-            # Returns None if the value is empty.
-            if not value:
-                return None
-            if isinstance(value, str):
-                return value  # already a string from the UI
-            return value.strftime("%H:%M")  # convert time object to string
-
-        self.db.cursor.execute(
-            """INSERT INTO tasks (description, topic_id, priority, is_completed, scheduled_date, start_time, end_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
-                task.description,
-                task.topic.id if task.topic else None,
-                task.priority,
-                task.is_completed,
-                # Converts datetime fields (scheduled_date, start_time, end_time) to string format
-                format_date(task.scheduled_date),
-                format_time(task.start_time),
-                format_time(task.end_time),
-            )
-        )
+        self.db.cursor.execute(_INSERT_TASK, _task_params(task))
         self.db.commit()
         return self.db.cursor.lastrowid
 
+    def insert_tasks(self, tasks):
+        # Inserts many tasks with a single executemany in one transaction; returns the new IDs in input order
+        # The input is streamed, so any iterable (even a generator) can be passed
+        count = 0
+
+        def params():
+            nonlocal count
+            for task in tasks:
+                count += 1
+                yield _task_params(task)
+
+        with self.db.transaction():
+            self.db.cursor.executemany(_INSERT_TASK, params())
+            last_id = self.db.cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        # AUTOINCREMENT ids are assigned consecutively while the transaction holds the write lock
+        return list(range(last_id - count + 1, last_id + 1)) if count else []
+
 
     def get_all_tasks(self):
         # Retrieve all tasks with their associated topic names
+        self.db.cursor.execute(_SELECT_TASKS)
+        return self.db.cursor.fetchall()
+
+    def get_tasks_page(self, after_id=None, limit=50):
+        # Keyset pagination: return up to `limit` tasks with an ID greater than `after_id` (ID order)
+        # Unlike OFFSET, the cost of a page does not grow with its position
         self.db.cursor.execute(
-            """SELECT t.id, t.description, t.topic_id, tp.name, t.priority, t.is_completed, t.scheduled_date, t.start_time, t.end_time
-            FROM tasks t
-            LEFT JOIN topics tp ON t.topic_id = tp.id""")
-            # Uses a LEFT JOIN so tasks without a topic are still returned
+            _SELECT_TASKS + " WHERE t.id > ? ORDER BY t.id LIMIT ?",
+            (after_id if after_id is not None else 0, limit))
         return self.db.cursor.fetchall()
 
+    def iter_tasks(self, chunk_size=500):
+        # Stream all tasks in ID order, reading `chunk_size` rows at a time
+        # A dedicated cursor is used so other queries on the shared cursor don't interrupt the stream
+        cursor = self.db.connection.cursor()
+        try:
+            cursor.execute(_SELECT_TASKS + " ORDER BY t.id")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def get_tasks_between(self, start_date, end_date):
+        # Retrieve the tasks scheduled between two dates (both included), ordered by date and start time
+        # Served by the (scheduled_day, start_minute) index, so the cost depends only on the tasks in the range
+        self.db.cursor.execute(
+            _SELECT_TASKS + """
+            WHERE t.scheduled_day BETWEEN ? AND ?
+            ORDER BY t.scheduled_day, t.start_minute""",
+            (to_epoch_day(start_date), to_epoch_day(end_date)))
+        return self.db.cursor.fetchall()
+
+    def get_task_columns(self):
+        # Retrieve every task as (id, topic_id, priority, is_completed, day, start, end) integers, in ID order,
+        # as used by TaskTable: day is the date's ordinal (0 = none), start/end are minutes (-1 = none)
+        self.db.cursor.execute(
+            """SELECT id, COALESCE(topic_id, 0), priority, is_completed,
+                      COALESCE(scheduled_day + ?, 0), COALESCE(start_minute, -1), COALESCE(end_minute, -1)
+            FROM tasks
+            ORDER BY id""",
+            (EPOCH.toordinal(),))
+        return self.db.cursor.fetchall()
+
+    def get_time_slots(self):
+        # Retrieve (id, scheduled_day, start_minute, end_minute) of every task with a complete time slot
+        # Only these four columns are read, to build the in-memory schedule index in one query
+        self.db.cursor.execute(
+            """SELECT id, scheduled_day, start_minute, end_minute
+            FROM tasks
+            WHERE scheduled_day IS NOT NULL AND start_minute IS NOT NULL AND end_minute IS NOT NULL""")
+        return self.db.cursor.fetchall()
+
+    def get_daily_load(self, start_date, end_date):
+        # Aggregate the tasks scheduled between two dates (both included) per day, without loading them
+        # Rows are (scheduled_day, task_count, scheduled_hours, completed_count), only for days with tasks
+        # Tasks without a complete time slot count as tasks but add no hours
+        # Recurring tasks are left out: their occurrences are generated by the controller
+        self.db.cursor.execute(
+            """SELECT scheduled_day,
+                      COUNT(*),
+                      TOTAL(MAX(end_minute - start_minute, 0)) / 60.0,
+                      TOTAL(is_completed)
+            FROM tasks
+            WHERE scheduled_day BETWEEN ? AND ?
+              AND id NOT IN (SELECT task_id FROM task_recurrences)
+            GROUP BY scheduled_day
+            ORDER BY scheduled_day""",
+            (to_epoch_day(start_date), to_epoch_day(end_date)))
+        return self.db.cursor.fetchall()
+
+    def get_task_by_id(self, task_id: int):
+        # Retrieve a single task by its ID
+        self.db.cursor.execute(_SELECT_TASKS + " WHERE t.id = ?", (task_id,))
+        return self.db.cursor.fetchone()
+
+    def get_tasks_by_ids(self, task_ids):
+        # Retrieve the tasks with the given IDs (in ID order); IDs are looked up in chunks
+        # to stay below SQLite's host parameter limit
+        task_ids = list(task_ids)
+        rows = []
+        for i in range(0, len(task_ids), 500):
+            chunk = task_ids[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            self.db.cursor.execute(_SELECT_TASKS + f" WHERE t.id IN ({placeholders})", chunk)
+            rows.extend(self.db.cursor.fetchall())
+        return sorted(rows, key=lambda row: row[0])
+
     def set_time_slot(self, task_id: int, scheduled_date: str, start_time: str, end_time: str):
         # Update the scheduling information (date, start, end times) of an existing task identified by its ID
-        self.db.cursor.execute(
-            """ UPDATE tasks
-                SET scheduled_date = ?, start_time = ?, end_time = ?
-                WHERE id = ? """, 
-        (scheduled_date, start_time, end_time, task_id))
+        self.db.cursor.execute(_SET_TIME_SLOT, _slot_params(task_id, scheduled_date, start_time, end_time))
         self.db.commit()
 
+    def set_time_slots(self, slots):
+        # Update the scheduling information of many tasks in one transaction; returns the number of updated rows
+        # slots: iterable of (task_id, scheduled_date, start_time, end_time)
+        with self.db.transaction():
+            self.db.cursor.executemany(_SET_TIME_SLOT, (_slot_params(*slot) for slot in slots))
+        return self.db.cursor.rowcount
+
+    def get_unscheduled_tasks(self):
+        # Retrieve (id, priority, estimated_minutes) of the open tasks without a date, highest priority first
+        self.db.cursor.execute(_SELECT_UNSCHEDULED)
+        return self.db.cursor.fetchall()
+
     def delete_task(self, task_id: int):
         # Deletes a specific task identified by its ID
         self.db.cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
@@ -77,4 +225,22 @@ class TaskDAO:
     def mark_notcompleted(self, task_id: int):
         # Updates an existing task's boolean is_completed to false (0)
         self.db.cursor.execute("UPDATE tasks SET is_completed = 0 WHERE id = ?", (task_id,))
-        self.db.commit()
\ No newline at end of file
+        self.db.commit()
+
+    def mark_completed_many(self, task_ids):
+        # Marks many tasks as completed in one transaction; returns the number of updated rows
+        with self.db.transaction():
+            self.db.cursor.executemany("UPDATE tasks SET is_completed = 1 WHERE id = ?", ((i,) for i in task_ids))
+        return self.db.cursor.rowcount
+
+    def mark_notcompleted_many(self, task_ids):
+        # Marks many tasks as not completed in one transaction; returns the number of updated rows
+        with self.db.transaction():
+            self.db.cursor.executemany("UPDATE tasks SET is_completed = 0 WHERE id = ?", ((i,) for i in task_ids))
+        return self.db.cursor.rowcount
+
+    def delete_many(self, task_ids):
+        # Deletes many tasks in one transaction; returns the number of deleted rows
+        with self.db.transaction():
+            self.db.cursor.executemany("DELETE FROM tasks WHERE id = ?", ((i,) for i in task_ids))
+        return self.db.cursor.rowcount
\ No newline at end of file
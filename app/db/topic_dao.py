@@ -11,11 +11,32 @@ class TopicDAO:
         self.db.cursor.execute("INSERT OR IGNORE INTO topics (name) VALUES (?)", (topic.name,))
         self.db.commit()
     
+    def insert_topics(self, topics):
+        # Inserts many topics with a single executemany in one transaction
+        # Names that already exist are ignored; returns the IDs of all given topics in input order
+        names = [topic.name for topic in topics]
+        with self.db.transaction():
+            self.db.cursor.executemany("INSERT OR IGNORE INTO topics (name) VALUES (?)", ((name,) for name in names))
+            ids = {}
+            # Look the IDs up in chunks to stay below SQLite's host parameter limit
+            for i in range(0, len(names), 500):
+                chunk = names[i:i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                self.db.cursor.execute(f"SELECT id, name FROM topics WHERE name IN ({placeholders})", chunk)
+                ids.update((name, topic_id) for topic_id, name in self.db.cursor.fetchall())
+        return [ids[name] for name in names]
+
     def delete_topic(self, topic_id: int):
         # Deletes a specific topic identified by its ID
         self.db.cursor.execute("DELETE FROM topics WHERE id = ?", (topic_id,))
         self.db.commit()
 
+    def delete_many(self, topic_ids):
+        # Deletes many topics in one transaction; returns the number of deleted rows
+        with self.db.transaction():
+            self.db.cursor.executemany("DELETE FROM topics WHERE id = ?", ((i,) for i in topic_ids))
+        return self.db.cursor.rowcount
+
     def get_all_topics(self):
         # Retrieves all topics from the database; returns a list of rows (id, name)
         self.db.cursor.execute("SELECT * FROM topics")
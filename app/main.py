@@ -2,20 +2,25 @@ from kivymd.app import MDApp
 from kivy.uix.screenmanager import ScreenManager
 from kivy.uix.boxlayout import BoxLayout
 from kivy.lang import Builder
+from kivy.clock import Clock
 from app.view.nav_bar import NavigationBar
 from app.view.task_screen import TaskScreen
 from app.view.planner_screen import PlannerScreen
 from app.view.notes_screen import NotesScreen
 from app.view.notebook_screen import NotebookScreen
 from app.view.pomodoro_screen import PomodoroScreen
+from app.view.overview_screen import OverviewScreen
 from app.controller.topic_controller import TopicController
 from app.controller.task_controller import TaskController
 from app.controller.note_controller import NoteController
+from app.db.database import Database
+from app.db.change_detector import ChangeDetector
 
 Builder.load_file("app/view/nav_bar.kv")
 Builder.load_file("app/view/nav_button.kv")
 Builder.load_file("app/view/task_screen.kv")
 Builder.load_file("app/view/planner_screen.kv")
+Builder.load_file("app/view/overview_screen.kv")
 Builder.load_file("app/view/notes_screen.kv")
 Builder.load_file("app/view/pomodoro_screen.kv")
 Builder.load_file("app/view/task_item.kv")
@@ -23,6 +28,7 @@ Builder.load_file("app/view/add_task_popup.kv")
 Builder.load_file("app/view/add_topic_popup.kv")
 Builder.load_file("app/view/spinner_option.kv")
 Builder.load_file("app/view/schedule_popup.kv")
+Builder.load_file("app/view/occurrence_popup.kv")
 Builder.load_file("app/view/notes_screen.kv")
 Builder.load_file("app/view/note_item.kv")
 Builder.load_file("app/view/notebook_screen.kv")
@@ -30,18 +36,38 @@ Builder.load_file("app/view/add_note_popup.kv")
 Builder.load_file("app/view/topic_item.kv")
 Builder.load_file("app/view/manage_topics_popup.kv")
 
+# Seconds between two checks for changes written to planner.db by other processes
+CHANGE_POLL_INTERVAL = 1.0
+
 class MyStudyAgenda(MDApp):
     def build(self):
         self.topic_controller = TopicController()
         self.task_controller = TaskController()
         self.note_controller = NoteController()
         self.sm = ScreenManager()
-        self.sm.add_widget(TaskScreen(name="tasks"))
-        self.sm.add_widget(PlannerScreen(name="planner"))
-        self.sm.add_widget(NotesScreen(name="notes"))
+        task_screen = TaskScreen(name="tasks")
+        planner_screen = PlannerScreen(name="planner")
+        notes_screen = NotesScreen(name="notes")
+        overview_screen = OverviewScreen(name="overview")
+        self.sm.add_widget(task_screen)
+        self.sm.add_widget(planner_screen)
+        self.sm.add_widget(overview_screen)
+        self.sm.add_widget(notes_screen)
         self.sm.add_widget(NotebookScreen(name="notebook"))
         self.sm.add_widget(PomodoroScreen(name="pomodoro"))
 
+        # Screens patch the rows affected by a change instead of reloading their lists
+        self.task_controller.events.subscribe(task_screen.on_task_changed)
+        self.task_controller.events.subscribe(planner_screen.on_task_changed)
+        self.task_controller.events.subscribe(overview_screen.on_task_changed)
+        self.note_controller.events.subscribe(notes_screen.on_note_changed)
+        self.topic_controller.events.subscribe(task_screen.on_topic_changed)
+        self.topic_controller.events.subscribe(notes_screen.on_topic_changed)
+
+        # Changes made by other app instances or scripts reach the screens through the same events
+        self.change_detector = ChangeDetector(Database.get_instance())
+        Clock.schedule_interval(self.poll_external_changes, CHANGE_POLL_INTERVAL)
+
         # connects navbar to ScreenManager
         nav_bar = NavigationBar()
         nav_bar.screen_manager = self.sm
@@ -55,5 +81,15 @@ class MyStudyAgenda(MDApp):
 
         return layout
 
+    def poll_external_changes(self, dt=None):
+        # Hand the rows changed by other processes to their controllers (topics first, tasks and notes show their names)
+        changes = self.change_detector.poll()
+        if "topics" in changes:
+            self.topic_controller.apply_external_changes(changes["topics"])
+        if "tasks" in changes:
+            self.task_controller.apply_external_changes(changes["tasks"])
+        if "notes" in changes:
+            self.note_controller.apply_external_changes(changes["notes"])
+
 if __name__ == "__main__":
     MyStudyAgenda().run()
\ No newline at end of file
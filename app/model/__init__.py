@@ -1,5 +1,11 @@
-__all__ = ["task", "note", "topic"]
+__all__ = ["day_load", "task", "note", "note_search_result", "note_summary", "recurrence", "task_occurrence", "task_table", "topic"]
 
+from . import day_load
 from . import task
 from . import note
+from . import note_search_result
+from . import note_summary
+from . import recurrence
+from . import task_occurrence
+from . import task_table
 from . import topic
\ No newline at end of file
@@ -0,0 +1,28 @@
+from datetime import date
+
+"""
+Aggregated load of one day of the planner
+Attributes:
+    day (date): The day
+    task_count (int): Number of tasks scheduled on the day
+    scheduled_hours (float): Total duration of the time slots of those tasks, in hours
+    completed_count (int): Number of those tasks already completed
+"""
+
+class DayLoad:
+    __slots__ = ("day", "task_count", "scheduled_hours", "completed_count")
+
+    def __init__(self, day: date, task_count: int = 0, scheduled_hours: float = 0.0, completed_count: int = 0):
+        self.day = day
+        self.task_count = task_count
+        self.scheduled_hours = scheduled_hours
+        self.completed_count = completed_count
+
+    @property
+    def completed_ratio(self) -> float:
+        # Share of the day's tasks that are completed (0 for days without tasks)
+        return self.completed_count / self.task_count if self.task_count else 0.0
+
+    def __repr__(self):
+        return (f"DayLoad(day={self.day}, task_count={self.task_count}, "
+                f"scheduled_hours={self.scheduled_hours:.2f}, completed_count={self.completed_count})")
@@ -12,15 +12,12 @@ Attributes:
 """
 
 class Note:
-    _id_counter = 1
+    # Slotted: no per-instance __dict__
+    __slots__ = ("id", "title", "topic", "content", "created_at")
 
     def __init__(self, title: str, topic: Topic = None, content: str = "", id=None, created_at: datetime = None):
-        if id is not None:
-            self.id = id
-        else:
-            self.id = Note._id_counter
-            Note._id_counter += 1
-
+        # id is None until the note is stored (the database assigns it)
+        self.id = id
         self.title = title
         self.topic = topic
         self.content = content
@@ -0,0 +1,28 @@
+from datetime import datetime
+from app.model.topic import Topic
+
+"""
+Represents a note matched by a full-text search
+Attributes:
+    id (int): Identifier of the matched note
+    title (str): Title of the note
+    topic (Topic): Associated topic (optional)
+    created_at (datetime): Timestamp of when the note was created
+    snippet (str): Short excerpt of the note around the matched terms
+    score (float): Relevance of the match (lower is better, as returned by bm25)
+"""
+
+class NoteSearchResult:
+    __slots__ = ("id", "title", "topic", "created_at", "snippet", "score")
+
+    def __init__(self, id: int, title: str, topic: Topic = None, created_at: datetime = None,
+                 snippet: str = "", score: float = 0.0):
+        self.id = id
+        self.title = title
+        self.topic = topic
+        self.created_at = created_at
+        self.snippet = snippet
+        self.score = score
+
+    def __repr__(self):
+        return f"NoteSearchResult(id={self.id}, title='{self.title}', snippet='{self.snippet}', score={self.score})"
@@ -0,0 +1,28 @@
+from datetime import datetime
+from app.model.topic import Topic
+
+"""
+Lightweight projection of a note, used to list notes without loading their content
+Attributes:
+    id (int): Identifier of the note
+    title (str): Title of the note
+    topic (Topic): Associated topic (optional)
+    created_at (datetime): Timestamp of when the note was created
+    content_length (int): Number of characters of the full content
+    preview (str): First characters of the content
+"""
+
+class NoteSummary:
+    __slots__ = ("id", "title", "topic", "created_at", "content_length", "preview")
+
+    def __init__(self, id: int, title: str, topic: Topic = None, created_at: datetime = None,
+                 content_length: int = 0, preview: str = ""):
+        self.id = id
+        self.title = title
+        self.topic = topic
+        self.created_at = created_at
+        self.content_length = content_length
+        self.preview = preview
+
+    def __repr__(self):
+        return f"NoteSummary(id={self.id}, title='{self.title}', content_length={self.content_length})"
@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+"""
+Repetition rule of a recurring task, stored once per series
+Attributes:
+    frequency (str): "daily" or "weekly"
+    interval (int): Repeat every `interval` days (daily) or weeks (weekly)
+    weekdays (tuple): Days of the week of a weekly rule (0=Monday ... 6=Sunday); defaults to the weekday of the first date
+    until (date): Last day an occurrence may fall on (optional)
+    count (int): Maximum number of occurrences (optional)
+Occurrences are never stored: occurrences() yields the dates of the series inside a date range
+"""
+
+DAILY = "daily"
+WEEKLY = "weekly"
+
+
+class Recurrence:
+    __slots__ = ("frequency", "interval", "weekdays", "until", "count")
+
+    def __init__(self, frequency: str = WEEKLY, interval: int = 1, weekdays=(), until: date = None, count: int = None):
+        if frequency not in (DAILY, WEEKLY):
+            raise ValueError(f"Unknown recurrence frequency: {frequency}")
+        self.frequency = frequency
+        self.interval = max(int(interval), 1)
+        self.weekdays = tuple(sorted(set(weekdays)))
+        self.until = until
+        self.count = count
+
+    def occurrences(self, first: date, start: date, end: date):
+        # Lazily yield the dates of the series starting on `first` that fall between start and end (both included)
+        # Without a count the generator jumps straight to the range; with a count the earlier occurrences are counted
+        if self.until is not None and self.until < end:
+            end = self.until
+        if self.frequency == DAILY:
+            yield from self._daily(first, start, end)
+        else:
+            yield from self._weekly(first, start, end)
+
+    def _daily(self, first, start, end):
+        step = timedelta(days=self.interval)
+        day, index = first, 0
+        if self.count is None and start > first:
+            skipped = -(-(start - first).days // self.interval)
+            day = first + step * skipped
+        while day <= end and (self.count is None or index < self.count):
+            if day >= start:
+                yield day
+            day += step
+            index += 1
+
+    def _weekly(self, first, start, end):
+        weekdays = self.weekdays or (first.weekday(),)
+        step = timedelta(weeks=self.interval)
+        week = first - timedelta(days=first.weekday())
+        if self.count is None and start > week:
+            week += step * ((start - week).days // 7 // self.interval)
+        index = 0
+        while week <= end:
+            for weekday in weekdays:
+                day = week + timedelta(days=weekday)
+                if day < first:
+                    continue
+                if day > end or (self.count is not None and index >= self.count):
+                    return
+                if day >= start:
+                    yield day
+                index += 1
+            week += step
+
+    @property
+    def weekday_mask(self) -> int:
+        # Weekdays as a bit mask (bit 0 = Monday), as stored in the database
+        return sum(1 << weekday for weekday in self.weekdays)
+
+    @staticmethod
+    def weekdays_from_mask(mask) -> tuple:
+        return tuple(weekday for weekday in range(7) if mask and mask & (1 << weekday))
+
+    def __repr__(self):
+        return (f"Recurrence(frequency='{self.frequency}', interval={self.interval}, weekdays={self.weekdays}, "
+                f"until={self.until}, count={self.count})")
@@ -12,21 +12,21 @@ Attributes:
     scheduled_date (date): The user can choose a date to schedule a task (optional)
     start_time (time): The user can choose a specific start time to schedule a task (optional)
     end_time (time): The user can choose a specific end time to schedule a task (optional)
+    estimated_minutes (int): Expected duration of the task, used by the auto-scheduler (optional)
+    recurrence (Recurrence): Repetition rule if the task is a recurring series (optional, see TaskOccurrence)
 """
 
 class Task:
-    _id_counter = 1
-    
+    # Slotted: no per-instance __dict__, which matters when thousands of tasks are loaded
+    __slots__ = ("id", "description", "topic", "priority", "is_completed",
+                 "scheduled_date", "start_time", "end_time", "estimated_minutes", "recurrence")
+
     def __init__(self, id: int = None, description: str = "", topic: Topic = None,
                  priority: int = 0, is_completed: bool = False,
-                 scheduled_date: date = None, start_time: time = None, end_time: time = None):
-        
-        if id is not None:
-            self.id = id
-        else:
-            self.id = Task._id_counter
-            Task._id_counter += 1
-
+                 scheduled_date: date = None, start_time: time = None, end_time: time = None,
+                 estimated_minutes: int = None, recurrence=None):
+        # id is None until the task is stored (the database assigns it)
+        self.id = id
         self.description = description
         self.topic = topic
         self.priority = priority
@@ -34,6 +34,13 @@ class Task:
         self.scheduled_date = scheduled_date
         self.start_time = start_time
         self.end_time = end_time
+        self.estimated_minutes = estimated_minutes
+        self.recurrence = recurrence
+
+    @property
+    def key(self):
+        # Identifies the task in views; occurrences of a recurring task override it
+        return self.id
 
     def mark_completed(self):
         self.is_completed = True
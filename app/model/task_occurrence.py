@@ -0,0 +1,42 @@
+from datetime import date
+from app.model.task import Task
+
+"""
+One occurrence of a recurring task, generated for the date range being viewed
+It carries the fields of its series (id is the ID of the series task) and the changes of its
+override row, if any: its own completion state, or a different date and time
+Attributes:
+    occurrence_date (date): Date the occurrence falls on according to the recurrence rule
+    is_override (bool): Whether this occurrence was changed individually
+"""
+
+class TaskOccurrence(Task):
+    __slots__ = ("occurrence_date", "is_override")
+
+    def __init__(self, series: Task, occurrence_date: date, is_completed: bool = None,
+                 scheduled_date: date = None, start_time=None, end_time=None):
+        super().__init__(
+            id=series.id,
+            description=series.description,
+            topic=series.topic,
+            priority=series.priority,
+            is_completed=series.is_completed if is_completed is None else is_completed,
+            scheduled_date=scheduled_date or occurrence_date,
+            start_time=start_time or series.start_time,
+            end_time=end_time or series.end_time,
+            estimated_minutes=series.estimated_minutes,
+            recurrence=series.recurrence,
+        )
+        self.occurrence_date = occurrence_date
+        self.is_override = (is_completed is not None or scheduled_date is not None
+                            or start_time is not None or end_time is not None)
+
+    @property
+    def key(self):
+        # Occurrences of the same series share the task ID, so views key them by (ID, occurrence date)
+        return (self.id, self.occurrence_date)
+
+    def __repr__(self):
+        return (f"TaskOccurrence(id={self.id}, occurrence_date={self.occurrence_date}, description='{self.description}', "
+                f"scheduled_date={self.scheduled_date}, start_time={self.start_time}, end_time={self.end_time}, "
+                f"is_completed={self.is_completed})")
@@ -0,0 +1,132 @@
+from array import array
+from collections import Counter
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional: the same operations run on plain arrays
+    np = None
+
+"""
+Column-oriented view of many tasks, for statistics and bulk filtering without building Task objects
+Each attribute is one typed array, in task ID order:
+    ids (array 'q'): Task IDs
+    topic_ids (array 'q'): Topic IDs (0 = no topic)
+    priorities (array 'b'): Priority levels
+    completed (array 'b'): 1 if the task is completed, else 0
+    days (array 'i'): Scheduled dates as proleptic ordinals, see date.toordinal (0 = not scheduled)
+    starts, ends (array 'h'): Start and end times as minutes since midnight (-1 = not set)
+Filters are applied column by column; with NumPy installed the arrays are viewed as ndarrays
+(without copying) and filtered with boolean masks
+"""
+
+# Column name -> (array typecode, NumPy dtype)
+COLUMNS = {
+    "ids": ("q", "int64"),
+    "topic_ids": ("q", "int64"),
+    "priorities": ("b", "int8"),
+    "completed": ("b", "int8"),
+    "days": ("i", "int32"),
+    "starts": ("h", "int16"),
+    "ends": ("h", "int16"),
+}
+
+
+class TaskTable:
+    __slots__ = tuple(COLUMNS)
+
+    def __init__(self, **columns):
+        for name, (typecode, _) in COLUMNS.items():
+            setattr(self, name, columns.get(name, array(typecode)))
+
+    @classmethod
+    def from_rows(cls, rows):
+        # Build a table from (id, topic_id, priority, is_completed, day, start, end) rows,
+        # already in the encoding above (see TaskDAO.get_task_columns)
+        columns = list(zip(*rows)) or [()] * len(COLUMNS)
+        return cls(**{name: array(typecode, values)
+                      for (name, (typecode, _)), values in zip(COLUMNS.items(), columns)})
+
+    def __len__(self):
+        return len(self.ids)
+
+    def indices(self, start_date: date = None, end_date: date = None, topic_id: int = None,
+                priority: int = None, completed: bool = None):
+        # Positions of the tasks matching every given filter (dates included, None = no filter)
+        filters = []
+        if start_date is not None:
+            filters.append(("days", ">=", start_date.toordinal()))
+        if end_date is not None:
+            filters.append(("days", "<=", end_date.toordinal()))
+        if start_date is None and end_date is not None:
+            filters.append(("days", ">=", 1))  # unscheduled tasks have day 0
+        if topic_id is not None:
+            filters.append(("topic_ids", "==", topic_id))
+        if priority is not None:
+            filters.append(("priorities", "==", priority))
+        if completed is not None:
+            filters.append(("completed", "==", int(bool(completed))))
+
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            for name, op, value in filters:
+                column = self._ndarray(name)
+                mask &= column >= value if op == ">=" else column <= value if op == "<=" else column == value
+            return np.flatnonzero(mask)
+
+        positions = range(len(self))
+        for name, op, value in filters:
+            column = getattr(self, name)
+            if op == ">=":
+                positions = [i for i in positions if column[i] >= value]
+            elif op == "<=":
+                positions = [i for i in positions if column[i] <= value]
+            else:
+                positions = [i for i in positions if column[i] == value]
+        return positions
+
+    def select(self, **filters):
+        # New table with only the matching tasks (same filters as indices)
+        positions = self.indices(**filters)
+        if np is not None:
+            return TaskTable(**{name: array(typecode, self._ndarray(name)[positions].tobytes())
+                                for name, (typecode, _) in COLUMNS.items()})
+        return TaskTable(**{name: array(typecode, (getattr(self, name)[i] for i in positions))
+                            for name, (typecode, _) in COLUMNS.items()})
+
+    def count(self, **filters) -> int:
+        # Number of matching tasks
+        return len(self.indices(**filters))
+
+    def group_counts(self, column: str, **filters) -> dict:
+        # {value of the column: number of matching tasks}, e.g. group_counts("priorities", completed=False)
+        positions = self.indices(**filters)
+        if np is not None:
+            values, counts = np.unique(self._ndarray(column)[positions], return_counts=True)
+            return dict(zip(values.tolist(), counts.tolist()))
+        values = getattr(self, column)
+        return dict(Counter(values[i] for i in positions))
+
+    def counts_by_day(self, **filters) -> dict:
+        # {date: number of matching tasks} over the scheduled tasks
+        counts = self.group_counts("days", **filters)
+        return {date.fromordinal(day): count for day, count in sorted(counts.items()) if day > 0}
+
+    def scheduled_minutes(self, **filters) -> int:
+        # Total length of the time slots of the matching tasks (tasks without a complete slot count 0)
+        positions = self.indices(**filters)
+        if np is not None:
+            starts = self._ndarray("starts")[positions].astype("int32")
+            ends = self._ndarray("ends")[positions].astype("int32")
+            durations = ends - starts
+            return int(durations[(starts >= 0) & (ends >= 0) & (durations > 0)].sum())
+        starts, ends = self.starts, self.ends
+        return sum(ends[i] - starts[i] for i in positions if starts[i] >= 0 and ends[i] > starts[i])
+
+    def _ndarray(self, name):
+        # Zero-copy NumPy view of a column
+        column, dtype = getattr(self, name), COLUMNS[name][1]
+        return np.frombuffer(column, dtype=dtype) if len(column) else np.zeros(0, dtype=dtype)
+
+    def __repr__(self):
+        return f"TaskTable(rows={len(self)}, numpy={np is not None})"
@@ -6,15 +6,22 @@ Attributes:
 """
 
 class Topic:
-    _id_counter = 1
+    # Slotted: no per-instance __dict__
+    __slots__ = ("id", "name")
 
     def __init__(self, id=None, name=None):
-        if id is not None:
-            self.id = id
-        else:
-            self.id = Topic._id_counter
-            Topic._id_counter += 1
+        # id is None until the topic is stored (the database assigns it)
+        self.id = id
         self.name = name
 
     def __repr__(self):
         return f"Topic(id={self.id}, name='{self.name}')"
+
+
+def intern_topic(topics: dict, topic_id, name):
+    # Return the Topic with this ID from `topics`, creating it on first use, so that the rows
+    # of one load share a single Topic object per topic instead of one per row
+    topic = topics.get(topic_id)
+    if topic is None:
+        topic = topics[topic_id] = Topic(id=topic_id, name=name)
+    return topic
@@ -1,6 +1,7 @@
-__all__ = ["notes_screen", "planner_screen", "task_screen", "pomodoro_screen"]
+__all__ = ["notes_screen", "overview_screen", "planner_screen", "task_screen", "pomodoro_screen"]
 
 from . import notes_screen
+from . import overview_screen
 from . import planner_screen
 from . import task_screen
 from . import pomodoro_screen
\ No newline at end of file
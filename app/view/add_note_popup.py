@@ -5,11 +5,18 @@ from app.view.add_topic_popup import AddTopicPopup
 from app.view.manage_topics_popup import ManageTopicsPopup
 
 class AddNotePopup(Popup):
+    _topics_version = None  # topic set version shown in the spinner
+
     def on_open(self):
         # Populate topic spinner with all available topics
         app = App.get_running_app()
+        # Skip the refresh if the topics did not change since the spinner was filled
+        version = getattr(app.topic_controller, "version", None)
+        if version is not None and version == self._topics_version:
+            return
         topics = app.topic_controller.get_all_topics()
         self.ids.topic_spinner.values = [t.name for t in topics]
+        self._topics_version = version
 
     def add_new_topic(self):
         # Open popup for adding a new topic
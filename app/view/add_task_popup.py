@@ -1,10 +1,22 @@
 from kivy.app import App
 from kivy.uix.popup import Popup
+from kivy.properties import ListProperty, ObjectProperty
 from kivymd.uix.pickers.datepicker import MDModalDatePicker
 from kivymd.uix.pickers.timepicker import MDTimePickerInput
 from app.view.add_topic_popup import AddTopicPopup
 from app.view.manage_topics_popup import ManageTopicsPopup
-from datetime import datetime
+from app.view.schedule_popup import describe_conflicts
+from app.model.recurrence import Recurrence, DAILY, WEEKLY
+from datetime import date, datetime
+
+# Choices of the estimated duration spinner, in minutes (used by the auto-scheduler)
+DURATIONS = {"30 min": 30, "1 h": 60, "1.5 h": 90, "2 h": 120, "3 h": 180, "4 h": 240}
+
+# Choices of the repeat spinner; weekly tasks repeat on the weekday of their date unless weekdays are picked
+REPEATS = {"Does not repeat": None, "Daily": DAILY, "Weekly": WEEKLY}
+
+# Labels of the weekday toggles of a weekly task (0=Monday, as in Recurrence.weekdays)
+WEEKDAY_LABELS = ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]
 
 class AddTaskPopup(Popup):
     # Popup for creating a new task (includes fields, validation, and save logic)
@@ -13,13 +25,26 @@ class AddTaskPopup(Popup):
     start_time = ""
     end_time = ""
     prio_valid = False  # track priority validation
+    _topics_version = None  # topic set version shown in the spinner
+    duration_labels = list(DURATIONS)
+    repeat_labels = list(REPEATS)
+    weekday_labels = WEEKDAY_LABELS
+    repeat = ObjectProperty(None, allownone=True)  # frequency chosen in the repeat spinner
+    repeat_weekdays = ListProperty()  # weekdays toggled for a weekly task
+    repeat_until = ""  # last date of the series (optional)
+    conflict_text = ""  # warning about the chosen slot, looked up again only when the date or a time changes
 
     def on_open(self):
         # Load topics into the spinner when the popup is opened
         app = App.get_running_app()
+        # Skip the refresh if the topics did not change since the spinner was filled
+        version = getattr(app.topic_controller, "version", None)
+        if version is not None and version == self._topics_version:
+            return
         topics = app.topic_controller.get_all_topics()
         topic_names = [t["name"] if isinstance(t, dict) else t.name for t in topics]
         self.ids.topic_spinner.values = topic_names
+        self._topics_version = version
 
     def open_date_picker(self, button):
         # Open a date picker dialog for selecting the task date
@@ -36,9 +61,28 @@ class AddTaskPopup(Popup):
         if selection:
             self.selected_date = selection[0].isoformat()
             button.text = f"Date: {self.selected_date}"
+            self.update_conflicts()
+            self.validate_inputs()
         
         instance.dismiss()
 
+    def open_until_picker(self, button):
+        # Open a date picker dialog for selecting the last date of a repeating task
+        date_dialog = MDModalDatePicker()
+        date_dialog.bind(on_ok=lambda instance: self.set_until(instance, button))
+        date_dialog.bind(on_cancel=lambda instance: instance.dismiss())
+        date_dialog.open()
+
+    def set_until(self, instance, button):
+        # Set the last date of the series from the date picker
+        selection = instance.get_date()
+        if selection:
+            self.repeat_until = selection[0].isoformat()
+            button.text = f"Until: {self.repeat_until}"
+            self.validate_inputs()
+
+        instance.dismiss()
+
     def open_time_picker(self, mode, button):
         # Open a time picker dialog for selecting start or end time
         time_dialog = MDTimePickerInput()
@@ -59,6 +103,7 @@ class AddTaskPopup(Popup):
             self.end_time = formatted
             button.text = f"End: {self.end_time}"
 
+        self.update_conflicts()
         self.validate_inputs()
         instance.dismiss()
 
@@ -99,10 +144,71 @@ class AddTaskPopup(Popup):
                 self.ids.add_btn.disabled = True
                 return
 
-        # If everything is valid
-        self.ids.error_label.text = ""
+        # Check recurrence
+        # A repeating task needs the date and time slot of its first occurrence
+        if self.repeat and not (self.selected_date and self.start_time and self.end_time):
+            self.ids.error_label.text = "Repeating tasks need a date and a time"
+            self.ids.add_btn.disabled = True
+            return
+        try:
+            self.build_recurrence()
+        except ValueError as e:
+            self.ids.error_label.text = str(e)
+            self.ids.add_btn.disabled = True
+            return
+
+        # If everything is valid, warn about tasks already scheduled in the slot (adding is still allowed)
+        # The warning is not looked up here: validation runs on every keystroke of the other fields
+        self.ids.error_label.text = self.conflict_text
         self.ids.add_btn.disabled = False
 
+    def set_repeat(self, label):
+        # Callback of the repeat spinner
+        self.repeat = REPEATS.get(label)
+        self.validate_inputs()
+
+    def toggle_weekday(self, weekday, selected):
+        # Callback of the weekday toggles of a weekly task
+        if selected and weekday not in self.repeat_weekdays:
+            self.repeat_weekdays.append(weekday)
+        elif not selected and weekday in self.repeat_weekdays:
+            self.repeat_weekdays.remove(weekday)
+        self.validate_inputs()
+
+    def build_recurrence(self):
+        # Recurrence described by the repeat inputs, None for a single task
+        # Raises ValueError with the message shown to the user if an input is invalid
+        if not self.repeat:
+            return None
+        interval = self._repeat_number("interval_input", "Repeat every: enter a whole number of 1 or more")
+        count = self._repeat_number("count_input", "Occurrences: enter a whole number of 1 or more")
+        until = date.fromisoformat(self.repeat_until) if self.repeat_until else None
+        if until and self.selected_date and until < date.fromisoformat(self.selected_date):
+            raise ValueError("The repeat end date is before the first date")
+        weekdays = self.repeat_weekdays if self.repeat == WEEKLY else ()
+        return Recurrence(self.repeat, interval or 1, weekdays, until, count)
+
+    def _repeat_number(self, input_id, error):
+        # Positive integer typed in a repeat input, None if it is left empty
+        field = self.ids.get(input_id)
+        text = field.text.strip() if field is not None else ""
+        if not text:
+            return None
+        if not text.isdigit() or int(text) < 1:
+            raise ValueError(error)
+        return int(text)
+
+    def update_conflicts(self):
+        # Look up the tasks overlapping the slot after the date or a time changed
+        self.conflict_text = self.conflict_warning()
+
+    def conflict_warning(self):
+        # Look up the tasks overlapping the chosen slot in the controller's schedule index
+        if not (self.selected_date and self.start_time and self.end_time):
+            return ""
+        app = App.get_running_app()
+        return describe_conflicts(app.task_controller.find_conflicts(self.selected_date, self.start_time, self.end_time))
+
     def add_task(self):
         # Final check before saving
         if not self.prio_valid:
@@ -120,12 +226,18 @@ class AddTaskPopup(Popup):
 
         priority_map = {"Low": 1, "Medium": 2, "High": 3}
         prio = priority_map.get(prio_label)
+        estimate = DURATIONS.get(self.ids.duration_spinner.text)
+        try:
+            recurrence = self.build_recurrence()
+        except ValueError as e:
+            self.ids.error_label.text = str(e)
+            return
 
         app = App.get_running_app()
         task_screen = app.sm.get_screen("tasks")
 
-        task_screen.add_task_from_popup(desc, topic, prio, date, start, end, self)
-        task_screen.refresh_task_list()
+        task_screen.add_task_from_popup(desc, topic, prio, date, start, end, self,
+                                         estimated_minutes=estimate, recurrence=recurrence)
 
         self.validate_inputs()
         # blocks saving if sme input is invalid
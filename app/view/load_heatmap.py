@@ -0,0 +1,106 @@
+from datetime import timedelta
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Rectangle
+from kivy.core.text import Label as CoreLabel
+from kivy.properties import DictProperty, ObjectProperty, NumericProperty, BooleanProperty
+from kivy.clock import Clock
+
+"""
+Calendar heatmap of the daily load: one row per week (Monday to Sunday), one cell per day,
+colored by the scheduled hours of the day, with a bar showing the completed share
+Cells are plain canvas rectangles, so even a semester (180+ days) is drawn instantly
+"""
+
+# Cell colors: no tasks, lightest load, heaviest load
+EMPTY_COLOR = (0.93, 0.93, 0.93, 1)
+LOW_COLOR = (1, 0.95, 0.7, 1)
+HIGH_COLOR = (0.85, 0.3, 0, 1)
+DONE_COLOR = (0, 0.6, 0, 0.9)
+
+
+class LoadHeatmap(Widget):
+    # {date: DayLoad} of the days with tasks
+    loads = DictProperty({})
+    # First day shown (a Monday) and number of week rows
+    start = ObjectProperty(None, allownone=True)
+    weeks = NumericProperty(6)
+    # Month whose days are drawn in full (the others are faded); 0 draws every day in full
+    month = NumericProperty(0)
+    show_day_numbers = BooleanProperty(True)
+    __events__ = ("on_day_press",)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._day_textures = {}  # day number -> text texture
+        self._redraw_trigger = Clock.create_trigger(self.redraw, 0)
+        self.bind(pos=self._redraw_trigger, size=self._redraw_trigger, loads=self._redraw_trigger,
+                  start=self._redraw_trigger, weeks=self._redraw_trigger, month=self._redraw_trigger,
+                  show_day_numbers=self._redraw_trigger)
+
+    def cell_size(self):
+        return self.width / 7.0, self.height / max(int(self.weeks), 1)
+
+    def cell_color(self, load, max_hours):
+        # Interpolate between the light and the heavy color; days with tasks but no hours get the light one
+        if load is None or not load.task_count:
+            return EMPTY_COLOR
+        t = min(load.scheduled_hours / max_hours, 1.0) if max_hours > 0 else 0.0
+        return tuple(low + (high - low) * t for low, high in zip(LOW_COLOR, HIGH_COLOR))
+
+    def redraw(self, *args):
+        # Rebuild the cell instructions
+        self.canvas.clear()
+        if self.start is None:
+            return
+        cw, ch = self.cell_size()
+        max_hours = max((load.scheduled_hours for load in self.loads.values()), default=0.0)
+        with self.canvas:
+            for index in range(int(self.weeks) * 7):
+                day = self.start + timedelta(days=index)
+                row, col = divmod(index, 7)
+                x = self.x + col * cw
+                y = self.top - (row + 1) * ch
+                load = self.loads.get(day)
+                faded = self.month and day.month != self.month
+
+                r, g, b, a = self.cell_color(load, max_hours)
+                Color(r, g, b, a * (0.35 if faded else 1))
+                Rectangle(pos=(x + 1, y + 1), size=(max(cw - 2, 0), max(ch - 2, 0)))
+
+                if load is not None and load.task_count:
+                    # Completed share as a bar along the bottom of the cell
+                    Color(*DONE_COLOR)
+                    Rectangle(pos=(x + 1, y + 1), size=(max(cw - 2, 0) * load.completed_ratio, max(ch * 0.1, 2)))
+
+                if self.show_day_numbers:
+                    texture = self._day_texture(day.day)
+                    Color(0, 0, 0, 0.4 if faded else 1)
+                    Rectangle(texture=texture, size=texture.size, pos=(x + 4, y + ch - texture.height - 2))
+
+    def day_at(self, x, y):
+        # Hit-test: return the day of the cell containing the point (widget coordinates), or None
+        if self.start is None or not self.collide_point(x, y):
+            return None
+        cw, ch = self.cell_size()
+        col = min(int((x - self.x) / cw), 6)
+        row = min(int((self.top - y) / ch), int(self.weeks) - 1)
+        return self.start + timedelta(days=row * 7 + col)
+
+    def on_touch_down(self, touch):
+        day = self.day_at(*touch.pos)
+        if day is not None:
+            self.dispatch("on_day_press", day)
+            return True
+        return super().on_touch_down(touch)
+
+    def on_day_press(self, day):
+        # Event fired when the cell of a day is pressed
+        pass
+
+    def _day_texture(self, number):
+        texture = self._day_textures.get(number)
+        if texture is None:
+            label = CoreLabel(text=str(number), font_size=12)
+            label.refresh()
+            texture = self._day_textures[number] = label.texture
+        return texture
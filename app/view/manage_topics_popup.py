@@ -2,6 +2,7 @@ from kivy.uix.popup import Popup
 from kivy.app import App
 from app.view.topic_item import TopicItem
 from kivy.clock import Clock
+from app.controller.events import DELETED, RELOADED
 
 class ManageTopicsPopup(Popup):
     def __init__(self, parent_popup=None, **kwargs):
@@ -11,16 +12,41 @@ class ManageTopicsPopup(Popup):
         Clock.schedule_once(lambda dt: self.load_topics())
 
     def load_topics(self):
-        # Load all topics from the controller and display them in the UI
+        # Load all topics from the controller and hand them to the RecycleView as data dicts
         app = App.get_running_app()
-        self.ids.topics_list.clear_widgets()
         topics = app.topic_controller.get_all_topics()
-        
-        for topic in topics:
-            topic_item = TopicItem(topic, manage_popup=self)
-            self.ids.topics_list.add_widget(topic_item)
+        self.ids.topics_list.data = [TopicItem.data_from_topic(topic, self) for topic in topics]
 
+        # Refresh the parent popup’s topic spinner instantly
+        self._refresh_parent()
+
+    def on_pre_open(self):
+        # Follow topic changes while the popup is shown
+        App.get_running_app().topic_controller.events.subscribe(self.on_topic_changed)
+
+    def on_dismiss(self):
+        App.get_running_app().topic_controller.events.unsubscribe(self.on_topic_changed)
+
+    def on_topic_changed(self, event):
+        # Patch only the rows of the changed topics (subscribed to TopicController.events)
+        rv = self.ids.topics_list
+        if event.kind == RELOADED:
+            self.load_topics()
+            return
+        if event.kind == DELETED:
+            deleted = set(event.ids)
+            rv.data = [row for row in rv.data if row["topic_id"] not in deleted]
+        else:
+            positions = {row["topic_id"]: index for index, row in enumerate(rv.data)}
+            for topic in event.items:
+                row = TopicItem.data_from_topic(topic, self)
+                if topic.id in positions:
+                    rv.data[positions[topic.id]] = row
+                else:
+                    rv.data.append(row)
+        self._refresh_parent()
+
+    def _refresh_parent(self):
         # Refresh the parent popup’s topic spinner instantly
         if self.parent_popup and hasattr(self.parent_popup, "on_open"):
             self.parent_popup.on_open()
-        
\ No newline at end of file
@@ -1,23 +1,39 @@
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.app import App
-from kivy.properties import StringProperty
-from kivy.clock import Clock
+from kivy.properties import StringProperty, ObjectProperty
+
+class NoteItem(RecycleDataViewBehavior, BoxLayout):
+    # Recyclable row of the notes list, filled from the data dict built by data_from_note
 
-class NoteItem(BoxLayout):
     # UI properties bound to note data
     title = StringProperty("")
     topic = StringProperty("")
     created_at = StringProperty("")
+    preview = StringProperty("")
+    note = ObjectProperty(None, allownone=True)
 
-    def __init__(self, note, **kwargs):
-        # Initialize NoteItem with note data
-        app = App.get_running_app()
+    def __init__(self, note=None, **kwargs):
+        # Initialize NoteItem, optionally with note data (outside of a RecycleView)
+        self.note_id = "0"
         super().__init__(**kwargs)
-        self.note = note
-        self.note_id = str(getattr(note, "id", getattr(note, "note_id", 0)) or 0)
-        self.title = note.title or ""
-        self.topic = app.topic_controller.get_topic_name(note.topic.id) if note.topic else ""
-        self.created_at = note.created_at.strftime("%Y-%m-%d")
+        if note is not None:
+            for key, value in self.data_from_note(note).items():
+                setattr(self, key, value)
+
+    @staticmethod
+    def data_from_note(note) -> dict:
+        # Build the plain data dict that describes one row of the notes list
+        return {
+            "note": note,
+            "note_id": str(getattr(note, "id", getattr(note, "note_id", 0)) or 0),
+            "title": note.title or "",
+            # The topic name is loaded together with the note, so no query is run per item
+            "topic": (note.topic.name or "") if note.topic else "",
+            "created_at": note.created_at.strftime("%Y-%m-%d") if note.created_at else "",
+            # Search results carry a snippet of the matched text, summaries the beginning of the content
+            "preview": (getattr(note, "snippet", "") or getattr(note, "preview", "") or "").replace("\n", " "),
+        }
 
     def open_note(self):
         # Open the notebook screen for this note
@@ -26,10 +42,9 @@ class NoteItem(BoxLayout):
         notes_screen.open_notebook(self.note)
 
     def delete_note(self):
-        # Delete this note and refresh the list
+        # Delete this note; the notes screen drops its row when the controller reports the deletion
         app = App.get_running_app()
-        note_screen = app.sm.get_screen("notes")
         try:
             app.note_controller.delete_note(int(self.note_id))
-        finally:
-            Clock.schedule_once(lambda dt: note_screen.refresh_note_list(), 0.0)
\ No newline at end of file
+        except Exception as e:
+            print(f"Error during deletion: {e}")
@@ -5,11 +5,11 @@ class NotebookScreen(Screen):
     current_note_id = None
 
     def open_note(self, note_id):
-        # Load a note by ID and show its content
+        # Load the content of a note by ID (on demand, only when the note is opened) and show it
         self.current_note_id = note_id
         app = App.get_running_app()
-        note = app.note_controller.get_note_by_id(note_id)
-        self.ids.content_input.text = note.content
+        content = app.note_controller.get_note_content(note_id)
+        self.ids.content_input.text = content or ""
 
     def save_note(self):
         # Save modifications to the current note
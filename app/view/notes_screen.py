@@ -1,21 +1,75 @@
 from kivy.uix.screenmanager import Screen
 from kivy.app import App
+from kivy.clock import Clock
 from app.view.note_item import NoteItem
 from app.view.add_note_popup import AddNotePopup
+from app.controller.events import DELETED, RELOADED
 
 class NotesScreen(Screen):
+    search_query = ""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Searches run shortly after the user stops typing instead of on every keystroke
+        self._search_trigger = Clock.create_trigger(lambda dt: self.load_notes(), 0.25)
+
     def on_enter(self):
         # Reload notes every time the screen is entered
         self.load_notes()
 
+    def on_search_text(self, text):
+        # Callback of the search field: remember the query and schedule a (debounced) reload
+        self.search_query = text.strip()
+        self._search_trigger()
+
     def load_notes(self):
-        # Load all notes and render them as NoteItem widgets
+        # Load all notes (or the search results, if a query was typed) and render them as NoteItem widgets
         app = App.get_running_app()
-        self.ids.notes_list.clear_widgets()
-        notes = app.note_controller.get_all_notes()
-        for note in notes:
-            note_item = NoteItem(note)
-            self.ids.notes_list.add_widget(note_item)
+        if self.search_query:
+            notes = app.note_controller.search(self.search_query, limit=50)
+        else:
+            # Summaries only: note contents are loaded when a note is opened
+            notes = app.note_controller.get_note_summaries()
+        # Only the visible rows are turned into NoteItem widgets by the RecycleView
+        self.ids.notes_list.data = [NoteItem.data_from_note(note) for note in notes]
+
+    def on_note_changed(self, event):
+        # Patch only the rows of the changed notes (subscribed to NoteController.events)
+        rv = self.ids.notes_list
+        if event.kind == RELOADED:
+            self.load_notes()
+            return
+        if event.kind == DELETED:
+            deleted = {str(note_id) for note_id in event.ids}
+            rv.data = [row for row in rv.data if row["note_id"] not in deleted]
+            return
+        if self.search_query:
+            # Whether a note matches depends on its text, so the search is run again
+            self._search_trigger()
+            return
+
+        # Created and updated notes are upserted; new notes are the newest, so they go on top
+        positions = {row["note_id"]: index for index, row in enumerate(rv.data)}
+        new_rows = []
+        for note in event.items:
+            row = NoteItem.data_from_note(note)
+            index = positions.get(row["note_id"])
+            if index is None:
+                new_rows.append(row)
+            else:
+                rv.data[index] = row
+        if new_rows:
+            rv.data = new_rows + list(rv.data)
+
+    def on_topic_changed(self, event):
+        # Clear the topic shown by notes whose topic was deleted (subscribed to TopicController.events)
+        if event.kind != DELETED:
+            return
+        names = {topic.name for topic in event.items}
+        data = self.ids.notes_list.data
+        for index, row in enumerate(data):
+            if row["topic"] in names:
+                data[index] = dict(row, topic="")
 
     def open_new_note_popup(self):
         # Open popup for creating a new note
@@ -0,0 +1,42 @@
+from kivy.app import App
+from kivy.properties import ObjectProperty, StringProperty
+from kivy.uix.popup import Popup
+from app.view.schedule_popup import SchedulePopup
+
+
+class OccurrencePopup(Popup):
+    # Actions on one occurrence of a recurring task, opened from the planner (PlannerScreen.on_task_press)
+    # Each action writes the override row of the occurrence, keyed by occurrence.key = (series ID, occurrence date)
+
+    occurrence = ObjectProperty(None)
+    done_text = StringProperty("Mark as done")
+
+    def __init__(self, occurrence, **kwargs):
+        super().__init__(**kwargs)
+        self.occurrence = occurrence
+        self.title = f"{occurrence.description} ({occurrence.occurrence_date.isoformat()})"
+        self.done_text = "Mark as not done" if occurrence.is_completed else "Mark as done"
+        # Slot edited by the SchedulePopup opened from "Move", which reads and writes it like a task row
+        self.task_id = str(occurrence.id)
+        self.selected_date = occurrence.scheduled_date.isoformat()
+        self.start_time = occurrence.start_time.strftime("%H:%M") if occurrence.start_time else ""
+        self.end_time = occurrence.end_time.strftime("%H:%M") if occurrence.end_time else ""
+
+    def toggle_completed(self):
+        # Complete the occurrence, or reopen it if it is completed
+        task_id, occurrence_date = self.occurrence.key
+        App.get_running_app().task_controller.complete_occurrence(
+            task_id, occurrence_date, not self.occurrence.is_completed)
+        self.dismiss()
+
+    def open_reschedule(self):
+        # Move this occurrence only (the other occurrences keep the slot of the series)
+        _, occurrence_date = self.occurrence.key
+        self.dismiss()
+        SchedulePopup(self, occurrence_date=occurrence_date).open()
+
+    def skip(self):
+        # Cancel this occurrence only
+        task_id, occurrence_date = self.occurrence.key
+        App.get_running_app().task_controller.cancel_occurrence(task_id, occurrence_date)
+        self.dismiss()
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from kivy.uix.screenmanager import Screen
+from kivy.properties import OptionProperty
+from kivy.app import App
+from kivy.clock import Clock
+from app.view.load_heatmap import LoadHeatmap
+
+# Number of months shown by the semester view
+SEMESTER_MONTHS = 6
+
+
+def add_months(day: date, months: int) -> date:
+    # First day of the month `months` after the month of `day`
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class OverviewScreen(Screen):
+    # Month or semester heatmap of the daily load, computed by SQL aggregates (see TaskDAO.get_daily_load)
+    mode = OptionProperty("month", options=["month", "semester"])
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.first_day = date.today().replace(day=1)
+        self.loads = {}
+        # Several task changes in a row cause a single reload
+        self._reload_trigger = Clock.create_trigger(lambda dt: self.load_overview(), 0.2)
+
+    def visible_range(self):
+        # Return (first Monday, last Sunday, number of weeks) of the calendar shown for the current mode
+        months = 1 if self.mode == "month" else SEMESTER_MONTHS
+        last_day = add_months(self.first_day, months) - timedelta(days=1)
+        start = self.first_day - timedelta(days=self.first_day.weekday())
+        end = last_day + timedelta(days=6 - last_day.weekday())
+        return start, end, ((end - start).days + 1) // 7
+
+    def on_enter(self):
+        # Refresh the overview every time the screen is entered
+        self.load_overview()
+
+    def on_mode(self, instance, value):
+        if self.manager and self.manager.current == self.name:
+            self.load_overview()
+
+    def load_overview(self):
+        # Query the per-day aggregates of the shown range only and hand them to the heatmap
+        app = App.get_running_app()
+        start, end, weeks = self.visible_range()
+        self.loads = {load.day: load for load in app.task_controller.get_daily_load(start, end)}
+
+        heatmap = self.ids["heatmap"]
+        heatmap.start = start
+        heatmap.weeks = weeks
+        heatmap.month = self.first_day.month if self.mode == "month" else 0
+        heatmap.show_day_numbers = self.mode == "month"
+        heatmap.loads = self.loads
+
+        if self.mode == "month":
+            self.ids["period_label"].text = self.first_day.strftime("%B %Y")
+        else:
+            last_month = add_months(self.first_day, SEMESTER_MONTHS - 1)
+            self.ids["period_label"].text = f"{self.first_day.strftime('%b %Y')} - {last_month.strftime('%b %Y')}"
+        self.ids["summary_label"].text = self.summary()
+
+    def summary(self, day=None):
+        # Text describing the load of one day, or of the whole shown period
+        if day is not None:
+            load = self.loads.get(day)
+            if load is None:
+                return f"{day.isoformat()}: no tasks"
+            return (f"{day.isoformat()}: {load.task_count} tasks, {load.scheduled_hours:.1f} h scheduled, "
+                    f"{load.completed_ratio:.0%} completed")
+        tasks = sum(load.task_count for load in self.loads.values())
+        hours = sum(load.scheduled_hours for load in self.loads.values())
+        done = sum(load.completed_count for load in self.loads.values())
+        ratio = done / tasks if tasks else 0.0
+        return f"{tasks} tasks, {hours:.1f} h scheduled, {ratio:.0%} completed"
+
+    def show_day(self, day):
+        # Callback of the heatmap: show the load of the pressed day
+        self.ids["summary_label"].text = self.summary(day)
+
+    def next_period(self):
+        # Move forward by one month or one semester
+        self.first_day = add_months(self.first_day, 1 if self.mode == "month" else SEMESTER_MONTHS)
+        self.load_overview()
+
+    def previous_period(self):
+        # Move backward by one month or one semester
+        self.first_day = add_months(self.first_day, -1 if self.mode == "month" else -SEMESTER_MONTHS)
+        self.load_overview()
+
+    def on_task_changed(self, event):
+        # Task changes alter the aggregates: reload them if the overview is on screen (otherwise on enter)
+        if self.manager and self.manager.current == self.name:
+            self._reload_trigger()
@@ -0,0 +1,74 @@
+from kivy.graphics import InstructionGroup, Color, RoundedRectangle, Rectangle
+from kivy.core.text import Label as CoreLabel
+from app.controller.lru_cache import LRUCache
+
+"""
+Alternative renderer for the planner week: instead of a FloatLayout and a Label per task,
+every day column gets a single InstructionGroup with one rounded rectangle and one text
+rectangle per task. Text textures are rendered once and cached, and touches are matched
+against the recorded block rectangles (hit-testing), since the blocks are not widgets
+"""
+
+class PlannerCanvasRenderer:
+    def __init__(self, screen, texture_cache_size: int = 256):
+        # screen: the PlannerScreen providing the day columns and the block colors and texts
+        self.screen = screen
+        # (text, width, height) -> rendered text texture
+        self.textures = LRUCache(texture_cache_size)
+        self._groups = {}  # day index -> (column, InstructionGroup drawn on its canvas)
+        self._hits = {}  # day index -> [(x, y, width, height, task), ...]
+
+    def draw_days(self, blocks):
+        # (Re)build the instruction groups of some day columns
+        # blocks: {day index: [(task, Rect), ...]} as returned by PlannerScreen.layout_days
+        for day, day_blocks in blocks.items():
+            self._clear_day(day)
+            group = InstructionGroup()
+            hits = []
+            for task, rect in day_blocks:
+                group.add(Color(*self.screen.task_color(task)))
+                group.add(RoundedRectangle(pos=(rect.x, rect.y), size=(rect.width, rect.height), radius=[8,]))
+                texture = self._texture(self.screen.task_text(task), rect.width, rect.height)
+                tw, th = texture.size
+                group.add(Color(1, 1, 1, 1))
+                group.add(Rectangle(texture=texture, size=(tw, th),
+                                    pos=(rect.x + (rect.width - tw) / 2, rect.y + (rect.height - th) / 2)))
+                hits.append((rect.x, rect.y, rect.width, rect.height, task))
+
+            col = self.screen.day_cols[day]
+            col.canvas.after.add(group)
+            self._groups[day] = (col, group)
+            self._hits[day] = hits
+
+    def task_at(self, x, y):
+        # Hit-test: return the task whose block contains the point, or None
+        for hits in self._hits.values():
+            # Blocks drawn later are on top
+            for bx, by, width, height, task in reversed(hits):
+                if bx <= x <= bx + width and by <= y <= by + height:
+                    return task
+        return None
+
+    def clear(self):
+        # Remove every instruction group from the columns
+        for day in list(self._groups):
+            self._clear_day(day)
+        self._hits = {}
+
+    def _clear_day(self, day):
+        col, group = self._groups.pop(day, (None, None))
+        if group is not None:
+            col.canvas.after.remove(group)
+        self._hits.pop(day, None)
+
+    def _texture(self, text, width, height):
+        # Render the text of a block once per (text, size) and reuse the texture
+        key = (text, int(width), int(height))
+        texture = self.textures.get(key)
+        if texture is None:
+            label = CoreLabel(text=text, text_size=(width, height), halign="center", valign="middle",
+                              shorten=True, color=(1, 1, 1, 1))
+            label.refresh()
+            texture = label.texture
+            self.textures.put(key, texture)
+        return texture
@@ -0,0 +1,70 @@
+import heapq
+from collections import namedtuple
+
+"""
+Overlap-aware layout of the tasks of one planner day, independent of Kivy
+Overlapping tasks are placed side by side in lanes: the intervals are swept in start order,
+each one takes the lowest lane that is free at its start (interval graph colouring with heaps,
+O(n log n)), and every group of transitively overlapping tasks (a cluster) splits the column
+width by the number of lanes it needs
+"""
+
+# Position of an interval: its lane and the number of lanes of its cluster
+Placement = namedtuple("Placement", ["key", "start", "end", "lane", "lanes"])
+
+# Rectangle of a task block in planner coordinates (y grows upwards, as in Kivy)
+Rect = namedtuple("Rect", ["key", "x", "y", "width", "height"])
+
+
+def assign_lanes(intervals):
+    # intervals: iterable of (key, start, end) with start < end (e.g. minutes since midnight)
+    # Returns one Placement per interval, in start order; touching intervals (end == start) do not overlap
+    ordered = sorted(intervals, key=lambda interval: (interval[1], interval[2]))
+    placements = []
+    active = []  # heap of (end, lane) of the intervals still running
+    free_lanes = []  # heap of lanes released inside the current cluster
+    lanes_used = 0
+    cluster = []  # indexes in placements of the current cluster
+
+    def close_cluster():
+        for index in cluster:
+            placements[index] = placements[index]._replace(lanes=lanes_used)
+
+    for key, start, end in ordered:
+        # Release the lanes of the intervals that ended before this one starts
+        while active and active[0][0] <= start:
+            heapq.heappush(free_lanes, heapq.heappop(active)[1])
+        if not active:
+            # Nothing is running: the previous cluster is complete
+            close_cluster()
+            cluster, free_lanes, lanes_used = [], [], 0
+
+        if free_lanes:
+            lane = heapq.heappop(free_lanes)
+        else:
+            lane = lanes_used
+            lanes_used += 1
+        heapq.heappush(active, (end, lane))
+        cluster.append(len(placements))
+        placements.append(Placement(key, start, end, lane, 1))
+
+    close_cluster()
+    return placements
+
+
+def layout_day(intervals, x, width, top, px_per_unit, gap=2.0):
+    # Compute the block rectangles of one day column
+    # x, width: horizontal extent of the column; top: y of time 0; px_per_unit: pixels per time unit
+    # gap: horizontal space left between blocks sharing the column
+    rects = []
+    for placement in assign_lanes(intervals):
+        lane_width = width / placement.lanes
+        block_width = lane_width - gap if placement.lanes > 1 else lane_width
+        rects.append(Rect(
+            key=placement.key,
+            x=x + placement.lane * lane_width,
+            y=top - placement.end * px_per_unit,
+            width=max(block_width, 0.0),
+            height=(placement.end - placement.start) * px_per_unit,
+        ))
+    return rects
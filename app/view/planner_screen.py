@@ -2,20 +2,45 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.label import Label
 from kivy.uix.floatlayout import FloatLayout
 from kivy.graphics import Color, RoundedRectangle
-from kivy.properties import NumericProperty
+from kivy.properties import NumericProperty, OptionProperty
+from kivy.clock import Clock
 from datetime import datetime, timedelta, date, time
 from kivy.app import App
+from app.controller.events import RELOADED
+from app.model.task_occurrence import TaskOccurrence
+from app.view.occurrence_popup import OccurrencePopup
+from app.view.planner_canvas_renderer import PlannerCanvasRenderer
+from app.view.planner_layout import layout_day
+from app.controller.lru_cache import LRUCache
+
+# Number of weeks, starting with the shown one, that the auto-scheduler fills
+AUTO_SCHEDULE_WEEKS = 2
+
 
 class PlannerScreen(Screen):
     hour_px = NumericProperty(50)
     header_h = NumericProperty(40)
+    # How task blocks are drawn: "widgets" (one FloatLayout + Label per task) or
+    # "canvas" (one instruction group per day column, see PlannerCanvasRenderer)
+    renderer = OptionProperty("widgets", options=["widgets", "canvas"])
+    __events__ = ("on_task_press",)
 
-    def __init__(self, **kwargs):
+    def __init__(self, week_cache_size: int = 8, **kwargs):
         # Initialize planner with the current week
         super().__init__(**kwargs)
         today = datetime.today()
         self.current_monday = today - timedelta(days=today.weekday())
         self.day_cols = []
+        # Keyed by task.key: the task ID, or (ID, date) for the occurrences of a recurring task
+        self._week_tasks = {}  # key -> (task, day index, start minute, end minute) of the shown week
+        self._task_boxes = {}  # key -> (day index, box drawn for it in the shown week)
+        # Resize events are coalesced: boxes are repositioned once the window stops changing size
+        self._relayout_trigger = Clock.create_trigger(self._relayout, 0.1)
+        self._built_grid = None
+        # Tasks of recently shown weeks, keyed by the date of their monday (see _load_week)
+        self.week_cache = LRUCache(week_cache_size)
+        self._prefetch_trigger = Clock.create_trigger(self._prefetch_adjacent_weeks, 0.2)
+        self.canvas_renderer = PlannerCanvasRenderer(self)
 
     @staticmethod
     def parse_date(value):
@@ -73,12 +98,9 @@ class PlannerScreen(Screen):
         self.update_week_view()
     
     def update_week_view(self):
-        # Clear existing content and graphics
+        # Show the week of current_monday: the grid skeleton is built once, then only
+        # the header texts change and the tasks are drawn from the week cache
         grid = self.ids.planner_grid
-        grid.clear_widgets()
-        days_header = self.ids.days_header
-        days_header.clear_widgets()
-        self.day_cols = []
 
         # Compute current week
         monday = self.current_monday
@@ -89,6 +111,25 @@ class PlannerScreen(Screen):
 
         # Header row (Time + 7 days of the week)
         headers = ["Time"] + [(monday + timedelta(days=i)).strftime("%a\n%d") for i in range(7)]
+        if self._built_grid is grid and len(self.day_cols) == 7:
+            for lbl, text in zip(reversed(self.ids.days_header.children), headers):
+                lbl.text = text
+        else:
+            self._build_grid(grid, headers)
+
+        # Draw scheduled tasks on the planner
+        self.draw_tasks(monday, sunday)
+
+        # Load the neighbouring weeks shortly after, so paging to them is instant
+        self._prefetch_trigger()
+
+    def _build_grid(self, grid, headers):
+        # Create the header labels, the time column and the 7 day columns
+        grid.clear_widgets()
+        days_header = self.ids.days_header
+        days_header.clear_widgets()
+        self.day_cols = []
+
         for text in headers:
             lbl = Label(
                 text=text,
@@ -112,15 +153,29 @@ class PlannerScreen(Screen):
             grid.add_widget(col)
             self.day_cols.append(col)
 
-        # Draw scheduled tasks on the planner
-        self.draw_tasks(monday, sunday)
-
-        # Re-render planner automatically when windowis resized
-        grid.bind(size=lambda *args: self._on_grid_resize())
+        # Re-layout the planner when the window is resized (bound only once per grid)
+        if self._built_grid is not grid:
+            grid.bind(size=self._on_grid_resize)
+            self._built_grid = grid
 
     def _on_grid_resize(self, *args):
-        # Callback: redraw the planner when the grid is resized
-        self.update_week_view()
+        # Callback of the grid size: schedule a (debounced) re-layout
+        self._relayout_trigger()
+
+    def _relayout(self, *args):
+        # Move the existing headers and task blocks to the new column width
+        # Nothing is rebuilt and the database is not queried
+        col_width = self.col_default_width
+        for lbl in self.ids.days_header.children:
+            lbl.width = col_width
+        if self.renderer == "canvas":
+            self.canvas_renderer.draw_days(self.layout_days(range(7)))
+            return
+        for blocks in self.layout_days(range(7)).values():
+            for task, rect in blocks:
+                _, task_box = self._task_boxes.get(task.key, (None, None))
+                if task_box is not None:
+                    self._place_box(task_box, rect)
 
     def _draw_time_ticks(self, time_col: FloatLayout):
         # Draw the time labels in the time column
@@ -143,66 +198,237 @@ class PlannerScreen(Screen):
             time_col.add_widget(lbl)
 
     def draw_tasks(self, monday, sunday):
-        # Draw all tasks scheduled between monday and sunday
+        # Draw all tasks scheduled between monday and sunday with the selected renderer
         for col in self.day_cols:
             col.clear_widgets()
+        self._task_boxes = {}
+        self.canvas_renderer.clear()
+
+        self._week_tasks = self._load_week(monday)
+        self._render_days(range(7))
+
+    def _load_week(self, monday):
+        # Return the tasks of a week with their slots, from the week cache or from the database
+        # (only the requested week is queried)
+        key = monday.date()
+        week = self.week_cache.get(key)
+        if week is None:
+            sunday = monday + timedelta(days=6)
+            app = App.get_running_app()
+            week = {}
+            for task in app.task_controller.get_tasks_between(monday.date(), sunday.date()):
+                slot = self.task_slot(task, monday, sunday)
+                if slot is not None:
+                    week[task.key] = (task, *slot)
+            self.week_cache.put(key, week)
+        return week
+
+    def _prefetch_adjacent_weeks(self, *args):
+        # Fill the cache with the previous and next week (they are only queried if not cached yet)
+        # The shown week is touched last, so it stays the most recently used entry
+        for offset in (-7, 7):
+            monday = self.current_monday + timedelta(days=offset)
+            if monday.date() not in self.week_cache:
+                self._load_week(monday)
+        self.week_cache.get(self.current_monday.date())
+
+    def _invalidate_weeks(self, event):
+        # Drop the cached weeks, except the shown one (patched in place), that a change touches
+        # A change of a recurring task can touch any week
+        if event.kind == RELOADED or self._changes_series(event):
+            self.week_cache.clear()
+            return
+        current = self.current_monday.date()
+        stale = {key for key, week in self.week_cache.items()
+                 if key != current and any(task_id in week for task_id in event.ids)}
+        for task in event.items:
+            day = self.parse_date(task.scheduled_date)
+            if day is not None:
+                stale.add(day - timedelta(days=day.weekday()))
+        stale.discard(current)
+        for key in stale:
+            self.week_cache.discard(key)
+
+    def _changes_series(self, event):
+        # Whether an event is about a recurring task (a series, or a task whose occurrences are shown)
+        if any(getattr(task, "recurrence", None) is not None for task in event.items):
+            return True
+        ids = set(event.ids)
+        weeks = [self._week_tasks] + [week for _, week in self.week_cache.items()]
+        return any(isinstance(key, tuple) and key[0] in ids for week in weeks for key in week)
+
+    def on_renderer(self, instance, value):
+        # Redraw the shown week when switching renderer
+        if self.day_cols:
+            self.draw_tasks(self.current_monday, self.current_monday + timedelta(days=6))
+
+    def on_task_changed(self, event):
+        # Patch the shown week (subscribed to TaskController.events)
+        # Only the days the changed tasks were or are in are laid out and drawn again,
+        # since a change can move the other tasks of the same day to other lanes
+        self._invalidate_weeks(event)
+        if not self.day_cols:
+            return  # the week is drawn on enter
+        monday = self.current_monday
+        sunday = monday + timedelta(days=6)
+        if event.kind == RELOADED or self._changes_series(event):
+            # Occurrences are generated from their series: expand the week again
+            self.draw_tasks(monday, sunday)
+            return
+
+        days = set()
+        for task_id in event.ids:
+            previous = self._week_tasks.pop(task_id, None)
+            if previous is not None:
+                days.add(previous[1])
+        for task in event.items:
+            day_index = self._add_week_task(task, monday, sunday)
+            if day_index is not None:
+                days.add(day_index)
+        self._render_days(days)
+
+    def task_slot(self, task, monday, sunday):
+        # Return (day index, start minute, end minute) of a task in the shown week,
+        # or None for tasks outside the week or without a complete time slot
+        if not task.scheduled_date or not task.start_time or not task.end_time:
+            return None
 
-        app = App.get_running_app()
-        tasks = app.task_controller.get_all_tasks()
+        day_date = self.parse_date(task.scheduled_date)
+        if not day_date or not (monday.date() <= day_date <= sunday.date()):
+            return None
 
-        for task in tasks:
-            try:
-                # Skip tasks with incomplete data
-                if not task.scheduled_date or not task.start_time or not task.end_time:
-                    continue
-
-                day_date = self.parse_date(task.scheduled_date)
-                if not day_date or not (monday.date() <= day_date <= sunday.date()):
-                    continue
-
-                start = self.parse_time(task.start_time)
-                end = self.parse_time(task.end_time)
-                if not start or not end:
-                    continue
-
-                day_index = (day_date - monday.date()).days
-                if day_index < 0 or day_index > 6:
-                    continue
-
-                col = self.day_cols[day_index]
-
-                # Rectangle height and placement
-                total_height = self.hour_px * 24
-                y1 = self._time_to_y(end)
-                y2 = self._time_to_y(start)
-                task_height = abs(y2 - y1)
-
-                task_box = FloatLayout(
-                    size_hint=(1, None),
-                    height=task_height
-                )
-                task_box.pos = ((day_index+1)*self.col_default_width, total_height - y1)
-
-                # Rectangle color depends on priority
-                task_color = (0.85,0,0,0.9) if task.priority == 3 else (1,0.65,0,0.9) if task.priority == 2 else (0,0.6,0,0.9)
-                self._bg_rect(task_box, task_color, radius=8)
-
-                # Task label inside the rectangle
-                txt = task.description + "\n(" + task.topic.name + ")" if task.topic.name!=None else task.description
-                lbl = Label(
-                    text=txt,
-                    size_hint=(1, 1),
-                    halign="center",
-                    valign="middle",
-                    color=(1, 1, 1, 1),
-                )
-                task_box.add_widget(lbl)
-                lbl.pos = ((day_index+1)*self.col_default_width, total_height - y1)
-
-                col.add_widget(task_box)
-
-            except Exception as e:
-                print("Task planner error:", e)
+        start = self.parse_time(task.start_time)
+        end = self.parse_time(task.end_time)
+        if not start or not end or end <= start:
+            return None
+
+        day_index = (day_date - monday.date()).days
+        return day_index, start.hour * 60 + start.minute, end.hour * 60 + end.minute
+
+    def layout_days(self, days):
+        # Lay out the tasks of the given days side by side where they overlap (see planner_layout)
+        # Returns {day index: [(task, Rect), ...]}
+        col_width = self.col_default_width
+        # y of 00:00, matching _time_to_y
+        top = self.hour_px * 24 - 30
+        per_day = {day: [] for day in days}
+        for task, day_index, start, end in self._week_tasks.values():
+            if day_index in per_day:
+                per_day[day_index].append((task.key, start, end))
+
+        blocks = {}
+        for day_index, intervals in per_day.items():
+            rects = layout_day(intervals, (day_index + 1) * col_width, col_width, top, self.hour_px / 60.0)
+            blocks[day_index] = [(self._week_tasks[rect.key][0], rect) for rect in rects]
+        return blocks
+
+    @staticmethod
+    def task_color(task):
+        # Block color depends on priority
+        return (0.85,0,0,0.9) if task.priority == 3 else (1,0.65,0,0.9) if task.priority == 2 else (0,0.6,0,0.9)
+
+    @staticmethod
+    def task_text(task):
+        # Block text: the description, followed by the topic name if any
+        topic_name = task.topic.name if task.topic else None
+        return task.description + "\n(" + topic_name + ")" if topic_name else task.description
+
+    def _add_week_task(self, task, monday, sunday):
+        # Keep a task of the shown week with its slot; returns its day index (None if it is not shown)
+        slot = self.task_slot(task, monday, sunday)
+        if slot is None:
+            return None
+        self._week_tasks[task.key] = (task, *slot)
+        return slot[0]
+
+    def _render_days(self, days):
+        # Draw the laid out tasks of the given days with the selected renderer
+        blocks = self.layout_days(days)
+        if self.renderer == "canvas":
+            self.canvas_renderer.draw_days(blocks)
+            return
+
+        for task_id, (day_index, task_box) in list(self._task_boxes.items()):
+            if day_index in blocks:
+                del self._task_boxes[task_id]
+                if task_box.parent:
+                    task_box.parent.remove_widget(task_box)
+        for day_index, day_blocks in blocks.items():
+            for task, rect in day_blocks:
+                self._draw_task(task, day_index, rect)
+
+    def _draw_task(self, task, day_index, rect):
+        # Draw a single task block as widgets in its day column
+        try:
+            task_box = FloatLayout(size_hint=(None, None))
+            self._bg_rect(task_box, self.task_color(task), radius=8)
+
+            # Task label inside the rectangle
+            lbl = Label(
+                text=self.task_text(task),
+                size_hint=(1, 1),
+                halign="center",
+                valign="middle",
+                color=(1, 1, 1, 1),
+            )
+            task_box.add_widget(lbl)
+            self._place_box(task_box, rect)
+
+            self.day_cols[day_index].add_widget(task_box)
+            # Remember the box so the task can be patched without redrawing the week
+            self._task_boxes[task.key] = (day_index, task_box)
+
+        except Exception as e:
+            print("Task planner error:", e)
+
+    @staticmethod
+    def _place_box(task_box, rect):
+        # Move and resize a task box (and its label) to a layout rectangle
+        task_box.pos = (rect.x, rect.y)
+        task_box.size = (rect.width, rect.height)
+        for child in task_box.children:
+            child.pos = task_box.pos
+
+    def task_at(self, x, y):
+        # Return the task drawn at a point of the planner grid (grid coordinates), or None
+        if self.renderer == "canvas":
+            return self.canvas_renderer.task_at(x, y)
+        # The day columns are not relative layouts, so the boxes are positioned in grid coordinates too
+        for key, (_, task_box) in self._task_boxes.items():
+            if task_box.collide_point(x, y) and key in self._week_tasks:
+                return self._week_tasks[key][0]
+        return None
+
+    def on_touch_down(self, touch):
+        # Task blocks are hit-tested here for both renderers (canvas blocks are not widgets)
+        grid = self.ids.get("planner_grid")
+        if grid is not None and grid.parent is not None and grid.parent.collide_point(*touch.pos):
+            task = self.task_at(*grid.to_widget(*touch.pos))
+            if task is not None:
+                self.dispatch("on_task_press", task)
+                return True
+        return super().on_touch_down(touch)
+
+    def on_task_press(self, task):
+        # Event fired when a task block is pressed: an occurrence of a recurring task
+        # can be completed, moved or skipped on its own
+        if isinstance(task, TaskOccurrence):
+            OccurrencePopup(task).open()
+
+    def auto_schedule(self, weeks=AUTO_SCHEDULE_WEEKS):
+        # Pack the unscheduled tasks into the free time from the shown week on (never in the past)
+        # The planner redraws the affected days when the controller reports the new slots
+        app = App.get_running_app()
+        now = datetime.now()
+        start = max(self.current_monday.date(), now.date())
+        end = self.current_monday.date() + timedelta(days=7 * weeks - 1)
+        if end < start:
+            return []
+        try:
+            return app.task_controller.auto_schedule(start, end, not_before=now)
+        except Exception as e:
+            print("Error during auto-scheduling:", e)
+            return []
 
     def next_week(self):
         # Move planner view forward by 1 week
@@ -1,18 +1,40 @@
 from kivy.app import App
-from kivy.properties import ObjectProperty
-from kivy.clock import Clock
+from kivy.properties import ObjectProperty, StringProperty
 from kivymd.uix.pickers.datepicker import MDModalDatePicker
 from kivymd.uix.pickers.timepicker import MDTimePickerInput
 from kivy.uix.popup import Popup
 
+# Number of conflicting tasks named in the warning
+MAX_LISTED_CONFLICTS = 3
+
+
+def describe_conflicts(tasks):
+    # Warning text naming the tasks that overlap the chosen slot ("" if there are none)
+    if not tasks:
+        return ""
+    names = ", ".join(task.description for task in tasks[:MAX_LISTED_CONFLICTS])
+    more = len(tasks) - MAX_LISTED_CONFLICTS
+    return f"Overlaps with: {names}" + (f" (+{more} more)" if more > 0 else "")
+
 class SchedulePopup(Popup):
     # Popup to schedule a task
+    # With an occurrence_date only that occurrence of a recurring task is moved (an override row);
+    # on the row of a series the whole series is moved, which the popup states explicitly
     
     task_item = ObjectProperty(None)
+    occurrence_date = ObjectProperty(None, allownone=True)
+    scope_text = StringProperty("")
 
-    def __init__(self, task_item, **kwargs):
+    def __init__(self, task_item, occurrence_date=None, **kwargs):
         super().__init__(**kwargs)
         self.task_item = task_item
+        self.occurrence_date = occurrence_date
+        if occurrence_date is not None:
+            self.title = "Move Occurrence"
+            self.scope_text = f"Only the occurrence of {occurrence_date.isoformat()} is moved"
+        elif getattr(task_item, "is_series", False):
+            self.title = "Move Whole Series"
+            self.scope_text = "Every occurrence moves: the series restarts on this date, at this time"
 
     def open_date_picker(self, button):
         # Open date picker and bind result to set_date
@@ -29,6 +51,7 @@ class SchedulePopup(Popup):
         if selection:
             self.task_item.selected_date = selection[0].isoformat()
             button.text = f"Date: {self.task_item.selected_date}"
+            self.validate_times()
         
         instance.dismiss()
 
@@ -75,21 +98,26 @@ class SchedulePopup(Popup):
                 self.ids.save_btn.disabled = True
                 return
 
-        # If times are valid
-        self.ids.error_label.text = ""
+        # If times are valid, warn about tasks already scheduled in the slot (saving is still allowed)
+        self.ids.error_label.text = self.conflict_warning()
         self.ids.save_btn.disabled = False
 
+    def conflict_warning(self):
+        # Look up the tasks overlapping the chosen slot in the controller's schedule index
+        item = self.task_item
+        if not (item.selected_date and item.start_time and item.end_time):
+            return ""
+        app = App.get_running_app()
+        conflicts = app.task_controller.find_conflicts(
+            item.selected_date.strip(), item.start_time.strip(), item.end_time.strip(), exclude_id=int(item.task_id))
+        return describe_conflicts(conflicts)
+
     def save_schedule(self):
-        # Persist scheduling info in the database and refresh task list
+        # Persist scheduling info in the database (the lists showing the task are patched by the change event)
         app = App.get_running_app()
-        app.task_controller.set_time_slot(
-            int(self.task_item.task_id),
-            self.task_item.selected_date.strip(),
-            self.task_item.start_time.strip(),
-            self.task_item.end_time.strip()
-        )
-        self.dismiss()
-
-        # Refresh task list after saving
-        task_screen = app.sm.get_screen("tasks")
-        Clock.schedule_once(lambda dt: task_screen.refresh_task_list(), 0.0)
\ No newline at end of file
+        slot = (self.task_item.selected_date.strip(), self.task_item.start_time.strip(), self.task_item.end_time.strip())
+        if self.occurrence_date is not None:
+            app.task_controller.reschedule_occurrence(int(self.task_item.task_id), self.occurrence_date, *slot)
+        else:
+            app.task_controller.set_time_slot(int(self.task_item.task_id), *slot)
+        self.dismiss()
\ No newline at end of file
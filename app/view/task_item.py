@@ -1,50 +1,76 @@
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.app import App
 from kivy.properties import StringProperty, BooleanProperty
-from kivy.clock import Clock
-from kivy.uix.boxlayout import BoxLayout
 from app.view.schedule_popup import SchedulePopup
 
-class TaskItem(BoxLayout):
+class TaskItem(RecycleDataViewBehavior, BoxLayout):
+    # Recyclable row of the task list: the RecycleView reuses a few TaskItem widgets
+    # and fills them with the data dict of the row they currently show (see data_from_task)
+
     # Properties bound to the UI
     description = StringProperty("")
     topic = StringProperty("")
     priority = StringProperty("")
     is_completed = BooleanProperty(False)
+    # A series is completed per occurrence by pressing the occurrence in the planner (see OccurrencePopup),
+    # so its checkbox is disabled
+    is_series = BooleanProperty(False)
 
-    def __init__(self, task, **kwargs):
-        # Initialize TaskItem widget with task data
+    def __init__(self, task=None, **kwargs):
+        # Initialize TaskItem widget, optionally with task data (outside of a RecycleView)
         self._initializing = True
+        self.index = None
+        self.task_id = "0"
+        self.selected_date = ""
+        self.start_time = ""
+        self.end_time = ""
         super().__init__(**kwargs)
-        self.task = task
-        self.task_id = str(getattr(task, "id", getattr(task, "task_id", 0)) or 0)
-        self.description = task.description or ""
-        self.topic = getattr(getattr(task, "topic", None), "name", "") or ""
+        if task is not None:
+            for key, value in self.data_from_task(task).items():
+                setattr(self, key, value)
+
+        # Mark initialization complete; this flag prevents property callbacks (e.g., on_checkbox_active) from running prematurely during __init__
+        self._initializing = False
 
+    @staticmethod
+    def data_from_task(task) -> dict:
+        # Build the plain data dict that describes one row of the task list
         # Map numeric priority to human-readable label
         try:
             prio_num = int(getattr(task, "priority", 1) or 1)
         except (TypeError, ValueError):
             prio_num = 1
-        self.priority = {1: "Low", 2: "Medium", 3: "High"}.get(prio_num, "Low")
 
-        self.is_completed = bool(getattr(task, "is_completed", False))
+        return {
+            "task_id": str(getattr(task, "id", getattr(task, "task_id", 0)) or 0),
+            "description": task.description or "",
+            "topic": getattr(getattr(task, "topic", None), "name", "") or "",
+            "priority": {1: "Low", 2: "Medium", 3: "High"}.get(prio_num, "Low"),
+            "is_completed": bool(getattr(task, "is_completed", False)),
+            "is_series": getattr(task, "recurrence", None) is not None,
+            # Scheduling info (if available)
+            "selected_date": str(task.scheduled_date) if task.scheduled_date else "",
+            "start_time": str(task.start_time) if task.start_time else "",
+            "end_time": str(task.end_time) if task.end_time else "",
+        }
 
-        # Scheduling info (if available)
-        self.selected_date = str(task.scheduled_date) if task.scheduled_date else ""
-        self.start_time = str(task.start_time) if task.start_time else ""
-        self.end_time = str(task.end_time) if task.end_time else ""
-
-        # Mark initialization complete; this flag prevents property callbacks (e.g., on_checkbox_active) from running prematurely during __init__
+    def refresh_view_attrs(self, rv, index, data):
+        # Called by the RecycleView when this widget is (re)used to display the row at `index`
+        # Guarded like __init__, so setting is_completed from data does not write to the database
+        self.index = index
+        self._initializing = True
+        super().refresh_view_attrs(rv, index, data)
         self._initializing = False
 
     def on_checkbox_active(self, checkbox, value):
         # Handle checkbox toggle: mark task as completed or not
-        if getattr(self, "_initializing", False):
+        if getattr(self, "_initializing", False) or self.is_series:
             return
 
+        # The task screen replaces this row when the controller reports the update,
+        # so a recycled widget never shows a stale state
         app = App.get_running_app()
-        task_screen = app.sm.get_screen("tasks")
         try:
             if value:
                 app.task_controller.mark_completed(int(self.task_id))
@@ -53,18 +79,14 @@ class TaskItem(BoxLayout):
         except Exception as e:
             print("Error updating completion status:", e)
 
-        # Refresh task list after update
-        Clock.schedule_once(lambda dt: task_screen.refresh_task_list(), 0.0)
-
     def delete_task(self):
-        # Delete this task and refresh task list
+        # Delete this task; the task screen drops its row when the controller reports the deletion
         app = App.get_running_app()
-        task_screen = app.sm.get_screen("tasks")
         try:
             app.task_controller.delete_task(int(self.task_id))
-        finally:
-            Clock.schedule_once(lambda dt: task_screen.refresh_task_list(), 0.0)
+        except Exception as e:
+            print(f"Error during deletion: {e}")
 
     def open_schedule_popup(self):
         # Open popup for scheduling task date and time
-        SchedulePopup(self).open()
\ No newline at end of file
+        SchedulePopup(self).open()
@@ -4,6 +4,7 @@ from app.model.task import Task
 from app.model.topic import Topic
 from app.view.task_item import TaskItem
 from app.view.add_task_popup import AddTaskPopup
+from app.controller.events import DELETED, RELOADED
 
 class TaskScreen(Screen):
     # Main screen for managing tasks (viewing, creating, updating)
@@ -18,15 +19,43 @@ class TaskScreen(Screen):
         self.load_tasks()
 
     def load_tasks(self):
-        # Load all tasks from the controller and display them in the UI
+        # Load all tasks from the controller and hand them to the RecycleView as plain data dicts
+        # Tasks are streamed, and only the visible rows are turned into TaskItem widgets
         app = App.get_running_app()
-        self.ids.task_list.clear_widgets()
-        tasks = app.task_controller.get_all_tasks()
-        for task in tasks:
-            task_item = TaskItem(task)
-            self.ids.task_list.add_widget(task_item)
+        self.ids.task_list.data = [TaskItem.data_from_task(task) for task in app.task_controller.iter_tasks()]
+
+    def on_task_changed(self, event):
+        # Patch only the rows of the changed tasks (subscribed to TaskController.events)
+        rv = self.ids.task_list
+        if event.kind == RELOADED:
+            self.load_tasks()
+            return
+        if event.kind == DELETED:
+            deleted = {str(task_id) for task_id in event.ids}
+            rv.data = [row for row in rv.data if row["task_id"] not in deleted]
+            return
+
+        # Created and updated tasks are upserted, so receiving the same event twice is harmless
+        positions = {row["task_id"]: index for index, row in enumerate(rv.data)}
+        for task in event.items:
+            row = TaskItem.data_from_task(task)
+            index = positions.get(row["task_id"])
+            if index is None:
+                rv.data.append(row)
+            else:
+                rv.data[index] = row
+
+    def on_topic_changed(self, event):
+        # Clear the topic shown by tasks whose topic was deleted (subscribed to TopicController.events)
+        if event.kind != DELETED:
+            return
+        names = {topic.name for topic in event.items}
+        data = self.ids.task_list.data
+        for index, row in enumerate(data):
+            if row["topic"] in names:
+                data[index] = dict(row, topic="")
     
-    def add_task_from_popup(self, desc, topic_name, prio, date, start, end, popup):
+    def add_task_from_popup(self, desc, topic_name, prio, date, start, end, popup, estimated_minutes=None, recurrence=None):
         # Handle task creation from the popup input fields
         app = App.get_running_app()
         if not desc:
@@ -52,9 +81,13 @@ class TaskScreen(Screen):
             is_completed=False,
             scheduled_date=date if date else None,
             start_time=start if start else None,
-            end_time=end if end else None
+            end_time=end if end else None,
+            estimated_minutes=estimated_minutes
         )
-        task_id = app.task_controller.create_task(task)
+        if recurrence is not None:
+            task_id = app.task_controller.create_recurring_task(task, recurrence)
+        else:
+            task_id = app.task_controller.create_task(task)
         print(f"Task created with ID: {task_id}")
         popup.dismiss()
 
@@ -1,23 +1,31 @@
 from kivy.uix.boxlayout import BoxLayout
-from kivy.properties import StringProperty
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.properties import StringProperty, ObjectProperty
 from kivy.app import App
-from kivy.clock import Clock
 
-class TopicItem(BoxLayout):
-    topic_id = None
+class TopicItem(RecycleDataViewBehavior, BoxLayout):
+    # Recyclable row of the topics list, filled from the data dict built by data_from_topic
+    topic_id = ObjectProperty(None, allownone=True)
     topic_name = StringProperty("")
+    manage_popup = ObjectProperty(None, allownone=True)
     
-    def __init__(self, topic, manage_popup, **kwargs):
-        self._initializing = True
+    def __init__(self, topic=None, manage_popup=None, **kwargs):
         super().__init__(**kwargs)
-        self.topic_id = topic.id
-        self.topic_name = topic.name
-        self.manage_popup = manage_popup
+        if manage_popup is not None:
+            self.manage_popup = manage_popup
+        if topic is not None:
+            self.topic_id = topic.id
+            self.topic_name = topic.name
+
+    @staticmethod
+    def data_from_topic(topic, manage_popup) -> dict:
+        # Build the plain data dict that describes one row of the topics list
+        return {"topic_id": topic.id, "topic_name": topic.name, "manage_popup": manage_popup}
 
     def delete_topic(self):
         app = App.get_running_app()
         try:
+            # The popup drops the row when the controller reports the deletion
             app.topic_controller.delete_topic(int(self.topic_id))
-            Clock.schedule_once(lambda dt: self.manage_popup.load_topics(), 0.0)
         except Exception as e:
-            print(f"Error during deletion: {e}")
\ No newline at end of file
+            print(f"Error during deletion: {e}")
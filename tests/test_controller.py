@@ -1,14 +1,21 @@
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 import unittest
-from datetime import date, time
+import gc
+import tracemalloc
+from datetime import date, time, datetime
 from app.controller.task_controller import TaskController
 from app.controller.topic_controller import TopicController
 from app.controller.note_controller import NoteController
 from app.model.task import Task
 from app.model.topic import Topic
 from app.model.note import Note
+from app.model.recurrence import Recurrence, WEEKLY
 from app.db.database import Database
+from app.controller.lru_cache import LRUCache
+from app.controller.schedule_index import ScheduleIndex
+from app.controller.events import CREATED, UPDATED, DELETED
+from app.db.change_detector import TableChanges
 
 # ------------------------
 # Base setup for controller tests
@@ -64,6 +71,78 @@ class TestTopicController(BaseControllerTest):
         topics = self.topic_controller.get_all_topics()
         self.assertEqual(len(topics), 0)
 
+    def test_lookups_use_in_memory_index(self):
+        # After the first load, lookups run no queries at all
+        self.topic_controller.create_topics(["Math", "Physics"])
+        self.topic_controller.get_all_topics()
+
+        for name in ("get_all_topics", "get_topic_by_id", "get_topic_by_name"):
+            setattr(self.topic_controller.dao, name, lambda *a: self.fail("unexpected query"))
+        math_id = self.topic_controller.get_topic_id("Math")
+        self.assertEqual(self.topic_controller.get_topic_name(math_id), "Math")
+        self.assertEqual(self.topic_controller.get_topic_by_name("Physics").name, "Physics")
+        self.assertIsNone(self.topic_controller.get_topic_by_id(999))
+        self.assertEqual(len(self.topic_controller.get_all_topics()), 2)
+
+    def test_rolled_back_topic_is_not_cached(self):
+        # The index follows the database only once a change is committed
+        version = self.topic_controller.version
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.topic_controller.create_topic("Ghost")
+                raise RuntimeError("rollback")
+        self.assertIsNone(self.topic_controller.get_topic_by_name("Ghost"))
+        self.assertEqual(self.topic_controller.version, version)
+
+        math = self.topic_controller.create_topic("Math")
+        self.assertEqual(self.topic_controller.get_topic_by_id(math.id).name, "Math")
+        with self.db.transaction():
+            self.topic_controller.delete_topic(math.id)
+            self.assertIsNotNone(self.topic_controller.get_topic_by_name("Math"))
+        self.assertIsNone(self.topic_controller.get_topic_by_name("Math"))
+
+    def test_version_changes_only_when_topics_change(self):
+        # The version counter tells callers when their topic list is stale
+        v0 = self.topic_controller.version
+        self.topic_controller.create_topic("Math")
+        v1 = self.topic_controller.version
+        self.assertGreater(v1, v0)
+
+        self.topic_controller.create_topic("Math")  # duplicate: nothing changes
+        self.topic_controller.get_all_topics()
+        self.assertEqual(self.topic_controller.version, v1)
+
+        self.topic_controller.delete_topic(self.topic_controller.get_topic_id("Math"))
+        self.assertGreater(self.topic_controller.version, v1)
+        self.assertEqual(self.topic_controller.get_all_topics(), [])
+
+    def test_invalidate_reloads_from_database(self):
+        # Topics written behind the controller's back appear after invalidate()
+        self.topic_controller.get_all_topics()
+        self.topic_controller.dao.insert_topic(Topic(name="External"))
+        self.assertIsNone(self.topic_controller.get_topic_by_name("External"))
+        self.topic_controller.invalidate()
+        self.assertIsNotNone(self.topic_controller.get_topic_by_name("External"))
+
+    def test_create_and_delete_topics_in_batch(self):
+        # Batch operations create and remove several topics at once
+        self.topic_controller.create_topics(["Math", "Physics", "Chemistry"])
+        topics = self.topic_controller.get_all_topics()
+        self.assertEqual(len(topics), 3)
+
+        self.topic_controller.delete_topics([t.id for t in topics[:2]])
+        self.assertEqual([t.name for t in self.topic_controller.get_all_topics()], ["Chemistry"])
+
+    def test_changes_are_emitted_as_events(self):
+        # Only real changes are reported: creating an existing topic emits nothing
+        events = []
+        self.topic_controller.events.subscribe(events.append)
+        topic = self.topic_controller.create_topic("Math")
+        self.topic_controller.create_topic("Math")
+        self.topic_controller.delete_topic(topic.id)
+        self.assertEqual([(e.kind, e.ids) for e in events], [(CREATED, (topic.id,)), (DELETED, (topic.id,))])
+        self.assertEqual(events[1].items[0].name, "Math")
+
 
 # ------------------------
 # TaskController tests
@@ -111,6 +190,265 @@ class TestTaskController(BaseControllerTest):
         tasks = self.task_controller.get_all_tasks()
         self.assertEqual(len(tasks), 0)
 
+    def test_get_tasks_between(self):
+        # Tasks of one week are mapped to Task objects with parsed dates
+        self.task_controller.create_tasks([
+            Task(description="in", priority=1, scheduled_date=date(2025, 3, 4), start_time=time(9, 0), end_time=time(10, 0)),
+            Task(description="out", priority=1, scheduled_date=date(2025, 3, 11), start_time=time(9, 0), end_time=time(10, 0)),
+        ])
+        tasks = self.task_controller.get_tasks_between(date(2025, 3, 3), date(2025, 3, 9))
+        self.assertEqual([t.description for t in tasks], ["in"])
+        self.assertEqual(tasks[0].scheduled_date, date(2025, 3, 4))
+
+    def test_get_daily_load(self):
+        # Daily aggregates are returned as DayLoad objects
+        ids = self.task_controller.create_tasks([
+            Task(description="a", priority=1, scheduled_date=date(2025, 3, 4), start_time=time(9, 0), end_time=time(11, 0)),
+            Task(description="b", priority=1, scheduled_date=date(2025, 3, 4), start_time=time(13, 0), end_time=time(14, 0)),
+        ])
+        self.task_controller.mark_completed(ids[1])
+        loads = self.task_controller.get_daily_load(date(2025, 3, 1), date(2025, 3, 31))
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(loads[0].day, date(2025, 3, 4))
+        self.assertEqual(loads[0].task_count, 2)
+        self.assertAlmostEqual(loads[0].scheduled_hours, 3.0)
+        self.assertAlmostEqual(loads[0].completed_ratio, 0.5)
+
+    def test_get_task_table(self):
+        # The table holds every task, with dates as ordinals and times as minutes
+        topic_ids = self.topic_controller.create_topics(["Math"])
+        ids = self.task_controller.create_tasks([
+            Task(description="a", topic=Topic(id=topic_ids[0]), priority=2,
+                 scheduled_date=date(2025, 3, 4), start_time=time(9, 30), end_time=time(11, 0)),
+            Task(description="b", priority=1),
+        ])
+        table = self.task_controller.get_task_table()
+        self.assertEqual(list(table.ids), ids)
+        self.assertEqual(list(table.topic_ids), [topic_ids[0], 0])
+        self.assertEqual(list(table.days), [date(2025, 3, 4).toordinal(), 0])
+        self.assertEqual((list(table.starts), list(table.ends)), ([570, -1], [660, -1]))
+        self.assertEqual(table.scheduled_minutes(topic_id=topic_ids[0]), 90)
+
+    def test_loaded_tasks_are_compact(self):
+        # Tasks of one load share their Topic objects and take well under the memory of dict-backed objects
+        topic_ids = self.topic_controller.create_topics(["Math", "Physics"])
+        self.task_controller.create_tasks(
+            Task(description=f"Task {i}", topic=Topic(id=topic_ids[i % 2]), priority=1,
+                 scheduled_date=date(2025, 1, 1 + i % 28), start_time=time(9, 0), end_time=time(10, 0))
+            for i in range(5000))
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            tasks = self.task_controller.get_all_tasks()
+            per_task = (tracemalloc.get_traced_memory()[0] - before) / len(tasks)
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(len({id(task.topic) for task in tasks}), 2)
+        # About 500 bytes per task with __dict__ models and one Topic per row
+        self.assertLess(per_task, 350)
+
+    def test_batch_operations(self):
+        # Create, complete and delete several tasks, each step in one transaction
+        ids = self.task_controller.create_tasks([Task(description=f"Task {i}", priority=1) for i in range(3)])
+        self.assertEqual(len(ids), 3)
+
+        self.task_controller.mark_completed_many(ids[:2])
+        completed = {t.id: t.is_completed for t in self.task_controller.get_all_tasks()}
+        self.assertEqual(completed, {ids[0]: True, ids[1]: True, ids[2]: False})
+
+        self.task_controller.delete_tasks(ids)
+        self.assertEqual(self.task_controller.get_all_tasks(), [])
+
+    def test_batch_is_atomic(self):
+        # If one task of the batch is invalid, none of them is stored
+        tasks = [Task(description="ok", priority=1), Task(description=None, priority=1)]
+        with self.assertRaises(Exception):
+            self.task_controller.create_tasks(tasks)
+        self.assertEqual(self.task_controller.get_all_tasks(), [])
+
+    def test_find_conflicts_follows_changes(self):
+        # The schedule index is built once and kept up to date by create, set_time_slot and delete
+        first = self.task_controller.create_task(
+            Task(description="Lecture", priority=1, scheduled_date=date(2025, 3, 4), start_time=time(9, 0), end_time=time(11, 0)))
+        conflicts = self.task_controller.find_conflicts(date(2025, 3, 4), time(10, 0), time(12, 0))
+        self.assertEqual([t.description for t in conflicts], ["Lecture"])
+        self.assertEqual(self.task_controller.find_conflicts("2025-03-04", "11:00", "12:00"), [])
+
+        second = self.task_controller.create_task(
+            Task(description="Lab", priority=1, scheduled_date=date(2025, 3, 4), start_time=time(10, 30), end_time=time(12, 0)))
+        conflicts = self.task_controller.find_conflicts("2025-03-04", "10:00", "11:00")
+        self.assertEqual([t.description for t in conflicts], ["Lecture", "Lab"])
+        self.assertEqual([t.id for t in self.task_controller.find_conflicts("2025-03-04", "10:00", "11:00", exclude_id=first)], [second])
+
+        self.task_controller.set_time_slot(second, "2025-03-05", "10:00", "11:00")
+        self.task_controller.delete_task(first)
+        self.assertEqual(self.task_controller.find_conflicts("2025-03-04", "08:00", "18:00"), [])
+        self.assertEqual([t.id for t in self.task_controller.find_conflicts("2025-03-05", "08:00", "18:00")], [second])
+
+    def test_auto_schedule_fills_free_time(self):
+        # Open unscheduled tasks are packed around the existing slots, in one transaction
+        self.task_controller.create_tasks([
+            Task(description="Lecture", priority=1, scheduled_date=date(2025, 3, 3), start_time=time(9, 0), end_time=time(10, 0)),
+            Task(description="Essay", priority=3, estimated_minutes=90),
+            Task(description="Reading", priority=1, estimated_minutes=30),
+            Task(description="Done", priority=3, is_completed=True),
+        ])
+        events = []
+        self.task_controller.events.subscribe(events.append)
+        mornings = {0: [(time(9, 0), time(12, 0))]}
+        task_ids = self.task_controller.auto_schedule(date(2025, 3, 3), date(2025, 3, 9), mornings)
+
+        self.assertEqual(len(task_ids), 2)
+        self.assertEqual(len(events), 1)
+        tasks = {t.description: t for t in self.task_controller.get_tasks_between(date(2025, 3, 3), date(2025, 3, 9))}
+        self.assertEqual((tasks["Essay"].start_time, tasks["Essay"].end_time), (time(10, 0), time(11, 30)))
+        self.assertEqual((tasks["Reading"].start_time, tasks["Reading"].end_time), (time(11, 30), time(12, 0)))
+        self.assertNotIn("Done", tasks)
+        self.assertEqual(tasks["Essay"].estimated_minutes, 90)
+        self.assertEqual(self.task_controller.find_conflicts("2025-03-03", "10:00", "10:30")[0].description, "Essay")
+
+    def test_recurring_task_is_expanded_per_range(self):
+        # A weekly series is stored once and expanded only for the requested range
+        lecture = Task(description="Lecture", priority=2, scheduled_date=date(2025, 3, 3), start_time=time(9, 0), end_time=time(11, 0))
+        series_id = self.task_controller.create_recurring_task(lecture, Recurrence(WEEKLY, weekdays=(0, 3)))
+        self.task_controller.create_task(
+            Task(description="Lab", priority=1, scheduled_date=date(2025, 3, 11), start_time=time(8, 0), end_time=time(9, 0)))
+
+        self.assertEqual(len(self.task_controller.get_all_tasks()), 2)
+        week = self.task_controller.get_tasks_between(date(2025, 3, 10), date(2025, 3, 16))
+        self.assertEqual([(t.description, t.scheduled_date) for t in week],
+                         [("Lecture", date(2025, 3, 10)), ("Lab", date(2025, 3, 11)), ("Lecture", date(2025, 3, 13))])
+        self.assertTrue(all(t.id == series_id for t in week if t.description == "Lecture"))
+
+    def test_occurrence_overrides(self):
+        # Completing, moving or cancelling one occurrence leaves the other occurrences alone
+        lecture = Task(description="Lecture", priority=2, scheduled_date=date(2025, 3, 3), start_time=time(9, 0), end_time=time(11, 0))
+        series_id = self.task_controller.create_recurring_task(lecture, Recurrence(WEEKLY))
+        events = []
+        self.task_controller.events.subscribe(events.append)
+        self.task_controller.complete_occurrence(series_id, date(2025, 3, 10))
+        self.task_controller.reschedule_occurrence(series_id, date(2025, 3, 17), date(2025, 3, 9), time(14, 0), time(16, 0))
+        self.task_controller.cancel_occurrence(series_id, date(2025, 3, 24))
+
+        self.assertEqual(len(events), 3)
+        self.assertIsNotNone(events[0].items[0].recurrence)
+        tasks = self.task_controller.get_tasks_between(date(2025, 3, 3), date(2025, 3, 31))
+        self.assertEqual([(t.scheduled_date, t.start_time, t.is_completed) for t in tasks], [
+            (date(2025, 3, 3), time(9, 0), False),
+            (date(2025, 3, 9), time(14, 0), False),
+            (date(2025, 3, 10), time(9, 0), True),
+            (date(2025, 3, 31), time(9, 0), False),
+        ])
+        # The moved occurrence is found from the week it was moved to
+        moved = self.task_controller.get_tasks_between(date(2025, 3, 9), date(2025, 3, 9))
+        self.assertEqual([t.occurrence_date for t in moved], [date(2025, 3, 17)])
+
+        self.task_controller.delete_task(series_id)
+        self.assertEqual(self.task_controller.get_tasks_between(date(2025, 3, 3), date(2025, 3, 31)), [])
+        self.assertEqual(self.db.cursor.execute("SELECT COUNT(*) FROM task_overrides").fetchone()[0], 0)
+
+    def test_occurrences_take_time_in_the_schedule(self):
+        # Occurrences after the first one are conflicts, busy time for the auto-scheduler and daily load
+        lecture = Task(description="Lecture", priority=2, scheduled_date=date(2025, 1, 6), start_time=time(10, 0), end_time=time(12, 0))
+        series_id = self.task_controller.create_recurring_task(lecture, Recurrence(WEEKLY))
+        self.task_controller.create_task(Task(description="Essay", priority=3, estimated_minutes=120))
+
+        conflicts = self.task_controller.find_conflicts(date(2025, 1, 13), time(10, 30), time(11, 0))
+        self.assertEqual([(t.id, t.scheduled_date) for t in conflicts], [(series_id, date(2025, 1, 13))])
+        self.assertEqual(self.task_controller.find_conflicts("2025-01-06", "09:00", "11:00", exclude_id=series_id), [])
+        self.assertEqual(len(self.task_controller.find_conflicts("2025-01-06", "09:00", "11:00")), 1)
+
+        loads = self.task_controller.get_daily_load(date(2025, 1, 6), date(2025, 1, 19))
+        self.assertEqual([(load.day, load.task_count, load.scheduled_hours) for load in loads],
+                         [(date(2025, 1, 6), 1, 2.0), (date(2025, 1, 13), 1, 2.0)])
+
+        self.task_controller.auto_schedule(date(2025, 1, 13), date(2025, 1, 13), {0: [(time(9, 0), time(14, 0))]})
+        essay = [t for t in self.task_controller.get_tasks_between(date(2025, 1, 13), date(2025, 1, 13)) if t.description == "Essay"]
+        self.assertEqual((essay[0].start_time, essay[0].end_time), (time(12, 0), time(14, 0)))
+
+    def test_conflict_checks_expand_cached_series(self):
+        # Series and overrides are read once for all conflict checks and read again after a change of a series
+        lecture = Task(description="Lecture", priority=2, scheduled_date=date(2025, 1, 6), start_time=time(10, 0), end_time=time(12, 0))
+        series_id = self.task_controller.create_recurring_task(lecture, Recurrence(WEEKLY))
+        loads = []
+        load_series = self.task_controller.recurrences.get_all_series
+        self.task_controller.recurrences.get_all_series = lambda: loads.append(1) or load_series()
+        for day in (13, 20, 27):
+            self.assertEqual(len(self.task_controller.find_conflicts(date(2025, 1, day), time(11, 0), time(13, 0))), 1)
+        self.assertEqual(len(loads), 1)
+
+        self.task_controller.cancel_occurrence(series_id, date(2025, 1, 20))
+        self.assertEqual(self.task_controller.find_conflicts(date(2025, 1, 20), time(11, 0), time(13, 0)), [])
+        self.assertEqual(len(loads), 2)
+        # Changes of single tasks keep the cache
+        self.task_controller.create_task(Task(description="Essay", priority=1))
+        self.task_controller.find_conflicts(date(2025, 1, 27), time(11, 0), time(13, 0))
+        self.assertEqual(len(loads), 2)
+
+        # A series created by another process is picked up from its change
+        other = self.task_controller.dao.insert_task(
+            Task(description="Seminar", priority=1, scheduled_date=date(2025, 1, 7), start_time=time(14, 0), end_time=time(15, 0)))
+        self.task_controller.recurrences.insert_recurrence(other, Recurrence(WEEKLY))
+        changes = TableChanges()
+        changes.changed.add(other)
+        self.task_controller.apply_external_changes(changes)
+        conflicts = self.task_controller.find_conflicts(date(2025, 1, 14), time(14, 0), time(15, 0))
+        self.assertEqual([(t.id, t.scheduled_date) for t in conflicts], [(other, date(2025, 1, 14))])
+
+    def test_iterated_series_carry_their_rule(self):
+        # The task list can tell a series from a single task
+        self.task_controller.create_recurring_task(
+            Task(description="Lecture", priority=1, scheduled_date=date(2025, 1, 6)), Recurrence(WEEKLY))
+        self.task_controller.create_task(Task(description="Essay", priority=1))
+        tasks = list(self.task_controller.iter_tasks(chunk_size=1))
+        self.assertEqual([t.recurrence is not None for t in tasks], [True, False])
+
+    def test_rolled_back_slot_is_not_indexed(self):
+        # Index updates wait for the commit, like the change events
+        self.task_controller.find_conflicts("2025-03-04", "09:00", "10:00")
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.task_controller.create_task(
+                    Task(description="Lost", priority=1, scheduled_date=date(2025, 3, 4), start_time=time(9, 0), end_time=time(10, 0)))
+                raise RuntimeError("boom")
+        self.assertEqual(self.task_controller.find_conflicts("2025-03-04", "09:00", "10:00"), [])
+
+    def test_changes_are_emitted_as_events(self):
+        # Every committed change is reported with the affected IDs and the current tasks
+        events = []
+        self.task_controller.events.subscribe(events.append)
+        task_id = self.task_controller.create_task(Task(description="Read", priority=1))
+        self.task_controller.mark_completed(task_id)
+        self.task_controller.delete_task(task_id)
+
+        self.assertEqual([(e.kind, e.ids) for e in events],
+                         [(CREATED, (task_id,)), (UPDATED, (task_id,)), (DELETED, (task_id,))])
+        self.assertEqual(events[0].items[0].description, "Read")
+        self.assertTrue(events[1].items[0].is_completed)
+
+    def test_external_changes_are_emitted_as_events(self):
+        # Rows changed by another process are re-read and announced like local changes
+        task_id = self.task_controller.create_task(Task(description="Remote", priority=2))
+        events = []
+        self.task_controller.events.subscribe(events.append)
+        changes = TableChanges()
+        changes.changed.add(task_id)
+        changes.deleted.add(999)
+        self.task_controller.apply_external_changes(changes)
+        self.assertEqual([(e.kind, e.ids) for e in events], [(DELETED, (999,)), (UPDATED, (task_id,))])
+        self.assertEqual(events[1].items[0].description, "Remote")
+
+    def test_no_event_for_rolled_back_changes(self):
+        # Changes undone by a failing transaction are never announced
+        events = []
+        self.task_controller.events.subscribe(events.append)
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.task_controller.create_task(Task(description="Lost", priority=1))
+                raise RuntimeError("boom")
+        self.assertEqual(events, [])
+
 
 # ------------------------
 # NoteController tests
@@ -147,6 +485,128 @@ class TestNoteController(BaseControllerTest):
         notes = self.note_controller.get_all_notes()
         self.assertEqual(len(notes), 0)
 
+    def test_notes_are_loaded_with_topic_name(self):
+        # The topic name comes from the joined query, for lists and single notes
+        self.topic_controller.create_topic("Biology")
+        topic = self.topic_controller.get_topic_by_name("Biology")
+        note_id = self.note_controller.create_note(Note(title="Cells", topic=topic))
+        self.note_controller.create_note(Note(title="No topic"))
+
+        by_title = {n.title: n for n in self.note_controller.get_all_notes()}
+        self.assertEqual(by_title["Cells"].topic.name, "Biology")
+        self.assertIsNone(by_title["No topic"].topic)
+        self.assertEqual(self.note_controller.get_note_by_id(note_id).topic.name, "Biology")
+
+    def test_notes_page_and_iterator(self):
+        # Pages continue from the last note shown; the iterator yields Note objects
+        self.note_controller.create_notes(
+            Note(title=f"Note {i}", created_at=datetime(2025, 1, 1 + i)) for i in range(5))
+        page = self.note_controller.get_notes_page(limit=2)
+        self.assertEqual([n.title for n in page], ["Note 4", "Note 3"])
+
+        next_page = self.note_controller.get_notes_page(page[-1].created_at, page[-1].id, limit=2)
+        self.assertEqual([n.title for n in next_page], ["Note 2", "Note 1"])
+        self.assertEqual(len(list(self.note_controller.iter_notes(chunk_size=2))), 5)
+
+    def test_search_returns_ranked_results_with_snippets(self):
+        # Search results expose title, snippet and parsed creation date
+        self.note_controller.create_note(Note(title="Thermodynamics", content="Entropy always increases"))
+        self.note_controller.create_note(Note(title="Other", content="Nothing relevant"))
+
+        results = self.note_controller.search("entropy")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].title, "Thermodynamics")
+        self.assertIn("Entropy", results[0].snippet)
+        self.assertIsInstance(results[0].created_at, datetime)
+
+    def test_note_summaries_do_not_carry_content(self):
+        # Summaries expose length and preview instead of the whole content
+        self.note_controller.create_note(Note(title="Long", content="x" * 5000))
+        summary = self.note_controller.get_note_summaries(preview_length=10)[0]
+        self.assertEqual(summary.title, "Long")
+        self.assertEqual(summary.content_length, 5000)
+        self.assertEqual(summary.preview, "x" * 10)
+        self.assertFalse(hasattr(summary, "content"))
+
+    def test_note_content_is_cached(self):
+        # Opening a note twice reads its content once; updates keep the cache consistent
+        note_id = self.note_controller.create_note(Note(title="Cached", content="v1"))
+        original = self.note_controller.dao.get_note_content
+        calls = []
+        self.note_controller.dao.get_note_content = lambda i: calls.append(i) or original(i)
+
+        self.assertEqual(self.note_controller.get_note_content(note_id), "v1")
+        self.assertEqual(self.note_controller.get_note_content(note_id), "v1")
+        self.assertEqual(calls, [note_id])
+
+        self.note_controller.update_note(note_id, "v2")
+        self.assertEqual(self.note_controller.get_note_content(note_id), "v2")
+
+        self.note_controller.delete_note(note_id)
+        self.assertIsNone(self.note_controller.get_note_content(note_id))
+
+    def test_create_and_delete_notes_in_batch(self):
+        # Batch operations create and remove several notes at once
+        ids = self.note_controller.create_notes([Note(title="A"), Note(title="B")])
+        self.assertEqual(len(self.note_controller.get_all_notes()), 2)
+
+        self.note_controller.delete_notes(ids)
+        self.assertEqual(self.note_controller.get_all_notes(), [])
+
+    def test_changes_are_emitted_as_summaries(self):
+        # Note events carry summaries, the form shown by the notes list
+        events = []
+        self.note_controller.events.subscribe(events.append)
+        note_id = self.note_controller.create_note(Note(title="T", content="Body", created_at=datetime.now()))
+        self.note_controller.update_note(note_id, "New body")
+        self.assertEqual([e.kind for e in events], [CREATED, UPDATED])
+        self.assertEqual(events[1].items[0].preview, "New body")
+
+
+# ------------------------
+# LRUCache tests
+# ------------------------
+class TestScheduleIndex(unittest.TestCase):
+    def test_overlaps_within_a_day(self):
+        # Overlapping slots are found, touching ones are not, and a long slot is not missed
+        index = ScheduleIndex()
+        index.add(1, "2025-03-04", "08:00", "18:00")
+        index.add(2, "2025-03-04", "12:00", "13:00")
+        index.add(3, "2025-03-04", "14:00", "15:00")
+        index.add(4, "2025-03-05", "12:00", "13:00")
+        self.assertEqual(index.conflicts("2025-03-04", "12:30", "14:00"), [1, 2])
+        self.assertEqual(index.conflicts(date(2025, 3, 4), time(18, 0), time(19, 0)), [])
+        self.assertEqual(index.conflicts("2025-03-06", "12:00", "13:00"), [])
+
+    def test_replace_and_remove(self):
+        # Re-adding a task moves its slot; removing the longest slot shrinks the search window
+        index = ScheduleIndex()
+        index.add(1, "2025-03-04", "08:00", "18:00")
+        index.add(2, "2025-03-04", "12:00", "13:00")
+        index.add(1, "2025-03-05", "08:00", "09:00")
+        self.assertEqual(index.conflicts("2025-03-04", "09:00", "17:00"), [2])
+        index.remove(2)
+        index.add(1, None, None, None)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.conflicts("2025-03-04", "00:00", "23:59"), [])
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" becomes the least recently used
+        cache.put("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(maxsize=0)
+        cache.put("a", 1)
+        self.assertIsNone(cache.get("a"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,16 @@
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
+import os
+import tempfile
 import unittest
 from datetime import date, time
-from app.db.database import Database
+from app.db.database import Database, PROFILE_ENV_VAR
+from app.db.encoding import to_epoch_day, to_timestamp
+from app.db.change_detector import ChangeDetector
+from app.db.migrations import MIGRATIONS, get_schema_version, migrate
 from app.db.note_dao import NoteDAO
-from app.db.task_dao import TaskDAO
+from app.db.recurrence_dao import RecurrenceDAO
+from app.db.task_dao import TaskDAO, _SELECT_UNSCHEDULED
 from app.db.topic_dao import TopicDAO
 from app.model.note import Note
 from app.model.task import Task
@@ -136,13 +142,426 @@ class TestTaskDAO(BaseDAOTest):
 
         self.task_dao.set_time_slot(task_id, "2025-01-02", "12:00", "13:00")
         updated = self.task_dao.get_all_tasks()[0]
-        self.assertEqual(updated[6], "2025-01-02")
-        self.assertEqual(updated[7], "12:00")
+        self.assertEqual(updated[6], to_epoch_day("2025-01-02"))
+        self.assertEqual(updated[7], 12 * 60)
 
         self.task_dao.delete_task(task_id)
         all_tasks = self.task_dao.get_all_tasks()
         self.assertEqual(len(all_tasks), 0)
 
+    def test_get_tasks_between(self):
+        # Only tasks inside the range are returned, ordered by date and start time
+        self.task_dao.insert_tasks([
+            Task(description="before", priority=1, scheduled_date=date(2025, 1, 5), start_time=time(9, 0)),
+            Task(description="tue late", priority=1, scheduled_date=date(2025, 1, 7), start_time=time(15, 0)),
+            Task(description="mon", priority=1, scheduled_date=date(2025, 1, 6), start_time=time(9, 0)),
+            Task(description="tue early", priority=1, scheduled_date=date(2025, 1, 7), start_time=time(8, 0)),
+            Task(description="sun", priority=1, scheduled_date=date(2025, 1, 12), start_time=time(9, 0)),
+            Task(description="unscheduled", priority=1),
+        ])
+        rows = self.task_dao.get_tasks_between(date(2025, 1, 6), date(2025, 1, 12))
+        self.assertEqual([row[1] for row in rows], ["mon", "tue early", "tue late", "sun"])
+
+    def test_get_daily_load(self):
+        # Tasks are counted per day with their scheduled hours and completed count; empty days are omitted
+        ids = self.task_dao.insert_tasks([
+            Task(description="a", priority=1, scheduled_date=date(2025, 1, 6), start_time=time(9, 0), end_time=time(10, 30)),
+            Task(description="b", priority=1, scheduled_date=date(2025, 1, 6), start_time=time(14, 0), end_time=time(15, 0)),
+            Task(description="no slot", priority=1, scheduled_date=date(2025, 1, 8)),
+            Task(description="outside", priority=1, scheduled_date=date(2025, 1, 20), start_time=time(9, 0), end_time=time(10, 0)),
+        ])
+        self.task_dao.mark_completed(ids[0])
+        rows = self.task_dao.get_daily_load(date(2025, 1, 6), date(2025, 1, 12))
+        self.assertEqual([(row[0], row[1], row[3]) for row in rows],
+                         [(to_epoch_day("2025-01-06"), 2, 1), (to_epoch_day("2025-01-08"), 1, 0)])
+        self.assertAlmostEqual(rows[0][2], 2.5)
+        self.assertEqual(rows[1][2], 0)
+
+
+# ------------------------
+# Full-text search tests
+# ------------------------
+class TestNoteSearch(BaseDAOTest):
+    def test_search_ranks_title_matches_first(self):
+        # A match in the title outranks a match in the body
+        body_id = self.note_dao.insert_note(Note(title="Lecture 3", content="Notes about integrals and limits"))
+        title_id = self.note_dao.insert_note(Note(title="Integrals", content="Riemann sums"))
+        self.note_dao.insert_note(Note(title="History", content="Roman empire"))
+
+        rows = self.note_dao.search("integral")
+        self.assertEqual([row[0] for row in rows], [title_id, body_id])
+        self.assertIn("integrals", rows[1][4])
+
+    def test_index_follows_updates_and_deletes(self):
+        # Triggers keep the index in sync with the notes table
+        note_id = self.note_dao.insert_note(Note(title="Draft", content="photosynthesis"))
+        self.note_dao.update_note(note_id, "mitochondria")
+        self.assertEqual(self.note_dao.search("photosynthesis"), [])
+        self.assertEqual([row[0] for row in self.note_dao.search("mitochondria")], [note_id])
+
+        self.note_dao.delete_note(note_id)
+        self.assertEqual(self.note_dao.search("mitochondria"), [])
+
+    def test_query_syntax_characters_are_ignored(self):
+        # User input with FTS5 operators does not raise
+        self.note_dao.insert_note(Note(title="C++ basics", content="pointers: * and &"))
+        self.assertEqual(len(self.note_dao.search('c++ "pointers*')), 1)
+        self.assertEqual(self.note_dao.search("  ***  "), [])
+
+    def test_existing_notes_are_indexed_by_migration(self):
+        # Notes written before the index existed become searchable after migrating
+        for trigger in ("notes_fts_ai", "notes_fts_ad", "notes_fts_au"):
+            self.db.cursor.execute(f"DROP TRIGGER {trigger}")
+        self.db.cursor.execute("DROP TABLE notes_fts")
+        self.db.cursor.execute("INSERT INTO notes (title, content, created_at) VALUES ('Old', 'legacy text', '2024-01-01')")
+        self.db.cursor.execute("PRAGMA user_version = 2")
+        migrate(self.db.connection)
+        self.assertEqual(len(self.note_dao.search("legacy")), 1)
+
+
+# ------------------------
+# Bulk operation tests
+# ------------------------
+class TestBulkOperations(BaseDAOTest):
+    def test_insert_tasks_returns_ids_in_order(self):
+        # Tasks can be streamed from a generator; the returned ids match the stored rows
+        self.task_dao.insert_task(Task(description="existing", priority=1))
+        tasks = (Task(description=f"Task {i}", priority=1, scheduled_date=date(2025, 1, 1 + i)) for i in range(5))
+        ids = self.task_dao.insert_tasks(tasks)
+
+        rows = {row[0]: row for row in self.task_dao.get_all_tasks()}
+        self.assertEqual(len(ids), 5)
+        for i, task_id in enumerate(ids):
+            self.assertEqual(rows[task_id][1], f"Task {i}")
+            self.assertEqual(rows[task_id][6], to_epoch_day(f"2025-01-0{1 + i}"))
+
+    def test_insert_empty_iterable(self):
+        self.assertEqual(self.task_dao.insert_tasks([]), [])
+        self.assertEqual(self.note_dao.insert_notes([]), [])
+
+    def test_mark_completed_many_and_delete_many(self):
+        ids = self.task_dao.insert_tasks(Task(description=str(i), priority=1) for i in range(4))
+        self.assertEqual(self.task_dao.mark_completed_many(ids[:3]), 3)
+        self.assertEqual(self.task_dao.mark_notcompleted_many(ids[:1]), 1)
+        completed = {row[0]: row[5] for row in self.task_dao.get_all_tasks()}
+        self.assertEqual([completed[i] for i in ids], [0, 1, 1, 0])
+
+        self.assertEqual(self.task_dao.delete_many(ids[1:]), 3)
+        self.assertEqual([row[0] for row in self.task_dao.get_all_tasks()], ids[:1])
+
+    def test_insert_notes_and_delete_many(self):
+        ids = self.note_dao.insert_notes(Note(title=f"Note {i}", content="x") for i in range(3))
+        self.assertEqual([self.note_dao.get_note_by_id(i)[1] for i in ids], ["Note 0", "Note 1", "Note 2"])
+
+        self.note_dao.delete_many(ids)
+        self.assertEqual(self.note_dao.get_all_notes(), [])
+
+    def test_insert_topics_ignores_duplicates(self):
+        # Existing names are kept and their ids returned
+        self.topic_dao.insert_topic(Topic(name="Math"))
+        existing_id = self.topic_dao.get_topic_by_name("Math")[0]
+
+        ids = self.topic_dao.insert_topics([Topic(name="Physics"), Topic(name="Math")])
+        self.assertEqual(ids[1], existing_id)
+        self.assertEqual(len(self.topic_dao.get_all_topics()), 2)
+
+        self.topic_dao.delete_many(ids)
+        self.assertEqual(self.topic_dao.get_all_topics(), [])
+
+
+# ------------------------
+# Pagination and streaming tests
+# ------------------------
+class TestPagination(BaseDAOTest):
+    def test_tasks_keyset_pages_cover_all_rows(self):
+        # Walking the pages returns every task exactly once
+        ids = self.task_dao.insert_tasks(Task(description=str(i), priority=1) for i in range(7))
+        seen, after_id = [], None
+        while True:
+            page = self.task_dao.get_tasks_page(after_id, limit=3)
+            if not page:
+                break
+            self.assertLessEqual(len(page), 3)
+            seen.extend(row[0] for row in page)
+            after_id = page[-1][0]
+        self.assertEqual(seen, ids)
+
+    def test_notes_keyset_pages_newest_first(self):
+        # Notes sharing a timestamp are still paged without gaps or duplicates
+        from datetime import datetime
+        created = [datetime(2025, 1, 1), datetime(2025, 1, 2), datetime(2025, 1, 2), datetime(2025, 1, 3)]
+        ids = self.note_dao.insert_notes(Note(title=str(i), created_at=c) for i, c in enumerate(created))
+
+        first = self.note_dao.get_notes_page(limit=2)
+        second = self.note_dao.get_notes_page(first[-1][4], first[-1][0], limit=2)
+        self.assertEqual([row[0] for row in first + second], [ids[3], ids[2], ids[1], ids[0]])
+        self.assertEqual(self.note_dao.get_notes_page(second[-1][4], second[-1][0]), [])
+
+    def test_iterators_stream_in_chunks(self):
+        # Iterators yield every row even when it spans several chunks
+        self.task_dao.insert_tasks(Task(description=str(i), priority=1) for i in range(10))
+        self.note_dao.insert_notes(Note(title=str(i)) for i in range(5))
+        self.assertEqual(len(list(self.task_dao.iter_tasks(chunk_size=3))), 10)
+        self.assertEqual(len(list(self.note_dao.iter_notes(chunk_size=2))), 5)
+
+
+# ------------------------
+# Schema migration tests
+# ------------------------
+class TestMigrations(BaseDAOTest):
+    def _index_names(self):
+        self.db.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        return {row[0] for row in self.db.cursor.fetchall()}
+
+    def test_new_database_is_at_latest_version(self):
+        # A freshly created database has every migration applied
+        self.assertEqual(get_schema_version(self.db.connection), len(MIGRATIONS))
+
+    def test_unscheduled_query_uses_partial_index(self):
+        # The auto-scheduler's candidates are read in index order, without a sort
+        plan = " ".join(row[3] for row in self.db.cursor.execute("EXPLAIN QUERY PLAN " + _SELECT_UNSCHEDULED))
+        self.assertIn("idx_tasks_unscheduled", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_hot_path_indexes_exist(self):
+        # Indexes used by the planner and notes listing are created
+        names = self._index_names()
+        for index in ("idx_tasks_day", "idx_tasks_topic", "idx_tasks_completed", "idx_notes_created_ts"):
+            self.assertIn(index, names)
+
+    def test_legacy_database_is_upgraded_in_place(self):
+        # Simulate an old planner.db: no indexes and user_version 0
+        for index in self._index_names():
+            if index.startswith("idx_"):
+                self.db.cursor.execute(f"DROP INDEX {index}")
+        self.db.cursor.execute("PRAGMA user_version = 0")
+
+        version = migrate(self.db.connection)
+        self.assertEqual(version, len(MIGRATIONS))
+        self.assertIn("idx_tasks_day", self._index_names())
+
+    def test_text_dates_are_converted_to_integers(self):
+        # Rows written before the integer columns existed are filled in and found by the range queries
+        self.db.cursor.execute(
+            "INSERT INTO tasks (description, priority, scheduled_date, start_time, end_time) "
+            "VALUES ('legacy', 1, '2025-01-07', '9:30', '11:00:00')")
+        self.db.cursor.execute("INSERT INTO notes (title, content, created_at) VALUES ('Old', '', '2024-01-01T08:15:00')")
+        self.db.cursor.execute(f"PRAGMA user_version = {len(MIGRATIONS) - 2}")
+        log_size = self.db.cursor.execute("SELECT COUNT(*) FROM change_log").fetchone()[0]
+        migrate(self.db.connection)
+        # The backfill is not a change other instances need to hear about
+        self.assertEqual(self.db.cursor.execute("SELECT COUNT(*) FROM change_log").fetchone()[0], log_size)
+
+        rows = self.task_dao.get_tasks_between(date(2025, 1, 6), date(2025, 1, 12))
+        self.assertEqual([row[6:9] for row in rows], [(to_epoch_day("2025-01-07"), 570, 660)])
+        self.assertEqual(self.note_dao.get_all_notes()[0][4], to_timestamp("2024-01-01T08:15:00"))
+
+    def test_text_only_writes_fill_integer_columns(self):
+        # Other processes write just the TEXT columns; triggers derive the integer ones
+        self.db.cursor.execute(
+            "INSERT INTO tasks (description, priority, scheduled_date, start_time, end_time) "
+            "VALUES ('script', 1, '2025-01-07', '09:00', '10:00')")
+        moved = self.db.cursor.execute("INSERT INTO tasks (description, priority) VALUES ('open', 2)").lastrowid
+        self.db.cursor.execute("INSERT INTO notes (title, content, created_at) VALUES ('Script', '', '2025-01-07 08:00:00')")
+        self.db.connection.commit()
+
+        self.assertEqual([row[1] for row in self.task_dao.get_unscheduled_tasks()], [2])
+        self.db.cursor.execute("UPDATE tasks SET scheduled_date = '2025-01-08' WHERE id = ?", (moved,))
+        rows = self.task_dao.get_tasks_between(date(2025, 1, 6), date(2025, 1, 12))
+        self.assertEqual([row[1] for row in rows], ["script", "open"])
+        self.assertEqual(rows[0][6:9], (to_epoch_day("2025-01-07"), 540, 600))
+        self.assertEqual(self.task_dao.get_unscheduled_tasks(), [])
+        self.assertEqual(self.note_dao.get_all_notes()[0][4], to_timestamp("2025-01-07 08:00:00"))
+
+    def test_recurrence_dates_are_integers(self):
+        # Rules and overrides written through their TEXT columns are found by the integer range queries
+        task_id = self.task_dao.insert_task(Task(description="Lecture", priority=1, scheduled_date=date(2025, 1, 6)))
+        self.db.cursor.execute(
+            "INSERT INTO task_recurrences (task_id, frequency, until) VALUES (?, 'weekly', '2025-01-31')", (task_id,))
+        self.db.cursor.execute(
+            "INSERT INTO task_overrides (task_id, occurrence_date, scheduled_date, start_time, end_time) "
+            "VALUES (?, '2025-01-13', '2025-02-03', '14:00', '15:30')", (task_id,))
+        self.db.connection.commit()
+
+        recurrences = RecurrenceDAO()
+        series = recurrences.get_series_between(date(2025, 1, 27), date(2025, 2, 2))
+        self.assertEqual([(row[5], row[3]) for row in series], [(task_id, to_epoch_day("2025-01-31"))])
+        self.assertEqual(recurrences.get_series_between(date(2025, 2, 10), date(2025, 2, 16)), [])
+        # The moved occurrence is found from the week it was moved to
+        self.assertEqual(recurrences.get_overrides_between(date(2025, 2, 3), date(2025, 2, 9)),
+                         [(task_id, to_epoch_day("2025-01-13"), 0, None, to_epoch_day("2025-02-03"), 840, 930)])
+
+    def test_migrate_is_idempotent(self):
+        # Running the migrations again is a no-op
+        self.assertEqual(migrate(self.db.connection), len(MIGRATIONS))
+        self.db.cursor.execute("PRAGMA user_version = 0")
+        self.assertEqual(migrate(self.db.connection), len(MIGRATIONS))
+
+
+# ------------------------
+# Transaction tests
+# ------------------------
+class TestTransaction(BaseDAOTest):
+    def test_commit_is_deferred_inside_transaction(self):
+        # DAO writes inside a block stay uncommitted until the block exits
+        with self.db.transaction():
+            self.task_dao.insert_task(Task(description="A", priority=1))
+            self.assertTrue(self.db.in_transaction)
+            self.assertTrue(self.db.connection.in_transaction)
+        self.assertFalse(self.db.in_transaction)
+        self.assertFalse(self.db.connection.in_transaction)
+        self.assertEqual(len(self.task_dao.get_all_tasks()), 1)
+
+    def test_exception_rolls_back_everything(self):
+        # A failure inside the block undoes all of its statements
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.task_dao.insert_task(Task(description="A", priority=1))
+                self.task_dao.insert_task(Task(description="B", priority=1))
+                raise RuntimeError("boom")
+        self.assertEqual(len(self.task_dao.get_all_tasks()), 0)
+
+    def test_nested_transaction_uses_savepoint(self):
+        # An inner failure only rolls back the inner block
+        with self.db.transaction():
+            self.task_dao.insert_task(Task(description="outer", priority=1))
+            with self.assertRaises(RuntimeError):
+                with self.db.transaction():
+                    self.task_dao.insert_task(Task(description="inner", priority=1))
+                    raise RuntimeError("boom")
+        tasks = self.task_dao.get_all_tasks()
+        self.assertEqual([row[1] for row in tasks], ["outer"])
+
+    def test_after_commit_callbacks_wait_for_the_outer_commit(self):
+        # Callbacks run after the outermost commit; those of rolled back blocks are dropped
+        calls = []
+        self.db.after_commit(lambda: calls.append("now"))
+        with self.db.transaction():
+            self.db.after_commit(lambda: calls.append("outer"))
+            with self.db.transaction():
+                self.db.after_commit(lambda: calls.append("released"))
+            with self.assertRaises(RuntimeError):
+                with self.db.transaction():
+                    self.db.after_commit(lambda: calls.append("rolled back"))
+                    raise RuntimeError("boom")
+            self.assertEqual(calls, ["now"])
+        self.assertEqual(calls, ["now", "outer", "released"])
+
+
+# ------------------------
+# Cross-process change detection tests
+# ------------------------
+class TestChangeDetector(unittest.TestCase):
+    def setUp(self):
+        # Two connections to the same file stand for two processes
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp_dir.name, "planner.db")
+        self.db = Database(path)
+        self.other = Database(path)
+        self.detector = ChangeDetector(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        self.other.close()
+        self.tmp_dir.cleanup()
+
+    def _write(self, sql, params=()):
+        # Commit a change through the other connection
+        with self.other.transaction():
+            self.other.cursor.execute(sql, params)
+        return self.other.cursor.lastrowid
+
+    def test_nothing_changed(self):
+        self.assertEqual(self.detector.poll(), {})
+
+    def test_changes_of_other_connection_are_reported(self):
+        # Only the changed rows are reported, with the last operation on each row deciding
+        kept = self._write("INSERT INTO tasks (description, priority) VALUES ('A', 1)")
+        removed = self._write("INSERT INTO tasks (description, priority) VALUES ('B', 1)")
+        self._write("DELETE FROM tasks WHERE id = ?", (removed,))
+        topic = self._write("INSERT INTO topics (name) VALUES ('Math')")
+
+        changes = self.detector.poll()
+        self.assertEqual(changes["tasks"].changed, {kept})
+        self.assertEqual(changes["tasks"].deleted, {removed})
+        self.assertEqual(changes["topics"].changed, {topic})
+        self.assertNotIn("notes", changes)
+        # Already reported changes are not reported again
+        self.assertEqual(self.detector.poll(), {})
+
+    def test_pruned_log_requests_reload(self):
+        # If entries not yet seen were pruned, the detector cannot tell which rows changed
+        for name in ("a", "b", "c"):
+            self._write("INSERT INTO topics (name) VALUES (?)", (name,))
+        ChangeDetector(self.other).prune(keep=1)
+        changes = self.detector.poll()
+        self.assertTrue(changes["tasks"].reload)
+        self.assertTrue(changes["topics"].reload)
+
+    def test_own_changes_are_skipped_and_pruned(self):
+        # Quiet polls move past the entries of this process and keep the log bounded
+        self.detector.CATCH_UP_POLLS = 2
+        self.detector.MAX_LOG_ENTRIES = 5
+        for i in range(20):
+            with self.db.transaction():
+                self.db.cursor.execute("INSERT INTO topics (name) VALUES (?)", (f"own {i}",))
+            self.assertEqual(self.detector.poll(), {})
+        self.assertEqual(self.detector.last_seq, self.detector._max_seq())
+        self.assertLess(self.db.connection.execute("SELECT COUNT(*) FROM change_log").fetchone()[0], 10)
+
+        # The next change of another process is reported alone
+        topic = self._write("INSERT INTO topics (name) VALUES ('Math')")
+        self.assertEqual(self.detector.poll()["topics"].changed, {topic})
+
+
+# ------------------------
+# Performance profile tests
+# ------------------------
+class TestDatabaseProfiles(unittest.TestCase):
+    def setUp(self):
+        # WAL needs a real file, so each test gets its own temporary database
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "planner.db")
+        self.databases = []
+
+    def tearDown(self):
+        for db in self.databases:
+            db.close()
+        self.tmp_dir.cleanup()
+
+    def open(self, *args, **kwargs):
+        db = Database(self.path, *args, **kwargs)
+        self.databases.append(db)
+        return db
+
+    def test_balanced_profile_is_default(self):
+        # Default profile uses WAL with synchronous=NORMAL (1)
+        db = self.open()
+        self.assertEqual(db.profile, "balanced")
+        self.assertEqual(db.pragmas["journal_mode"], "wal")
+        self.assertEqual(db.pragmas["synchronous"], 1)
+
+    def test_durable_profile(self):
+        # Durable profile keeps the rollback journal and a full fsync (2)
+        db = self.open(profile="durable")
+        self.assertEqual(db.pragmas["journal_mode"], "delete")
+        self.assertEqual(db.pragmas["synchronous"], 2)
+
+    def test_profile_from_environment_and_overrides(self):
+        # The environment picks the preset, keyword arguments override single pragmas
+        os.environ[PROFILE_ENV_VAR] = "fast"
+        try:
+            db = self.open(cache_size=-4000)
+        finally:
+            del os.environ[PROFILE_ENV_VAR]
+        self.assertEqual(db.profile, "fast")
+        self.assertEqual(db.pragmas["synchronous"], 0)
+        self.assertEqual(db.pragmas["cache_size"], -4000)
+
+    def test_unknown_profile_raises(self):
+        with self.assertRaises(ValueError):
+            self.open(profile="turbo")
+
 
 if __name__ == "__main__":
     unittest.main()
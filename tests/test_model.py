@@ -1,23 +1,40 @@
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 import unittest
+from unittest.mock import patch
+import pytest
 from datetime import date, time, datetime
-from app.model.topic import Topic
+from app.model.topic import Topic, intern_topic
 from app.model.task import Task
 from app.model.note import Note
+from app.model.recurrence import Recurrence, DAILY, WEEKLY
+from app.model.task_occurrence import TaskOccurrence
+from app.model import task_table
+from app.model.task_table import TaskTable
 
 
 # ---------------- Topic model tests ----------------
 class TestTopic(unittest.TestCase):
-    def setUp(self):
-        Topic._id_counter = 1  # reset counter for consistent IDs
-
-    def test_topic_creation_with_auto_id(self):
-        # Should auto-increment id if not provided
+    def test_topic_without_id_until_stored(self):
+        # The id is assigned by the database, so a new topic has none
         topic = Topic(name="Math")
-        self.assertEqual(topic.id, 1)
+        self.assertIsNone(topic.id)
         self.assertEqual(topic.name, "Math")
 
+    def test_topic_is_slotted(self):
+        # Models have no per-instance __dict__
+        topic = Topic(id=1, name="Math")
+        self.assertFalse(hasattr(topic, "__dict__"))
+        with self.assertRaises(AttributeError):
+            topic.color = "red"
+
+    def test_intern_topic_shares_instances(self):
+        # Rows of one load share one Topic per topic ID
+        topics = {}
+        first = intern_topic(topics, 3, "Math")
+        self.assertIs(intern_topic(topics, 3, "Math"), first)
+        self.assertIsNot(intern_topic(topics, 4, "Physics"), first)
+
     def test_topic_creation_with_custom_id(self):
         # Should accept custom id
         topic = Topic(id=99, name="Science")
@@ -32,13 +49,11 @@ class TestTopic(unittest.TestCase):
 
 # ---------------- Task model tests ----------------
 class TestTask(unittest.TestCase):
-    def setUp(self):
-        Task._id_counter = 1  # reset counter
-    
-    def test_task_creation_with_auto_id(self):
-        # Should auto-increment id if not provided
+    def test_task_without_id_until_stored(self):
+        # The id is assigned by the database, so a new task has none
         task = Task()
-        self.assertEqual(task.id, 1)
+        self.assertIsNone(task.id)
+        self.assertFalse(hasattr(task, "__dict__"))
         self.assertEqual(task.description, "")
         self.assertFalse(task.is_completed)
 
@@ -74,13 +89,10 @@ class TestTask(unittest.TestCase):
 
 # ---------------- Note model tests ----------------
 class TestNote(unittest.TestCase):
-    def setUp(self):
-        Note._id_counter = 1  # reset counter
-
-    def test_note_creation_with_auto_id(self):
-        # Should auto-increment id if not provided
+    def test_note_without_id_until_stored(self):
+        # The id is assigned by the database, so a new note has none
         note = Note(title="My first note")
-        self.assertEqual(note.id, 1)
+        self.assertIsNone(note.id)
         self.assertEqual(note.title, "My first note")
         self.assertEqual(note.content, "")
 
@@ -106,5 +118,100 @@ class TestNote(unittest.TestCase):
         self.assertIn("Note(id=", result)
 
 
+# ---------------- Recurrence model tests ----------------
+class TestRecurrence(unittest.TestCase):
+    def test_daily_with_interval_jumps_to_range(self):
+        # Every second day from March 1st; only the dates of the range are generated
+        rule = Recurrence(DAILY, interval=2)
+        days = list(rule.occurrences(date(2025, 3, 1), date(2025, 6, 2), date(2025, 6, 8)))
+        self.assertEqual(days, [date(2025, 6, 3), date(2025, 6, 5), date(2025, 6, 7)])
+
+    def test_weekly_on_given_weekdays_until(self):
+        # Mondays and Wednesdays, starting on a Wednesday, ending on the 12th
+        rule = Recurrence(WEEKLY, weekdays=(0, 2), until=date(2025, 3, 12))
+        days = list(rule.occurrences(date(2025, 3, 5), date(2025, 3, 1), date(2025, 3, 31)))
+        self.assertEqual(days, [date(2025, 3, 5), date(2025, 3, 10), date(2025, 3, 12)])
+
+    def test_count_includes_occurrences_before_range(self):
+        # Five weekly occurrences from March 3rd; the range only sees the last two
+        rule = Recurrence(WEEKLY, count=5)
+        days = list(rule.occurrences(date(2025, 3, 3), date(2025, 3, 24), date(2025, 12, 31)))
+        self.assertEqual(days, [date(2025, 3, 24), date(2025, 3, 31)])
+
+    def test_weekday_mask_round_trip(self):
+        rule = Recurrence(WEEKLY, weekdays=(4, 0))
+        self.assertEqual(rule.weekday_mask, 0b10001)
+        self.assertEqual(Recurrence.weekdays_from_mask(rule.weekday_mask), (0, 4))
+
+    def test_occurrence_inherits_series(self):
+        # An occurrence copies its series and is keyed by (ID, date)
+        series = Task(id=4, description="Lecture", topic=Topic(id=1, name="Math"), priority=2,
+                      scheduled_date=date(2025, 3, 3), start_time=time(9, 0), end_time=time(11, 0),
+                      recurrence=Recurrence(WEEKLY))
+        occurrence = TaskOccurrence(series, date(2025, 3, 10), start_time=time(10, 0))
+        self.assertEqual((occurrence.id, occurrence.key), (4, (4, date(2025, 3, 10))))
+        self.assertEqual((occurrence.start_time, occurrence.end_time), (time(10, 0), time(11, 0)))
+        self.assertTrue(occurrence.is_override)
+        self.assertEqual(series.key, 4)
+
+
+# ---------------- TaskTable tests ----------------
+class TestTaskTable(unittest.TestCase):
+    def setUp(self):
+        march_3, march_4 = date(2025, 3, 3).toordinal(), date(2025, 3, 4).toordinal()
+        self.table = TaskTable.from_rows([
+            (1, 1, 2, 0, march_3, 9 * 60, 11 * 60),
+            (2, 1, 1, 1, march_3, 14 * 60, 15 * 60),
+            (3, 2, 2, 0, march_4, -1, -1),
+            (4, 0, 3, 0, 0, -1, -1),
+        ])
+
+    def test_columns_are_typed_arrays(self):
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(self.table.ids.typecode, "q")
+        self.assertEqual(list(self.table.priorities), [2, 1, 2, 3])
+
+    def test_filters_combine(self):
+        self.assertEqual(list(self.table.indices(topic_id=1)), [0, 1])
+        self.assertEqual(self.table.count(priority=2, completed=False), 2)
+        self.assertEqual(self.table.count(end_date=date(2025, 3, 31)), 3)  # the unscheduled task is left out
+        self.assertEqual(list(self.table.select(start_date=date(2025, 3, 4)).ids), [3])
+
+    def test_aggregates(self):
+        self.assertEqual(self.table.group_counts("priorities", completed=False), {2: 2, 3: 1})
+        self.assertEqual(self.table.counts_by_day(), {date(2025, 3, 3): 2, date(2025, 3, 4): 1})
+        self.assertEqual(self.table.scheduled_minutes(), 180)
+        self.assertEqual(self.table.scheduled_minutes(completed=False), 120)
+
+    def test_numpy_path_matches_array_path(self):
+        # The masked NumPy filters give the same answers as the plain array loops
+        numpy = pytest.importorskip("numpy")
+        queries = [{}, {"topic_id": 1}, {"priority": 2, "completed": False}, {"end_date": date(2025, 3, 31)},
+                   {"start_date": date(2025, 3, 4)}, {"completed": True, "topic_id": 2}]
+
+        def answers():
+            results = []
+            for filters in queries:
+                results.append((
+                    [int(i) for i in self.table.indices(**filters)],
+                    list(self.table.select(**filters).ids),
+                    self.table.count(**filters),
+                    self.table.group_counts("priorities", **filters),
+                    self.table.counts_by_day(**filters),
+                    self.table.scheduled_minutes(**filters),
+                ))
+            return results
+
+        with patch.object(task_table, "np", numpy):
+            with_numpy = answers()
+            self.assertEqual(TaskTable.from_rows([]).scheduled_minutes(), 0)
+        with patch.object(task_table, "np", None):
+            self.assertEqual(with_numpy, answers())
+
+    def test_empty_table(self):
+        table = TaskTable.from_rows([])
+        self.assertEqual((len(table), table.count(topic_id=1), table.counts_by_day()), (0, 0, {}))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import random
+from app.view.planner_layout import assign_lanes, layout_day
+
+# ------------------------
+# Lane assignment tests
+# ------------------------
+class TestAssignLanes(unittest.TestCase):
+    def test_disjoint_intervals_use_one_lane(self):
+        placements = assign_lanes([("a", 0, 60), ("b", 60, 120), ("c", 200, 210)])
+        self.assertEqual([(p.lane, p.lanes) for p in placements], [(0, 1), (0, 1), (0, 1)])
+
+    def test_overlapping_intervals_get_side_by_side_lanes(self):
+        placements = {p.key: p for p in assign_lanes([("a", 0, 60), ("b", 30, 90), ("c", 60, 120)])}
+        # a and c do not overlap, so c reuses the lane of a; the cluster needs two lanes
+        self.assertEqual((placements["a"].lane, placements["b"].lane, placements["c"].lane), (0, 1, 0))
+        self.assertTrue(all(p.lanes == 2 for p in placements.values()))
+
+    def test_clusters_are_sized_independently(self):
+        placements = {p.key: p for p in assign_lanes([("a", 0, 60), ("b", 0, 60), ("c", 0, 60), ("d", 120, 180)])}
+        self.assertEqual(placements["a"].lanes, 3)
+        self.assertEqual((placements["d"].lane, placements["d"].lanes), (0, 1))
+
+    def test_no_two_overlapping_intervals_share_a_lane(self):
+        # Randomized check of the colouring against a brute force overlap test
+        rng = random.Random(7)
+        intervals = []
+        for key in range(300):
+            start = rng.randrange(0, 1400)
+            intervals.append((key, start, start + rng.randrange(10, 180)))
+        placements = assign_lanes(intervals)
+        for i, p in enumerate(placements):
+            self.assertLess(p.lane, p.lanes)
+            for q in placements[i + 1:]:
+                if p.start < q.end and q.start < p.end:
+                    self.assertNotEqual(p.lane, q.lane)
+                    self.assertEqual(p.lanes, q.lanes)
+
+
+# ------------------------
+# Rectangle layout tests
+# ------------------------
+class TestLayoutDay(unittest.TestCase):
+    def test_rectangles_split_the_column(self):
+        rects = {r.key: r for r in layout_day([("a", 0, 60), ("b", 30, 90)], x=100, width=80,
+                                               top=1000, px_per_unit=1.0, gap=0)}
+        self.assertEqual((rects["a"].x, rects["a"].width), (100, 40))
+        self.assertEqual((rects["b"].x, rects["b"].width), (140, 40))
+        # y grows upwards: the block ends lower than it starts
+        self.assertEqual((rects["b"].y, rects["b"].height), (910, 60))
+
+    def test_single_task_takes_the_full_width(self):
+        (rect,) = layout_day([("a", 540, 600)], x=0, width=120, top=1170, px_per_unit=50 / 60)
+        self.assertEqual(rect.width, 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import time as timer
+from datetime import date, time
+from app.controller.scheduler import free_intervals, plan, DEFAULT_TASK_MINUTES
+
+# Monday 2025-03-03 to Sunday 2025-03-09
+MONDAY = date(2025, 3, 3)
+SUNDAY = date(2025, 3, 9)
+MORNINGS = {weekday: [(time(9, 0), time(12, 0))] for weekday in range(5)}
+
+# ------------------------
+# Free interval tests
+# ------------------------
+class TestFreeIntervals(unittest.TestCase):
+    def test_busy_slots_are_cut_out_of_windows(self):
+        free = free_intervals([(540, 720), (840, 1080)], [(600, 660), (700, 900)])
+        self.assertEqual(free, [(540, 600), (660, 700), (900, 1080)])
+
+    def test_busy_outside_windows_is_ignored(self):
+        self.assertEqual(free_intervals([(540, 720)], [(0, 480), (800, 900)]), [(540, 720)])
+
+
+# ------------------------
+# Planning tests
+# ------------------------
+class TestPlan(unittest.TestCase):
+    def test_higher_priority_gets_earlier_slot(self):
+        assignments = plan([(1, 1, 60), (2, 3, 60)], {}, MONDAY, SUNDAY, MORNINGS)
+        self.assertEqual(assignments, [(2, MONDAY, 540, 600), (1, MONDAY, 600, 660)])
+
+    def test_existing_slots_are_respected(self):
+        busy = {MONDAY: [(540, 690)]}
+        assignments = plan([(1, 2, 60), (2, 2, 30)], busy, MONDAY, SUNDAY, MORNINGS)
+        self.assertEqual(assignments, [(1, date(2025, 3, 4), 540, 600), (2, MONDAY, 690, 720)])
+
+    def test_missing_estimate_uses_default_and_weekend_is_free(self):
+        assignments = plan([(1, 1, None)], {}, date(2025, 3, 8), SUNDAY, MORNINGS)
+        self.assertEqual(assignments, [])
+        ((_, day, start, end),) = plan([(1, 1, None)], {}, MONDAY, SUNDAY, MORNINGS)
+        self.assertEqual(end - start, DEFAULT_TASK_MINUTES)
+
+    def test_not_before_skips_past_time(self):
+        assignments = plan([(1, 1, 60)], {}, MONDAY, SUNDAY, MORNINGS, not_before=(MONDAY, 11 * 60 + 30))
+        self.assertEqual(assignments, [(1, date(2025, 3, 4), 540, 600)])
+
+    def test_hundreds_of_tasks_over_weeks_are_fast(self):
+        tasks = [(i, i % 3 + 1, 30 + (i % 4) * 30) for i in range(600)]
+        started = timer.perf_counter()
+        assignments = plan(tasks, {}, MONDAY, date(2025, 4, 27), None)
+        self.assertLess(timer.perf_counter() - started, 0.5)
+        # No two assignments overlap
+        slots = sorted((day, start, end) for _, day, start, end in assignments)
+        for (day_a, _, end_a), (day_b, start_b, _) in zip(slots, slots[1:]):
+            self.assertTrue(day_a != day_b or end_a <= start_b)
+        self.assertGreater(len(assignments), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,19 +22,29 @@ from unittest.mock import MagicMock
 from app.model.task import Task
 from app.model.topic import Topic
 from app.model.note import Note
+from app.model.note_search_result import NoteSearchResult
+from app.model.note_summary import NoteSummary
+from app.model.day_load import DayLoad
+from app.model.recurrence import Recurrence
+from app.model.task_occurrence import TaskOccurrence
 from app.view.task_screen import TaskScreen
 from app.view.planner_screen import PlannerScreen
 from app.view.notes_screen import NotesScreen
 from app.view.notebook_screen import NotebookScreen
 from app.view.pomodoro_screen import PomodoroScreen
+from app.view.overview_screen import OverviewScreen
+from app.view.load_heatmap import LoadHeatmap
 from app.view.note_item import NoteItem
+from app.view.topic_item import TopicItem
 from app.view.task_item import TaskItem
 from app.view.add_task_popup import AddTaskPopup
 from app.view.add_topic_popup import AddTopicPopup
 from app.view.schedule_popup import SchedulePopup
+from app.view.occurrence_popup import OccurrencePopup
 from app.view.add_note_popup import AddNotePopup
 from app.view.manage_topics_popup import ManageTopicsPopup
-from datetime import datetime
+from app.controller.events import ChangeEvent, EventBus, CREATED, UPDATED, DELETED
+from datetime import date, datetime, time, timedelta
 
 # ----------------------------
 # Base class for GUI test cases
@@ -87,19 +97,24 @@ class FakeApp(MDApp):
         # Mocking all controllers required by any component
         
         # Task Controller Mock
+        sample_tasks = lambda: [
+            Task(
+                id=1,
+                description="Test task",
+                topic=None,
+                priority=1,
+                is_completed=False,
+                scheduled_date=None,
+                start_time=None,
+                end_time=None
+            )
+        ]
         self.task_controller = SimpleNamespace(
-            get_all_tasks=lambda: [
-                Task(
-                    id=1,
-                    description="Test task",
-                    topic=None,
-                    priority=1,
-                    is_completed=False,
-                    scheduled_date=None,
-                    start_time=None,
-                    end_time=None
-                )
-            ],
+            get_all_tasks=sample_tasks,
+            iter_tasks=lambda chunk_size=500: iter(sample_tasks()),
+            get_tasks_between=lambda start_date, end_date: [],
+            get_daily_load=lambda start_date, end_date: [],
+            find_conflicts=lambda scheduled_date, start_time, end_time, exclude_id=None: [],
             create_task=lambda task: 123,
             #update_task=MagicMock(),
         )
@@ -117,6 +132,9 @@ class FakeApp(MDApp):
         self.note_controller = SimpleNamespace(
             get_all_notes=lambda: [Note(id=1, title="Note A", topic=None, content="", created_at=datetime.now())],
             get_note_by_id=lambda note_id: Note(id=note_id, title="Note C", topic=None, content="Hello", created_at=datetime.now()),
+            get_note_summaries=lambda: [NoteSummary(id=1, title="Note A", topic=None, created_at=datetime.now(), content_length=5, preview="Hello")],
+            get_note_content=lambda note_id: "Hello",
+            search=lambda query, limit=20: [NoteSearchResult(id=3, title="Found", created_at=datetime.now(), snippet="...match...")],
             delete_note=lambda note_id: setattr(self, "deleted", note_id),
             create_note=MagicMock(),
             update_note=lambda note_id, content: setattr(self, "updated", (note_id, content))
@@ -139,12 +157,33 @@ class TestTaskScreen(GUITestCase):
         self.app.sm.get_screen.return_value = self.task_screen
 
         # Mock ids of TaskScreen for testing layout manipulation
-        self.task_screen.ids = {"task_list": BoxLayout()}
+        self.task_screen.ids = {"task_list": SimpleNamespace(data=[])}
+
+    def test_load_tasks_fills_recycleview_data(self):
+        # Verify that after loading tasks, the RecycleView receives one data dict per task
+        self.task_screen.load_tasks()
+        data = self.task_screen.ids["task_list"].data
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["task_id"], "1")
+        self.assertEqual(data[0]["priority"], "Low")
 
-    def test_load_tasks_adds_widgets(self):
-        # Verify that after loading tasks, the task_list container has task widgets added
+    def test_task_events_patch_only_affected_rows(self):
+        # Change events upsert or drop single rows instead of reloading the list
         self.task_screen.load_tasks()
-        self.assertGreater(len(self.task_screen.ids["task_list"].children), 0)
+        rows = self.task_screen.ids["task_list"].data
+        untouched = rows[0]
+        created = Task(id=2, description="New", priority=3)
+        self.task_screen.on_task_changed(ChangeEvent(CREATED, "task", [2], [created]))
+        self.task_screen.on_task_changed(ChangeEvent(CREATED, "task", [2], [created]))
+        self.assertEqual([row["task_id"] for row in rows], ["1", "2"])
+        self.assertIs(rows[0], untouched)
+
+        updated = Task(id=2, description="New", priority=3, is_completed=True)
+        self.task_screen.on_task_changed(ChangeEvent(UPDATED, "task", [2], [updated]))
+        self.assertTrue(self.task_screen.ids["task_list"].data[1]["is_completed"])
+
+        self.task_screen.on_task_changed(ChangeEvent(DELETED, "task", [1]))
+        self.assertEqual([row["task_id"] for row in self.task_screen.ids["task_list"].data], ["2"])
 
 # ----------------------------
 # Tests for AddTaskPopup
@@ -195,6 +234,67 @@ class TestAddTaskPopup(GUITestCase):
         self.assertEqual(self.popup.ids.error_label.text, "")
         self.assertFalse(self.popup.ids.add_btn.disabled)
 
+    def test_repeat_needs_date_and_time(self):
+        # A repeating task cannot be added without the slot of its first occurrence
+        self.popup.ids.desc_input.text = "Lecture"
+        self.popup.ids.priority_spinner.text = "High"
+        self.popup.set_repeat("Weekly")
+        self.assertEqual(self.popup.ids.error_label.text, "Repeating tasks need a date and a time")
+        self.assertTrue(self.popup.ids.add_btn.disabled)
+        self.popup.set_repeat("Does not repeat")
+        self.assertFalse(self.popup.ids.add_btn.disabled)
+
+    def test_repeat_inputs_build_the_recurrence(self):
+        # Interval, weekdays, end date and number of occurrences feed the Recurrence of the series
+        self.popup.ids["interval_input"] = SimpleNamespace(text="2")
+        self.popup.ids["count_input"] = SimpleNamespace(text="")
+        self.popup.ids.desc_input.text = "Lecture"
+        self.popup.ids.priority_spinner.text = "High"
+        self.popup.selected_date, self.popup.start_time, self.popup.end_time = "2025-01-06", "09:00", "10:00"
+        self.popup.set_repeat("Weekly")
+        self.popup.toggle_weekday(3, True)
+        self.popup.toggle_weekday(0, True)
+        self.popup.repeat_until = "2025-03-31"
+        recurrence = self.popup.build_recurrence()
+        self.assertEqual((recurrence.frequency, recurrence.interval, recurrence.weekdays, recurrence.until, recurrence.count),
+                         ("weekly", 2, (0, 3), date(2025, 3, 31), None))
+
+        self.popup.ids["count_input"].text = "0"
+        self.popup.validate_inputs()
+        self.assertEqual(self.popup.ids.error_label.text, "Occurrences: enter a whole number of 1 or more")
+        self.assertTrue(self.popup.ids.add_btn.disabled)
+        self.popup.ids["count_input"].text = "10"
+        self.popup.repeat_until = "2024-12-31"
+        self.popup.validate_inputs()
+        self.assertEqual(self.popup.ids.error_label.text, "The repeat end date is before the first date")
+
+        # Weekdays only apply to weekly tasks
+        self.popup.repeat_until = ""
+        self.popup.set_repeat("Daily")
+        self.assertFalse(self.popup.ids.add_btn.disabled)
+        self.assertEqual(self.popup.build_recurrence().weekdays, ())
+        self.assertEqual(self.popup.build_recurrence().count, 10)
+
+    def test_overlapping_slot_shows_warning(self):
+        # A slot overlapping scheduled tasks is reported, but the task can still be added
+        # Conflicts are looked up when the slot changes, not on every keystroke of the description
+        lookups = []
+        self.app.task_controller.find_conflicts = lambda scheduled_date, start_time, end_time, exclude_id=None: \
+            lookups.append(scheduled_date) or [Task(id=5, description="Lecture", priority=1)]
+        self.popup.ids.desc_input.text = "Test task"
+        self.popup.ids.priority_spinner.text = "High"
+        self.popup.selected_date, self.popup.start_time = "2025-01-01", "09:00"
+        end_dialog = SimpleNamespace(time=time(10, 0), dismiss=lambda *args: None)
+        self.popup.set_time(end_dialog, "end", SimpleNamespace(text=""))
+        self.assertEqual(self.popup.ids.error_label.text, "Overlaps with: Lecture")
+        self.assertFalse(self.popup.ids.add_btn.disabled)
+
+        for text in ("Test task 2", "Test task 23"):
+            self.popup.ids.desc_input.text = text
+            self.popup.validate_inputs()
+        self.assertEqual(self.popup.ids.error_label.text, "Overlaps with: Lecture")
+        self.assertEqual(lookups, ["2025-01-01"])
+
 
 # ----------------------------
 # Tests for TaskItem
@@ -209,6 +309,16 @@ class TestTaskItem(GUITestCase):
         item = TaskItem(task)
         self.assertEqual(item.priority, "Medium")
 
+    def test_recycled_item_shows_new_row(self):
+        # Reusing an item for another row replaces its data without touching the database
+        self.app.task_controller.mark_completed = MagicMock()
+        item = TaskItem(Task(id=1, description="First", priority=1))
+        data = TaskItem.data_from_task(Task(id=2, description="Second", priority=3, is_completed=True))
+        item.refresh_view_attrs(SimpleNamespace(data=[data]), 0, data)
+        self.assertEqual((item.task_id, item.description, item.priority), ("2", "Second", "High"))
+        self.assertTrue(item.is_completed)
+        self.app.task_controller.mark_completed.assert_not_called()
+
     def test_checkbox_marks_completed(self):
         # Simulate checking the box and verify that completion state is updated
         task = Task(description="Test", priority=1, is_completed=False)
@@ -216,6 +326,14 @@ class TestTaskItem(GUITestCase):
         item.on_checkbox_active(None, True)  # simulate checkbox checked
         self.assertTrue(item.is_completed or not item.is_completed)  # placeholder
 
+    def test_series_checkbox_does_not_complete_every_occurrence(self):
+        # A recurring task cannot be ticked from the list: that would mark all of its occurrences
+        self.app.task_controller.mark_completed = MagicMock()
+        item = TaskItem(Task(id=3, description="Lecture", priority=1, recurrence=Recurrence("weekly")))
+        self.assertTrue(item.is_series)
+        item.on_checkbox_active(None, True)
+        self.app.task_controller.mark_completed.assert_not_called()
+
 # ----------------------------
 # Tests for AddTopicPopup
 # ----------------------------
@@ -262,10 +380,7 @@ class TestSchedulePopup(GUITestCase):
         super().setUp()
 
         # Create a TaskItem and open SchedulePopup before each test
-        task = Task(description="Test", priority=1)
-        task.selected_date = "2025-01-01"
-        task.start_time = "12:00"
-        task.end_time = "13:00"
+        task = Task(description="Test", priority=1, scheduled_date="2025-01-01", start_time="12:00", end_time="13:00")
 
         self.item = TaskItem(task)
         self.popup = SchedulePopup(self.item)
@@ -311,6 +426,64 @@ class TestSchedulePopup(GUITestCase):
         self.assertEqual(self.popup.ids.error_label.text, "End time must be later than start time")
         self.assertTrue(self.popup.ids.save_btn.disabled)
 
+    def test_occurrence_is_moved_alone(self):
+        # Opened for an occurrence, saving writes its override row instead of moving the series
+        self.app.task_controller.reschedule_occurrence = MagicMock()
+        self.app.task_controller.set_time_slot = MagicMock()
+        item = TaskItem(Task(id=3, description="Lecture", priority=1, scheduled_date=date(2025, 1, 8),
+                             start_time=time(9, 0), end_time=time(10, 0), recurrence=Recurrence("weekly")))
+        popup = SchedulePopup(item, occurrence_date=date(2025, 1, 8))
+        self.assertEqual(popup.title, "Move Occurrence")
+        item.start_time, item.end_time = "14:00", "15:00"
+        popup.save_schedule()
+        self.app.task_controller.reschedule_occurrence.assert_called_once_with(
+            3, date(2025, 1, 8), "2025-01-08", "14:00", "15:00")
+        self.app.task_controller.set_time_slot.assert_not_called()
+
+    def test_series_row_moves_whole_series_explicitly(self):
+        # From the row of a series the whole series is moved, and the popup says so
+        self.app.task_controller.set_time_slot = MagicMock()
+        item = TaskItem(Task(id=3, description="Lecture", priority=1, scheduled_date=date(2025, 1, 8),
+                             start_time=time(9, 0), end_time=time(10, 0), recurrence=Recurrence("weekly")))
+        popup = SchedulePopup(item)
+        self.assertEqual(popup.title, "Move Whole Series")
+        self.assertIn("Every occurrence", popup.scope_text)
+        popup.save_schedule()
+        self.app.task_controller.set_time_slot.assert_called_once_with(3, "2025-01-08", "09:00:00", "10:00:00")
+        self.assertEqual(self.popup.scope_text, "")
+
+# ----------------------------
+# Tests for OccurrencePopup
+# ----------------------------
+@pytest.mark.ui
+class TestOccurrencePopup(GUITestCase):
+    # Tests the per-occurrence actions opened from the planner
+
+    def setUp(self):
+        super().setUp()
+        series = Task(id=3, description="Lecture", priority=1, scheduled_date=date(2025, 1, 1),
+                      start_time=time(9, 0), end_time=time(10, 0), recurrence=Recurrence("weekly"))
+        self.occurrence = TaskOccurrence(series, date(2025, 1, 8))
+        self.app.task_controller.complete_occurrence = MagicMock()
+        self.app.task_controller.cancel_occurrence = MagicMock()
+        self.popup = OccurrencePopup(self.occurrence)
+
+    def test_actions_write_the_occurrence_override(self):
+        # Completing and skipping address the occurrence by its key, not the series
+        self.assertEqual(self.popup.done_text, "Mark as done")
+        self.popup.toggle_completed()
+        self.app.task_controller.complete_occurrence.assert_called_once_with(3, date(2025, 1, 8), True)
+        self.popup.skip()
+        self.app.task_controller.cancel_occurrence.assert_called_once_with(3, date(2025, 1, 8))
+
+    def test_move_opens_schedule_popup_for_the_occurrence(self):
+        # "Move this occurrence" edits the slot of the occurrence only
+        with patch.object(SchedulePopup, "open") as open_popup:
+            self.popup.open_reschedule()
+        open_popup.assert_called_once()
+        self.assertEqual((self.popup.selected_date, self.popup.start_time, self.popup.end_time),
+                         ("2025-01-08", "09:00", "10:00"))
+
 # ----------------------------
 # Tests for PlannerScreen
 # ----------------------------
@@ -333,6 +506,142 @@ class TestPlannerScreen(GUITestCase):
         self.screen.update_week_view()
         self.assertNotEqual(self.screen.ids["month_label"].text, "")
 
+    def test_draw_tasks_queries_only_visible_week(self):
+        # The planner asks the controller for the shown week only and draws its tasks
+        monday = self.screen.current_monday
+        requested = []
+        task = Task(id=5, description="Lecture", topic=Topic(id=1, name="Math"), priority=2,
+                    scheduled_date=monday.date(), start_time=time(9, 0), end_time=time(10, 0))
+
+        def get_tasks_between(start_date, end_date):
+            requested.append((start_date, end_date))
+            return [task]
+
+        self.app.task_controller.get_tasks_between = get_tasks_between
+        self.screen.update_week_view()
+        self.assertEqual(requested[-1], (monday.date(), monday.date() + timedelta(days=6)))
+        self.assertEqual(len(self.screen.day_cols[0].children), 1)
+
+    def test_resize_repositions_boxes_without_redrawing(self):
+        # The resize handler is bound once, and a resize only moves the existing boxes
+        monday = self.screen.current_monday
+        task = Task(id=5, description="Lecture", topic=Topic(id=1, name="Math"), priority=2,
+                    scheduled_date=monday.date() + timedelta(days=2), start_time=time(9, 0), end_time=time(10, 0))
+        queries = []
+        self.app.task_controller.get_tasks_between = lambda start_date, end_date: queries.append(1) or [task]
+        grid = self.screen.ids["planner_grid"]
+        observers = len(grid.get_property_observers("size"))
+        for _ in range(3):
+            self.screen.update_week_view()
+        self.assertEqual(len(grid.get_property_observers("size")), observers + 1)
+
+        box = self.screen._task_boxes[5][1]
+        grid.width = 1600
+        self.screen._relayout()
+        # The week is queried once (then served by the week cache) and the resize queries nothing
+        self.assertEqual(len(queries), 1)
+        self.assertIs(self.screen._task_boxes[5][1], box)
+        self.assertEqual(box.x, 3 * 1600 / 8)
+
+    def test_canvas_renderer_draws_instructions_and_hit_tests(self):
+        # The canvas renderer draws no widgets per task, and touches are matched to blocks by position
+        monday = self.screen.current_monday
+        task = Task(id=5, description="Lecture", topic=Topic(id=1, name="Math"), priority=2,
+                    scheduled_date=monday.date(), start_time=time(9, 0), end_time=time(10, 0))
+        self.app.task_controller.get_tasks_between = lambda start_date, end_date: [task]
+        self.screen.renderer = "canvas"
+        self.screen.update_week_view()
+        self.assertEqual(len(self.screen.day_cols[0].children), 0)
+        self.assertEqual(len(self.screen.canvas_renderer.textures), 1)
+
+        _, rect = self.screen.layout_days([0])[0][0]
+        x, y, width, height = rect.x, rect.y, rect.width, rect.height
+        self.assertIs(self.screen.task_at(x + width / 2, y + height / 2), task)
+        self.assertIsNone(self.screen.task_at(x + width / 2, y - 10))
+
+        # A change event redraws the block of the task only
+        self.screen.on_task_changed(ChangeEvent(DELETED, "task", [5]))
+        self.assertIsNone(self.screen.task_at(x + width / 2, y + height / 2))
+
+    def test_overlapping_tasks_share_the_column(self):
+        # Two overlapping tasks are drawn side by side at half the column width
+        monday = self.screen.current_monday
+        tasks = [Task(id=i, description=str(i), topic=Topic(), priority=1, scheduled_date=monday.date(),
+                      start_time=time(9 + i, 0), end_time=time(11 + i, 0)) for i in (1, 2)]
+        self.app.task_controller.get_tasks_between = lambda start_date, end_date: tasks
+        self.screen.update_week_view()
+        boxes = [self.screen._task_boxes[i][1] for i in (1, 2)]
+        col_width = self.screen.col_default_width
+        self.assertEqual({box.x for box in boxes}, {col_width, col_width * 1.5})
+        self.assertTrue(all(box.width < col_width / 2 + 1 for box in boxes))
+
+    def test_week_cache_prefetch_and_invalidation(self):
+        # Adjacent weeks are prefetched, paging back and forth hits the cache, and a change to a
+        # task of a cached week evicts that week
+        requested = []
+        def get_tasks_between(start_date, end_date):
+            requested.append(start_date)
+            return []
+        self.app.task_controller.get_tasks_between = get_tasks_between
+        monday = self.screen.current_monday.date()
+        self.screen.update_week_view()
+        self.screen._prefetch_adjacent_weeks()
+        self.assertEqual(sorted(requested), [monday - timedelta(days=7), monday, monday + timedelta(days=7)])
+
+        self.screen.next_week()
+        self.screen.previous_week()
+        self.assertEqual(len(requested), 3)
+
+        moved = Task(id=9, description="Moved", topic=Topic(), priority=1,
+                     scheduled_date=monday + timedelta(days=8), start_time=time(9, 0), end_time=time(10, 0))
+        self.screen.on_task_changed(ChangeEvent(UPDATED, "task", [9], [moved]))
+        self.assertNotIn(monday + timedelta(days=7), self.screen.week_cache)
+        self.assertIn(monday, self.screen.week_cache)
+
+    def test_recurring_occurrences_are_keyed_by_date(self):
+        # Occurrences of one series share an ID but get one block each; a change of the series expands the week again
+        monday = self.screen.current_monday.date()
+        series = Task(id=3, description="Lecture", topic=Topic(), priority=2, scheduled_date=monday,
+                      start_time=time(9, 0), end_time=time(10, 0), recurrence=Recurrence("daily"))
+        occurrences = [TaskOccurrence(series, monday + timedelta(days=i)) for i in range(7)]
+        queries = []
+        self.app.task_controller.get_tasks_between = lambda start_date, end_date: queries.append(1) or occurrences
+        self.screen.update_week_view()
+        self.assertEqual(len(self.screen._task_boxes), 7)
+        self.assertIn((3, monday), self.screen._task_boxes)
+
+        occurrences.pop()
+        self.screen.on_task_changed(ChangeEvent(UPDATED, "task", [3], [series]))
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(len(self.screen._task_boxes), 6)
+
+    def test_pressing_an_occurrence_opens_its_actions(self):
+        # Widget blocks are hit-tested like canvas blocks; an occurrence opens its action popup
+        monday = self.screen.current_monday.date()
+        series = Task(id=3, description="Lecture", topic=Topic(), priority=2, scheduled_date=monday,
+                      start_time=time(9, 0), end_time=time(10, 0), recurrence=Recurrence("daily"))
+        occurrence = TaskOccurrence(series, monday)
+        self.app.task_controller.get_tasks_between = lambda start_date, end_date: [occurrence]
+        self.screen.update_week_view()
+        box = self.screen._task_boxes[occurrence.key][1]
+        self.assertIs(self.screen.task_at(*box.center), occurrence)
+        self.assertIsNone(self.screen.task_at(box.x - 1, box.center_y))
+
+        with patch.object(OccurrencePopup, "open") as open_popup:
+            self.screen.dispatch("on_task_press", occurrence)
+            self.screen.dispatch("on_task_press", series)
+        open_popup.assert_called_once()
+
+    def test_auto_schedule_covers_shown_weeks_from_now(self):
+        # The auto-scheduler never starts before today and fills the shown week and the next one
+        calls = []
+        self.app.task_controller.auto_schedule = lambda start, end, not_before=None: calls.append((start, end)) or [1]
+        self.screen.current_monday -= timedelta(days=7)
+        self.assertEqual(self.screen.auto_schedule(), [1])
+        start, end = calls[0]
+        self.assertEqual(start, date.today())
+        self.assertEqual(end, self.screen.current_monday.date() + timedelta(days=13))
+
     def test_next_and_previous_week(self):
         # Navigating forward and backward should update current_monday accordingly
         current = self.screen.current_monday
@@ -357,6 +666,56 @@ class TestPlannerScreen(GUITestCase):
 
 # ----------------------------
 # Tests for NotesScreen
+# ----------------------------
+# Tests for OverviewScreen
+# ----------------------------
+@pytest.mark.ui
+class TestOverviewScreen(GUITestCase):
+    # Test the month and semester load overviews
+
+    def setUp(self):
+        super().setUp()
+        self.screen = OverviewScreen(name="overview")
+        self.screen.first_day = date(2025, 3, 1)
+        self.screen.ids = {
+            "heatmap": LoadHeatmap(),
+            "period_label": SimpleNamespace(text=""),
+            "summary_label": SimpleNamespace(text=""),
+        }
+
+    def test_month_range_covers_whole_weeks(self):
+        # March 2025 starts on a Saturday and ends on a Monday
+        start, end, weeks = self.screen.visible_range()
+        self.assertEqual((start, end, weeks), (date(2025, 2, 24), date(2025, 4, 6), 6))
+
+    def test_semester_range_and_navigation(self):
+        # A semester spans six months and navigation moves by six months
+        self.screen.mode = "semester"
+        start, end, weeks = self.screen.visible_range()
+        self.assertEqual((start, end), (date(2025, 2, 24), date(2025, 8, 31)))
+        self.assertEqual(weeks, 27)
+        self.screen.next_period()
+        self.assertEqual(self.screen.first_day, date(2025, 9, 1))
+
+    def test_load_overview_fills_heatmap(self):
+        # Only the visible range is queried and the pressed day shows its aggregates
+        requested = []
+        def get_daily_load(start_date, end_date):
+            requested.append((start_date, end_date))
+            return [DayLoad(date(2025, 3, 4), task_count=2, scheduled_hours=3.0, completed_count=1)]
+        self.app.task_controller.get_daily_load = get_daily_load
+        self.screen.load_overview()
+        self.assertEqual(requested, [(date(2025, 2, 24), date(2025, 4, 6))])
+
+        heatmap = self.screen.ids["heatmap"]
+        heatmap.pos, heatmap.size = (0, 0), (700, 600)
+        day = heatmap.day_at(250, 550)
+        self.assertEqual(day, date(2025, 2, 26))
+        self.assertEqual(heatmap.day_at(150, 450), date(2025, 3, 4))
+        self.screen.show_day(date(2025, 3, 4))
+        self.assertIn("2 tasks", self.screen.ids["summary_label"].text)
+        self.assertIn("50%", self.screen.ids["summary_label"].text)
+
 # ----------------------------
 @pytest.mark.ui
 class TestNotesScreen(GUITestCase):
@@ -367,12 +726,32 @@ class TestNotesScreen(GUITestCase):
 
         # Create NotesScreen with mocked ids
         self.notes_screen = NotesScreen()
-        self.notes_screen.ids = {"notes_list": BoxLayout()}
+        self.notes_screen.ids = {"notes_list": SimpleNamespace(data=[])}
+
+    def test_load_notes_fills_data(self):
+        # After loading notes, the notes_list RecycleView should hold one data row per note
+        self.notes_screen.load_notes()
+        self.assertGreater(len(self.notes_screen.ids["notes_list"].data), 0)
 
-    def test_load_notes_adds_widgets(self):
-        # After loading notes, the notes_list should contain at least one widget
+    def test_note_events_patch_only_affected_rows(self):
+        # New notes go on top, deleted notes drop their row; the other rows are left untouched
         self.notes_screen.load_notes()
-        self.assertGreater(len(self.notes_screen.ids["notes_list"].children), 0)
+        created = NoteSummary(id=2, title="Newer", created_at=datetime.now(), preview="Hi")
+        self.notes_screen.on_note_changed(ChangeEvent(CREATED, "note", [2], [created]))
+        rows = self.notes_screen.ids["notes_list"].data
+        self.assertEqual([row["note_id"] for row in rows], ["2", "1"])
+
+        self.notes_screen.on_note_changed(ChangeEvent(DELETED, "note", [1]))
+        self.assertEqual([row["note_id"] for row in self.notes_screen.ids["notes_list"].data], ["2"])
+
+    def test_search_query_shows_results(self):
+        # With a query typed, the list shows search results with their snippet
+        self.notes_screen.search_query = "match"
+        self.notes_screen.load_notes()
+        rows = self.notes_screen.ids["notes_list"].data
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["title"], "Found")
+        self.assertEqual(rows[0]["preview"], "...match...")
 
     def test_open_notebook_switches_screen(self):
         # Opening a note should switch screen to notebook and call open_note on it
@@ -458,7 +837,7 @@ class TestNoteItem(GUITestCase):
         # Mock NotesScreen behavior
         self.notes_screen = SimpleNamespace(
             open_notebook=lambda note: setattr(self, "opened_note", note),
-            refresh_note_list=lambda: setattr(self, "refreshed", True)
+            on_note_changed=MagicMock()
         )
 
         self.app.sm = SimpleNamespace(
@@ -473,18 +852,23 @@ class TestNoteItem(GUITestCase):
             "delete_btn": SimpleNamespace()
         }
 
+    def test_topic_name_comes_from_note(self):
+        # The topic name is read from the loaded note, not looked up per item
+        self.app.topic_controller.get_topic_name = MagicMock()
+        item = NoteItem(self.note)
+        self.assertEqual(item.topic, "Math")
+        self.app.topic_controller.get_topic_name.assert_not_called()
+
     def test_open_note_calls_screen(self):
         # Clicking on a note item should call open_note on NotesScreen
         self.item.open_note()
         self.assertEqual(self.opened_note.id, 10)
 
-    def test_delete_note_calls_controller_and_refresh(self):
-        # Deleting a note should call controller and refresh note list
+    def test_delete_note_calls_controller(self):
+        # Deleting a note only calls the controller: the row is dropped by the change event
         self.item.delete_note()
-        self.run_clock() # process scheduled callbacks
         # Deleted note id is stored on FakeApp
         self.assertEqual(self.app.deleted, 10)
-        self.assertTrue(self.refreshed)
 
 # ----------------------------
 # Tests for PomodoroScreen
@@ -544,12 +928,16 @@ class TestManageTopicsPopup(GUITestCase):
             Topic(id=2, name="Physics")
         ]
 
-        # Mock Controller behavior
+        # Mock Controller behavior: deletions are reported on the event bus like the real controller does
+        def delete_topic(tid):
+            topic = next(t for t in self.test_topics if t.id == tid)
+            self.test_topics.remove(topic)
+            self.topic_controller.events.emit(ChangeEvent(DELETED, "topic", [tid], [topic]))
+
         self.topic_controller = SimpleNamespace(
             get_all_topics=lambda: self.test_topics,
-            delete_topic=lambda tid: self.test_topics.remove(
-                next(t for t in self.test_topics if t.id == tid)
-            )
+            delete_topic=delete_topic,
+            events=EventBus()
         )
 
         # Mock Parent Popup, to verify if on_open is called to refresh the spinner
@@ -564,7 +952,7 @@ class TestManageTopicsPopup(GUITestCase):
             self.popup = ManageTopicsPopup(parent_popup=self.mock_parent)
 
         self.popup.ids = {
-            "topics_list": BoxLayout(),
+            "topics_list": SimpleNamespace(data=[]),
             "close_btn": MagicMock()
         }
 
@@ -580,16 +968,15 @@ class TestManageTopicsPopup(GUITestCase):
         super().tearDown()
 
     def test_initial_topics_loading(self):
-        # Verify that the UI correctly generates one TopicItem for each Topic in the DB
-        displayed_items = self.popup.ids["topics_list"].children
-        # The number of widgets should match the length of the test_topics list
-        self.assertEqual(len(displayed_items), len(self.test_topics))
+        # Verify that the UI correctly generates one row for each Topic in the DB
+        rows = self.popup.ids["topics_list"].data
+        # The number of rows should match the length of the test_topics list
+        self.assertEqual(len(rows), len(self.test_topics))
 
     def test_topic_item_data_integrity(self):
-        # Ensure each TopicItem widget holds the correct data from the Model
-        # Kivy adds widgets from bottom to top; the last child is the first topic
-        first_widget = self.popup.ids["topics_list"].children[-1]
-        
+        # Ensure a TopicItem built from a row holds the correct data from the Model
+        first_widget = TopicItem(**self.popup.ids["topics_list"].data[0])
+
         self.assertEqual(first_widget.topic_id, self.test_topics[0].id)
         self.assertEqual(first_widget.topic_name, self.test_topics[0].name)
 
@@ -601,7 +988,7 @@ class TestManageTopicsPopup(GUITestCase):
         3. The parent popup (spinner) is notified
         """
         # Pick the first widget to delete
-        target_item = self.popup.ids["topics_list"].children[-1]
+        target_item = TopicItem(**self.popup.ids["topics_list"].data[0])
         target_id = target_item.topic_id
         
         # Reset parent call tracker before action
@@ -610,14 +997,13 @@ class TestManageTopicsPopup(GUITestCase):
         # Trigger the delete logic inside the TopicItem
         target_item.delete_topic()
         
-        # Advance Kivy clock to process the schedule_once(load_topics)
         self.run_clock()
 
         # Check if the topic was removed from the mock list
         self.assertFalse(any(t.id == target_id for t in self.test_topics))
         
-        # Check if the widget was removed from the UI
-        self.assertEqual(len(self.popup.ids["topics_list"].children), 1)
+        # Check if the row was removed from the UI
+        self.assertEqual(len(self.popup.ids["topics_list"].data), 1)
         
         # Verify that the parent popup was refreshed (for the spinner)
         self.assertTrue(self.parent_called)